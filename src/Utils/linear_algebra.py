@@ -6,87 +6,225 @@ import logging
 
 class LinearAlgebra:
 
+    # absolute tolerance used to consider a value zero, the same as np.isclose(value, 0)
+    TOLERANCE = 1e-8
+
     @staticmethod
-    def retrive_certificate(tableau, n_restrictions):
+    def retrive_certificate(tableau, n_restrictions, m_variables=0, has_vero=True):
+        """
+        :param m_variables: number of variables, only needed without the vero
+        """
         firstRow = tableau[0]
-        vero_row = firstRow[:n_restrictions]
+        vero_row = firstRow[LinearAlgebra.get_register_columns(n_restrictions, m_variables, has_vero)]
 
         return vero_row
 
     @staticmethod
-    def get_x_solution(tableau):
-        x_solution = LinearAlgebra.get_solution(tableau)
-        m_variables = LinearAlgebra.get_number_of_m_variables(tableau)
+    def get_register_columns(n_restrictions: int, m_variables: int, has_vero=True):
+        """
+        Columns of the operations register, B^-1 in the restrictions and y in the first row.
+
+        Without the vero the slack columns are used, [A | I | b]. They start as the same identity, with zeros in
+        the first row, and every pivot, row flip and first row canonicalization is a row operation, which changes
+        them exactly as it changes the vero
+        :return: slice of the tableau columns
+        """
+        if has_vero:
+            return slice(0, n_restrictions)
+
+        return slice(m_variables, m_variables + n_restrictions)
+
+    @staticmethod
+    def get_x_solution(tableau, basis=None, has_vero=True):
+        x_solution = LinearAlgebra.get_solution(tableau, basis, has_vero)
+        m_variables = LinearAlgebra.get_number_of_m_variables(tableau, has_vero)
         x_solutions_without_aux_variables = x_solution[:m_variables]
 
         return x_solutions_without_aux_variables
 
     @staticmethod
     def replace_values_smaller_then_tol(array):
+        """
+        Returns a copy of the array with every value close to zero (np.isclose(value, 0)) replaced by zero
+        """
 
-        new_array = np.copy(array)
-        should_be_zero = np.isclose(array, np.zeros(array.shape))
-        new_array[should_be_zero] = 0
+        new_array = np.array(array)
+        new_array[np.abs(new_array) <= LinearAlgebra.TOLERANCE] = 0
 
         return new_array
 
     @staticmethod
     def any_below_zero(array):
-        replaced = LinearAlgebra.replace_values_smaller_then_tol(array)
-        return np.any(replaced < 0)
+        # the same as cleaning the values close to zero and checking for negatives, without copying the array
+        if np.size(array) == 0:
+            return False
+        return bool(np.min(array) < -LinearAlgebra.TOLERANCE)
 
     @staticmethod
     def all_below_zero(array):
-        replaced = LinearAlgebra.replace_values_smaller_then_tol(array)
-        return np.all(replaced < 0)
+        if np.size(array) == 0:
+            return True
+        return bool(np.max(array) < -LinearAlgebra.TOLERANCE)
 
     @staticmethod
     def remove_equal_rows(ab: np.ndarray):
         """
-        Remove equal rows from the tableau
+        Remove equal rows from the tableau, ie, rows that are a positive multiple of an earlier one.
+
+        Every row is divided by the absolute value of the first nonzero entry of its A part, so rows that are
+        positive multiples of each other become the same row, rounded to the tolerance and grouped by a hash of
+        its bytes, in a single pass. The sign is kept: a*x <= b and -a*x <= -b are two different restrictions
+        (together an equality) and are never grouped. Zero entries are compared as values, rows with zeros at the
+        same positions are found too. Rows whose A part is all zero are kept, 0 <= b is not scaled by b.
         :param ab:
-        :return:
+        :return: (tableau without the repeated rows, indexes of the removed rows)
         """
 
-        tableau = np.copy(ab)
+        tableau = np.array(ab, dtype=float)
+
+        if tableau.shape[0] < 2:
+            return tableau, []
+
+        nonzero = np.abs(tableau[:, :-1]) > LinearAlgebra.TOLERANCE
+        has_nonzero = nonzero.any(axis=1)
+        first_nonzero = nonzero.argmax(axis=1)
+
+        scale = np.abs(tableau[np.arange(tableau.shape[0]), first_nonzero])
+        scale[~has_nonzero] = 1
+
+        # canonical scale, the first nonzero entry of A becomes 1 or -1, then a grid of the tolerance size
+        # + 0.0 turns -0.0 into 0.0, they have different bytes
+        canonical = np.rint(tableau / scale.reshape(-1, 1) / LinearAlgebra.TOLERANCE) + 0.0
+
+        first_row_of = {}
         removed_rows = []
-        for i in range(0, tableau.shape[0]):
-            for j in range(i + 1, tableau.shape[0]):
-                if j in removed_rows or i == j:
-                    continue
-                # silence warnings of division by zero
-                with np.errstate(divide='ignore', invalid='ignore'):
-                    quotient = np.divide(tableau[i], tableau[j])
-
-                # check if all elements are equal
-                if np.allclose(quotient, quotient[0]):
-                    logging.debug(f"Removing row {j} from tableau")
-                    logging.debug(f"Row {tableau[j]} is equal to row {tableau[i]}")
-                    removed_rows.append(j)
+        for i in np.flatnonzero(has_nonzero):
+            key = canonical[i].tobytes()
+
+            if key in first_row_of:
+                # lazy formatting, printing the rows costs more than finding them
+                logging.debug("Removing row %s from tableau, it is equal to row %s", i, first_row_of[key])
+                removed_rows.append(int(i))
+            else:
+                first_row_of[key] = i
 
         tableau = np.delete(tableau, removed_rows, axis=0)
         return tableau, removed_rows
 
     @staticmethod
-    def smaller_than_zero(number: float):
+    def find_equality_pairs(ab: np.ndarray):
+        """
+        Finds the equalities written as two opposite restrictions, a*x <= b and -k*a*x <= -k*b with k > 0
+        :param ab:
+        :return: n_pairs x 2 array, the first and the second row of every pair
+        """
+        tableau = np.asarray(ab, dtype=float)
 
-        array = np.array([number])
-        # fixes numeric precision
-        return LinearAlgebra.any_below_zero(array)
+        nonzero = np.abs(tableau) > LinearAlgebra.TOLERANCE
+        has_nonzero = nonzero.any(axis=1)
+        scale = np.abs(tableau[np.arange(tableau.shape[0]), nonzero.argmax(axis=1)])
+        scale[~has_nonzero] = 1
+
+        # the sign is kept, so a row and its opposite have opposite keys
+        canonical = np.rint(tableau / scale.reshape(-1, 1) / LinearAlgebra.TOLERANCE) + 0.0
+
+        unpaired = {}
+        pairs = []
+        for i in np.flatnonzero(has_nonzero):
+            opposite_key = (-canonical[i] + 0.0).tobytes()
+
+            if unpaired.get(opposite_key):
+                pairs.append((unpaired[opposite_key].pop(0), int(i)))
+            else:
+                unpaired.setdefault(canonical[i].tobytes(), []).append(int(i))
+
+        return np.array(pairs, dtype=int).reshape(-1, 2)
+
+    @staticmethod
+    def remove_dependent_equalities(ab: np.ndarray):
+        """
+        Rank revealing pass over the equalities of Ax <= b, see find_equality_pairs.
+
+        Gaussian elimination with complete pivoting over [A | b] of the equalities, keeping the multipliers, so
+        every row that becomes zero in A is known as a combination of the independent ones:
+            * if b also becomes zero the equality is redundant and both of its restrictions are removed
+            * otherwise the equalities are inconsistent and the combination is a Farkas certificate
+        Only equalities are checked, a linearly dependent inequality is not redundant in general.
+        :param ab:
+        :return: (ab without the redundant equalities, indexes of the removed rows, certificate or None).
+        When the certificate is given nothing is removed, it has one entry per row of ab
+        """
+        tableau = np.array(ab, dtype=float)
+        pairs = LinearAlgebra.find_equality_pairs(tableau)
+
+        if pairs.shape[0] < 2:
+            return tableau, [], None
+
+        equalities = tableau[pairs[:, 0]]
+        reduced = equalities[:, :-1].copy()
+        # row i of reduced is always multipliers[i] @ equalities[:, :-1]
+        multipliers = np.identity(pairs.shape[0])
+
+        tolerance = LinearAlgebra.TOLERANCE * max(1.0, np.abs(reduced).max())
+        remaining = np.ones(pairs.shape[0], dtype=bool)
+
+        while remaining.any():
+            candidates = np.abs(reduced) * remaining.reshape(-1, 1)
+            row, column = np.unravel_index(np.argmax(candidates), candidates.shape)
+
+            # the remaining rows are zero, they depend on the pivoted ones
+            if candidates[row, column] <= tolerance:
+                break
+
+            remaining[row] = False
+            factors = reduced[:, column] / reduced[row, column]
+            factors[~remaining] = 0
+
+            reduced -= np.outer(factors, reduced[row])
+            multipliers -= np.outer(factors, multipliers[row])
+
+        dependent = np.flatnonzero(remaining)
+        residuals = multipliers[dependent] @ equalities[:, -1]
+        inconsistent = np.abs(residuals) > tolerance
+
+        if inconsistent.any():
+            # free multipliers of the equalities, split into the <= and the >= restriction of each one,
+            # with y^T A = 0 and y^T b < 0
+            position = int(np.flatnonzero(inconsistent)[0])
+            combination = -np.sign(residuals[position]) * multipliers[dependent[position]]
+
+            certificate = np.zeros(tableau.shape[0])
+            first_scale = np.abs(tableau[pairs[:, 0]]).max(axis=1)
+            second_scale = np.abs(tableau[pairs[:, 1]]).max(axis=1)
+            certificate[pairs[:, 0]] = np.maximum(combination, 0)
+            # the second row is -k times the first, k is the ratio of their largest entries
+            certificate[pairs[:, 1]] = np.maximum(-combination, 0) * first_scale / second_scale
+
+            logging.info(f"equality {pairs[dependent[position], 0]} is inconsistent with the others")
+            return tableau, [], certificate
+
+        removed_rows = sorted(int(row) for row in pairs[dependent].reshape(-1))
+        logging.info(f"removing {dependent.shape[0]} dependent equalities, rows {removed_rows}")
+
+        return np.delete(tableau, removed_rows, axis=0), removed_rows, None
+
+    @staticmethod
+    def smaller_than_zero(number: float):
+        # fixes numeric precision, values close to zero are not negative
+        return number < -LinearAlgebra.TOLERANCE
 
     @staticmethod
     def equal_to_zero(number: float):
-        array = np.array([number])
         # fixes numeric precision
-        replaced = LinearAlgebra.replace_values_smaller_then_tol(array)
-        return np.any(replaced == 0)
+        return abs(number) <= LinearAlgebra.TOLERANCE
 
     @staticmethod
     def arrayPrint(array):
         """
         Desestrutura e printa o array bonitinho, separando em espaços e com arredondamento de 7 casas decimais
         """
-        print(*array.round(7), sep=' ')
+        # a single join over tolist, the same text print(*array.round(7)) gives, without a numpy scalar per value
+        print(" ".join(map(str, array.round(7).tolist())))
 
     @staticmethod
     def matprint(mat: np.ndarray, fmt="g"):
@@ -123,6 +261,15 @@ class LinearAlgebra:
 
         return width
 
+    @staticmethod
+    def get_slack_basis(n_restrictions: int, m_variables: int, has_vero=True):
+        """
+        Basis header of a tableau fresh out of TableauParsing, [VERO | A | I | b] or [A | I | b], where the slack
+        identity is the trivial basis
+        """
+        vero_columns = n_restrictions if has_vero else 0
+        return np.arange(n_restrictions) + vero_columns + m_variables
+
     @staticmethod
     def get_number_of_n_restrictions(tableau: np.ndarray):
         """
@@ -151,17 +298,30 @@ class LinearAlgebra:
         return tableau[:, n_restrictions:]
 
     @staticmethod
-    def get_solution(tableau: np.ndarray):
+    def get_solution(tableau: np.ndarray, basis=None, has_vero=True):
         """Returns the solution vector x for the given tableau
+        :param basis: basis header, the basic column of each restriction as returned by findBasicColumns.
+            If it is not given the basis is searched in the tableau
+        :param has_vero: False for a tableau built without the vero, [A | I | b]
         """
 
         if isinstance(tableau, list):
             tableau = np.array(tableau)
 
         n_restrictions = LinearAlgebra.get_number_of_n_restrictions(tableau)
-        x_width = LinearAlgebra.get_number_of_m_variables(tableau) + n_restrictions
+        x_width = LinearAlgebra.get_number_of_m_variables(tableau, has_vero) + n_restrictions
+        vero_columns = n_restrictions if has_vero else 0
+
+        if basis is not None:
+            # O(n) lookup, every x out of basis is zero
+            basis = np.asarray(basis)
+            has_basic_column = basis != -1
+
+            x = np.zeros(x_width)
+            x[basis[has_basic_column] - vero_columns] = tableau[1:, -1][has_basic_column]
+            return x
 
-        cleaned_tableau = LinearAlgebra.drop_vero(tableau, n_restrictions)
+        cleaned_tableau = LinearAlgebra.drop_vero(tableau, n_restrictions) if has_vero else tableau
 
         basic_columns = LinearAlgebra.findBasicColumns(cleaned_tableau, drop_vero=False, drop_b=True)
 
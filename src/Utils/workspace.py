@@ -0,0 +1,49 @@
+import numpy as np
+
+from Utils.linear_algebra import LinearAlgebra
+
+
+class PivotWorkspace:
+    """
+    Buffers reused by every pivot of a solve, allocated once for a tableau shape, so the pivot loop does not
+    allocate tableau sized arrays on every iteration.
+    """
+
+    def __init__(self, shape):
+        num_rows, num_columns = shape
+        self.shape = shape
+
+        # outer product (pivot column x pivot row) subtracted from the tableau
+        self.outer = np.empty(shape)
+        # copy of the rows being updated, when only some of them change
+        self.gathered = np.empty(shape)
+        # tolerance cleanup, |value| and |value| <= tolerance
+        self.absolute = np.empty(shape)
+        self.mask = np.empty(shape, dtype=bool)
+
+        # pivot column, how many times the pivot row is subtracted from each row
+        self.factors = np.empty(num_rows)
+
+        # ratio test, one entry per restriction
+        self.positive = np.empty(num_rows, dtype=bool)
+        self.ratios = np.empty(num_rows)
+        self.relaxed_ratios = np.empty(num_rows)
+        self.candidates = np.empty(num_rows)
+
+    def snap_to_zero(self, array: np.ndarray, tolerance=None):
+        """
+        In place, replaces every value with |value| <= tolerance by zero, the same as np.isclose(value, 0).
+        Works for the whole tableau or for any contiguous piece of it, like a row
+        """
+        if tolerance is None:
+            tolerance = LinearAlgebra.TOLERANCE
+
+        # views over the start of the flat buffers, with the same shape as the array
+        absolute = self.absolute.reshape(-1)[:array.size].reshape(array.shape)
+        mask = self.mask.reshape(-1)[:array.size].reshape(array.shape)
+
+        np.abs(array, out=absolute)
+        np.less_equal(absolute, tolerance, out=mask)
+        np.copyto(array, 0.0, where=mask)
+
+        return array
@@ -0,0 +1,66 @@
+import asyncio
+import functools
+import logging
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from main import solve as solve_problem
+
+
+class AsyncSolver:
+    """
+    Solves problems from asyncio code. Each solve runs in a thread of the solver executor, at most
+    max_concurrency at a time, the others wait in the event loop without holding a thread.
+
+    A solve that is cancelled or times out sets its cancel event, the engine checks it before every pivot and
+    stops with SolveCancelledError, so the thread is free right away instead of running to the end. The awaiting
+    task gets the usual asyncio.CancelledError or TimeoutError.
+    """
+
+    def __init__(self, max_concurrency=4, **options):
+        """
+        :param max_concurrency: solves running at the same time, also the number of executor threads
+        :param options: arguments of SimplexRunner (engine, pricing, presolve, ...), the same for every solve
+        """
+        self.max_concurrency = max_concurrency
+        self.options = options
+
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="simplex")
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def solve_async(self, c: np.ndarray, ab: np.ndarray, timeout=None):
+        """
+        :param c: objective function of max c*x
+        :param ab: restrictions Ax <= b, n x (m + 1)
+        :param timeout: seconds, None waits for the end of the solve
+        :return: SolveResult
+        """
+        cancel_event = threading.Event()
+
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            solve = functools.partial(self.solve, c, ab, cancel_event=cancel_event)
+
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(self.executor, solve), timeout)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                # the thread stops before its next pivot
+                cancel_event.set()
+                logging.info("solve cancelled")
+                raise
+
+    def solve(self, c: np.ndarray, ab: np.ndarray, cancel_event=None):
+        """
+        Blocking solve, run by the executor threads, the same as main.solve
+        """
+        return solve_problem(c, ab, cancel_event=cancel_event, **self.options)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -7,7 +7,7 @@ from exceptions import UnfeasibleError
 
 
 class AuxiliarLP:
-    def __init__(self, tableau: np.ndarray):
+    def __init__(self, tableau: np.ndarray, engine=Simplex, vero=True, **engine_options):
 
         # sanity check
         if isinstance(tableau, list):
@@ -16,8 +16,17 @@ class AuxiliarLP:
 
         self.tableau = tableau
 
-        self.m_variables = LinearAlgebra.get_number_of_m_variables(tableau)
+        # simplex implementation used to solve the auxiliary problem, Simplex or RevisedSimplex,
+        # and its keyword arguments (pricing, ratio_test)
+        self.engine = engine
+        self.engine_options = engine_options
+
+        # False for a [A | I | b] tableau, the certificate comes from the slack columns, see Simplex
+        self.vero = vero
+
+        self.m_variables = LinearAlgebra.get_number_of_m_variables(tableau, has_vero=vero)
         self.n_restrictions = LinearAlgebra.get_number_of_n_restrictions(tableau)
+        self.vero_columns = self.n_restrictions if vero else 0
 
         # synthetic variables count
         self.slack_variables_added = 0
@@ -25,8 +34,14 @@ class AuxiliarLP:
         # synthetic columns
         self.auxiliary_columns = []
 
+        # basis header of the current tableau, the basic column (counting the vero) of each restriction
+        self.basis = None
+
         self.old_c = tableau[0]
 
+        # pivots of the auxiliary problem
+        self.pivots = 0
+
     def __run_auxiliar_lp(self):
 
         # put sythetic columns in canonical form
@@ -34,17 +49,53 @@ class AuxiliarLP:
 
         # create simplex object with the new tableau and variables
         n = LinearAlgebra.get_number_of_n_restrictions(canonical_tableau)
-        m = LinearAlgebra.get_number_of_m_variables(canonical_tableau)
+        m = LinearAlgebra.get_number_of_m_variables(canonical_tableau, has_vero=self.vero)
+        if not self.vero:
+            # the synthetic columns come after the slack ones, the engine finds the register after the original
+            # variables only
+            m = self.m_variables
 
         # run simplex
-        runner = Simplex(m=m, n=n, tableau=canonical_tableau)
-        self.tableau = runner.solve()
+        runner = self.engine(m=m, n=n, tableau=canonical_tableau, basis=self.basis, vero=self.vero,
+                             **self.engine_options)
+        try:
+            self.tableau = runner.solve()
+        finally:
+            self.pivots = runner.pricing.total_pivots
+        self.basis = runner.basis
+
+        # a zero value optimum can still have synthetic variables in the basis, at zero level, when there are
+        # equality restrictions (a row and its negation), they are pivoted out before checking feasibility
+        if LinearAlgebra.equal_to_zero(self.tableau[0][-1]):
+            self.__drive_out_synthetic_variables()
 
         # if a 0 value objective function is not found then it is unfeasible
         if self.is_unfeasible():
-            certificate = LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions)
+            certificate = LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions, self.m_variables,
+                                                            self.vero)
             raise UnfeasibleError(certificate)
 
+    def __drive_out_synthetic_variables(self):
+        """
+        Replaces every synthetic variable still in the basis by an original (or slack) column with a nonzero
+        entry in its row. The synthetic variable is zero, so this is a degenerate pivot and the basis stays
+        feasible.
+        """
+        first_synthetic = self.tableau.shape[1] - self.slack_variables_added - 1
+
+        for restriction in np.flatnonzero(np.isin(self.basis, self.auxiliary_columns)):
+            row = restriction + 1
+            candidates = self.tableau[row, self.vero_columns:first_synthetic]
+            nonzero = np.flatnonzero(np.abs(candidates) > LinearAlgebra.TOLERANCE)
+
+            # the row has no original column left, keep it and let is_unfeasible report it
+            if nonzero.size == 0:
+                continue
+
+            column = int(nonzero[0]) + self.vero_columns
+            Simplex.pivotTableauInPlace(self.tableau, column, row)
+            self.basis[restriction] = column
+
     def phase_1(self, return_in_canonical=True, simulate_auxiliar_operations_in_c=False):
 
         # run simplex to try to get to zero value objective function
@@ -52,9 +103,12 @@ class AuxiliarLP:
         self.__run_auxiliar_lp()
 
         # synthetic are in the last columns, except for the last one, which is b
+        # instead of deleting them (a copy), b is moved to the first synthetic column and the tableau becomes a
+        # view without the rest
         start_synthetic = self.tableau.shape[1] - self.slack_variables_added - 1
-        self.tableau = np.delete(self.tableau, np.s_[start_synthetic: start_synthetic + self.slack_variables_added],
-                                 axis=1)
+        if self.slack_variables_added > 0:
+            self.tableau[:, start_synthetic] = self.tableau[:, -1]
+            self.tableau = self.tableau[:, :start_synthetic + 1]
 
         if simulate_auxiliar_operations_in_c:
             self.__restore_original_c()
@@ -63,79 +117,48 @@ class AuxiliarLP:
 
         # after c is reinserted we need to redo the canonical form (make the basis columns canonical)
         if return_in_canonical:
-            self.tableau = Simplex.putInCanonicalForm(self.tableau)
+            Simplex.canonicalizeFirstRow(self.tableau, self.basis)
 
         return self.tableau
 
-    def __change_objective_function(self):
-        # tableau tem m (vero) + n (variaveis) + m (folgas, opcionais) + 1 de largura
-
-        # here we have vero, variables, slack, new variables and b. They all should be zero
-        new_c = np.zeros(self.tableau.shape[1] + self.slack_variables_added)
-
-        # make the obj value for synthetic columns 1
-        slack_start = self.tableau.shape[1] - 1
-        columns = range(slack_start, slack_start + self.slack_variables_added)
-
-        for c_i in columns:
-            new_c[c_i] = 1
-
-        return new_c
-
-    def __change_restrictions_with_new_variables(self):
-
-        # remove first row from tableau
-        abMatrix = np.delete(self.tableau, 0, 0)
-
-        # create n_restrictions * slack_variables_added zero, which will be square im my current implementation
-        identityRestrictions = np.zeros((self.n_restrictions, self.slack_variables_added))
-
-        # index of last column, before b
-        offset = self.tableau.shape[1] - 1
-        self.auxiliary_columns = list(range(offset, offset + self.slack_variables_added))
-
-        abMatrix = np.insert(abMatrix, offset, identityRestrictions, axis=1)
-
-        # insert in basis. I'm doing it this way as we may not need entire identity,
-        # just the desired columns and indexes
-        for row_index, column_index in enumerate(self.auxiliary_columns):
-            if column_index != -1:
-                abMatrix[row_index][column_index] = 1
-
-        return abMatrix
-
     def pre_solve_auxiliar_problem(self):
 
         # TODO: Multiply by *1 here, not in matrix input
         self.tableau = self.__fix_negative_b_restrictions()
 
-        # check to see if we need to insert synthetic variables, will almost never in Ax<=b problem
-        new_tableau = self.__add_variables_to_auxiliary_problem().copy()
+        # synthetic variables only for the restrictions without a basic column, usually the ones with negative b,
+        # which were multiplied by -1 and have a -1 slack now
+        new_tableau = self.__add_variables_to_auxiliary_problem()
 
-        # pivotear cada coluna da base auxiliar para colocar o c_i 0 zero
-        for i, col in enumerate(self.auxiliary_columns):
-            if col == -1:
-                continue
-            variable_index = i + 1
-            new_tableau = Simplex.pivotTableau(new_tableau, col, variable_index)
+        # objective 1 for every synthetic column, put in canonical form over the starting basis
+        Simplex.canonicalizeFirstRow(new_tableau, self.basis)
 
         return new_tableau
 
     def __add_variables_to_auxiliary_problem(self):
 
-        self.slack_variables_added = self.n_restrictions
+        # restrictions that already have a basic column (with b >= 0, after the fix), most likely the slack one
+        basis = LinearAlgebra.findBasicColumns(self.tableau, drop_c=True, drop_vero=self.vero, get_rightmost=True)
+        missing_basis = np.flatnonzero(basis == -1)
+        self.slack_variables_added = missing_basis.shape[0]
+
+        # index of last column, before b, where the synthetic columns start
+        offset = self.tableau.shape[1] - 1
+        self.auxiliary_columns = list(range(offset, offset + self.slack_variables_added))
+
+        # [VERO | A | I | synthetic | b], allocated once, with only the needed synthetic columns
+        stacked_tableau = np.zeros((self.tableau.shape[0], self.tableau.shape[1] + self.slack_variables_added))
+        stacked_tableau[1:, :offset] = self.tableau[1:, :offset]
+        stacked_tableau[1:, -1] = self.tableau[1:, -1]
 
-        # I will not do this as i'm adding a full identity, but we could be more efficient
-        # this behaviour can be achived by checking which variables do not have a
-        # slack added (index of the basis is below the slack start
-        # and add then, remebering to flag this addition in the object properties
-        # trivial_basis = LinearAlgebra.findBasicColumns(self.tableau, drop_c=True, get_rightmost=True)
-        # check missing identities and perform auxiliary on them...
+        # each synthetic column is the basic column of its restriction, with objective 1
+        stacked_tableau[missing_basis + 1, self.auxiliary_columns] = 1
+        stacked_tableau[0, self.auxiliary_columns] = 1
+
+        basis[missing_basis] = self.auxiliary_columns
+        self.basis = basis
 
-        new_c = self.__change_objective_function()
-        new_ab = self.__change_restrictions_with_new_variables()
         self.old_c = self.tableau[0]
-        stacked_tableau = np.vstack((new_c, new_ab))
         return stacked_tableau
 
     def is_unfeasible(self):
@@ -144,14 +167,14 @@ class AuxiliarLP:
         # se o resultado for 0, é otimo.
         # TODO: Ver caso do livro do Thie, que o Scipy resolve
         if LinearAlgebra.equal_to_zero(result):
-            basic_variables = LinearAlgebra.findBasicColumns(self.tableau, drop_c=True)
-            logging.debug("basic_variables", basic_variables)
+            logging.debug(f"basic_variables {self.basis}")
 
-            for i, x_index in enumerate(basic_variables):
-                # means that the variable in the basis is a synthetic variable
-                if self.__is_synthetic_variable(x_index):
-                    print(f"x index {x_index} is synthetic, ie, greater or equal than {self.m_variables}")
-                    return True
+            # means that a variable in the basis is a synthetic variable
+            synthetic_in_basis = self.basis[np.isin(self.basis, self.auxiliary_columns)]
+            if synthetic_in_basis.size > 0:
+                x_index = synthetic_in_basis[0]
+                logging.debug(f"x index {x_index} is synthetic, ie, greater or equal than {self.m_variables}")
+                return True
 
             return False
 
@@ -162,8 +185,9 @@ class AuxiliarLP:
     def __restore_original_c(self):
         originalC = self.old_c
 
-        # get only first n values from row
-        veroData = self.tableau[0][0:self.n_restrictions]
+        # get only the n values of the register from row
+        veroData = self.tableau[0][LinearAlgebra.get_register_columns(self.n_restrictions, self.m_variables,
+                                                                      self.vero)]
 
         # perform operations to get the new c
         for i, value in enumerate(veroData):
@@ -174,9 +198,6 @@ class AuxiliarLP:
 
         self.tableau[0] = originalC
 
-    def __is_synthetic_variable(self, x_index):
-        return x_index in self.auxiliary_columns
-
     def __fix_negative_b_restrictions(self):
         """
         Fixes negative b rows, as we are not using dual simplex method
@@ -0,0 +1,132 @@
+import argparse
+import functools
+import glob
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from main import add_runner_arguments, runner_options, create_runner
+from exceptions import InputFormatError
+from output import ResultWriter, format_result, save_result_arrays
+
+"""
+Resolve varios arquivos de entrada num pool de processos, em vez de um interpretador novo por arquivo
+(runSpecificInputCase.sh). Cada processo do pool importa o numpy uma vez so e resolve todos os arquivos que recebe.
+
+    python src/batch_runner.py tests/cases/Testes --workers 4 --output-dir saidas
+    python src/batch_runner.py "tests/cases/Testes/0*"
+    python src/batch_runner.py tests/cases/Testes --binary-output resultados
+"""
+
+
+def expand_inputs(patterns):
+    """
+    :param patterns: diretorios (todos os arquivos dentro, menos os .md), arquivos ou globs
+    :return: caminhos dos arquivos, ordenados e sem repeticao
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+            candidates = [path for path in candidates if os.path.isfile(path) and not path.endswith(".md")]
+        else:
+            candidates = glob.glob(pattern)
+
+        paths.extend(sorted(candidates))
+
+    return list(dict.fromkeys(paths))
+
+
+def solve_file(path, binary_dir=None, **options):
+    """
+    Resolve um arquivo e devolve a mesma saida que main.py imprimiria
+    :param binary_dir: se for dado, o resultado tambem e gravado em binary_dir/<nome da entrada>/, um .npy por campo,
+    pelo proprio processo do pool
+    :return: caminho e texto da saida
+    """
+    try:
+        result = create_runner(path, **options).solve()
+    except InputFormatError as error:
+        return path, f"Entrada invalida: {error}\n"
+
+    if binary_dir is not None:
+        save_result_arrays(result, os.path.join(binary_dir, os.path.basename(path)))
+
+    return path, format_result(result)
+
+
+def run_batch(paths, workers=None, chunksize=1, output_dir=None, stream=None, binary_dir=None, **options):
+    """
+    Espalha os arquivos pelos processos do pool, que sao reaproveitados entre os arquivos
+    :param workers: quantidade de processos, os.cpu_count() se nao for dado
+    :param chunksize: quantos arquivos cada processo recebe por vez
+    :param output_dir: cada saida vai para um arquivo com o mesmo nome da entrada nesse diretorio
+    :param stream: recebe todas as saidas, na ordem das entradas, cada uma depois de uma linha "==> caminho <==",
+    escritas em blocos grandes
+    :param binary_dir: cada resultado tambem vai para binary_dir/<nome da entrada>/, um .npy por campo
+    :param options: argumentos do SimplexRunner
+    :return: quantidade de arquivos resolvidos
+    """
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    solved = 0
+    writer = ResultWriter(stream) if stream is not None else None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(functools.partial(solve_file, binary_dir=binary_dir, **options), paths,
+                               chunksize=chunksize)
+
+        for path, output in results:
+            if output_dir is not None:
+                with open(os.path.join(output_dir, os.path.basename(path)), "w") as output_file:
+                    output_file.write(output)
+
+            if writer is not None:
+                writer.write(f"==> {path} <==\n")
+                writer.write(output)
+
+            solved += 1
+
+    if writer is not None:
+        writer.close()
+
+    logging.info(f"{solved} arquivos resolvidos")
+    return solved
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Simplex duas fases para varios arquivos, num pool de processos")
+    parser.add_argument("inputs", nargs="+", help="diretorios, arquivos ou globs com os problemas")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="quantidade de processos, a quantidade de cpus se nao for dado")
+    parser.add_argument("--chunksize", type=int, default=1,
+                        help="quantos arquivos cada processo recebe de uma vez")
+    parser.add_argument("--output-dir", default=None,
+                        help="escreve a saida de cada entrada num arquivo de mesmo nome nesse diretorio, em vez de "
+                             "todas juntas na saida padrao")
+    parser.add_argument("--binary-output", default=None,
+                        help="tambem grava cada resultado num diretorio com o nome da entrada dentro desse, com "
+                             "status.npy, objective.npy, x.npy e certificate.npy")
+    add_runner_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="mostra no stderr quantos arquivos foram resolvidos")
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+
+    if arguments.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+
+    paths = expand_inputs(arguments.inputs)
+    if not paths:
+        sys.exit(f"Nenhum arquivo em {arguments.inputs}")
+
+    stream = sys.stdout if arguments.output_dir is None else None
+    run_batch(paths, workers=arguments.workers, chunksize=arguments.chunksize, output_dir=arguments.output_dir,
+              stream=stream, binary_dir=arguments.binary_output, **runner_options(arguments))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import logging
+import numpy as np
+
+from Utils.linear_algebra import LinearAlgebra
+from pricing import PricingStrategy
+from solve_result import SolveResult, OPTIMAL, UNFEASIBLE, UNBOUNDED
+
+
+class BatchSimplex:
+    """
+    Solves K problems max c_k*x, Ax <= b_k, x >= 0 that share A at once. The K tableaus [VERO | A | I | b] are
+    stacked in a K x (n + 1) x (2n + m + 1) array and every pivot step (pricing, ratio test and the pivot update)
+    is a single numpy operation over all the problems that are still running. Finished problems are masked out.
+
+    It follows the same steps as SimplexRunner with the tableau engine, so each problem gets the same pivots,
+    status and certificate:
+        * problems with a negative b go through the auxiliary problem first, with synthetic columns only for
+        the restrictions without a basic column. Every problem has n synthetic columns, the ones it does not
+        need are zero and never enter the basis
+        * then the phase 2 of every feasible problem, from the slack basis or the one phase 1 found
+    Proportional rows are not removed, as they depend on each b, and the dual simplex is not used.
+    """
+
+    PRICING_RULES = ("bland", "dantzig")
+
+    def __init__(self, a: np.ndarray, b: np.ndarray, c: np.ndarray, pricing="bland"):
+        """
+        :param a: shared restriction matrix, n x m
+        :param b: one b per problem, K x n
+        :param c: one objective function per problem, K x m, or a single one for every problem
+        :param pricing: bland or dantzig, which falls back to bland after a streak of degenerate pivots, like
+            PricingStrategy
+        """
+        if pricing not in self.PRICING_RULES:
+            raise ValueError(f"Unknown batch pricing rule {pricing}, choose one of {self.PRICING_RULES}")
+        self.pricing = pricing
+
+        a = np.asarray(a, dtype=float)
+        b = np.atleast_2d(np.asarray(b, dtype=float))
+        self.n_restrictions, self.m_variables = a.shape
+        self.k_problems = b.shape[0]
+        self.c = np.broadcast_to(np.asarray(c, dtype=float), (self.k_problems, self.m_variables))
+
+        self.tableaus = self.create_tableaus(a, b, self.c)
+        self.basis = np.tile(LinearAlgebra.get_slack_basis(self.n_restrictions, self.m_variables),
+                             (self.k_problems, 1))
+
+        # pivots of each problem, both phases
+        self.pivot_counts = np.zeros(self.k_problems, dtype=int)
+
+    @staticmethod
+    def create_tableaus(a: np.ndarray, b: np.ndarray, c: np.ndarray):
+        """
+        :return: K tableaus [VERO | A | I | b] with first row [0 | -c | 0 | 0], in a single array
+        """
+        n, m = a.shape
+        k = b.shape[0]
+        identity = np.eye(n)
+
+        tableaus = np.zeros((k, n + 1, 2 * n + m + 1))
+        tableaus[:, 1:, :n] = identity
+        tableaus[:, 1:, n:n + m] = a
+        tableaus[:, 1:, n + m:2 * n + m] = identity
+        tableaus[:, 1:, -1] = b
+        tableaus[:, 0, n:n + m] = -c
+
+        return tableaus
+
+    def solve(self):
+        """
+        :return: one SolveResult per problem, in the order of b
+        """
+        results = [None] * self.k_problems
+
+        needs_phase_1 = np.any(self.tableaus[:, 1:, -1] < -LinearAlgebra.TOLERANCE, axis=1)
+        if np.any(needs_phase_1):
+            self.__phase_1(np.flatnonzero(needs_phase_1), results)
+
+        phase_2 = np.array([k for k in range(self.k_problems) if results[k] is None], dtype=int)
+        unbounded, counts = self.__run(self.tableaus, self.basis, phase_2)
+        self.pivot_counts += counts
+
+        n = self.n_restrictions
+        for k in unbounded:
+            x_solution = LinearAlgebra.get_x_solution(self.tableaus[k], self.basis[k])
+            results[k] = SolveResult(UNBOUNDED, None, x_solution, self.tableaus[k, 0, :n].copy())
+
+        for k in phase_2:
+            if results[k] is None:
+                x_solution = LinearAlgebra.get_x_solution(self.tableaus[k], self.basis[k])
+                results[k] = SolveResult(OPTIMAL, self.tableaus[k, 0, -1], x_solution,
+                                         self.tableaus[k, 0, :n].copy())
+
+        logging.info(f"batch simplex: {self.k_problems} problems, {self.pivot_counts.sum()} pivots")
+
+        return results
+
+    def __phase_1(self, problems: np.ndarray, results: list):
+        """
+        Auxiliary problem of the given problems, the ones that are feasible get the phase 2 tableau and basis in
+        self.tableaus and self.basis, the others their unfeasible result
+        """
+        n, m = self.n_restrictions, self.m_variables
+        first_synthetic = 2 * n + m
+
+        # restrictions with negative b are multiplied by -1, like AuxiliarLP does
+        flipped = self.tableaus[problems].copy()
+        negative_b = flipped[:, 1:, -1] < -LinearAlgebra.TOLERANCE
+        flipped[:, 1:][negative_b] *= -1
+
+        basis = self.find_basic_columns(flipped)
+        missing = basis == -1
+        synthetic_columns = np.arange(first_synthetic, first_synthetic + n)
+
+        # [VERO | A | I | synthetic | b], the synthetic column of a restriction with a basic column stays zero
+        auxiliar = np.zeros((problems.size, n + 1, 3 * n + m + 1))
+        auxiliar[:, 1:, :first_synthetic] = flipped[:, 1:, :-1]
+        auxiliar[:, 1:, -1] = flipped[:, 1:, -1]
+        problem_index, restriction = np.nonzero(missing)
+        auxiliar[problem_index, restriction + 1, first_synthetic + restriction] = 1
+        auxiliar[problem_index, 0, first_synthetic + restriction] = 1
+
+        basis[missing] = np.broadcast_to(synthetic_columns, basis.shape)[missing]
+        self.canonicalize_first_rows(auxiliar, basis)
+
+        _, counts = self.__run(auxiliar, basis, np.arange(problems.size))
+        self.pivot_counts[problems] += counts
+
+        for p, k in enumerate(problems):
+            tableau = auxiliar[p]
+
+            if LinearAlgebra.equal_to_zero(tableau[0, -1]):
+                self.__drive_out_synthetic_variables(tableau, basis[p], synthetic_columns)
+
+            synthetic_in_basis = np.any(np.isin(basis[p], synthetic_columns))
+            if tableau[0, -1] < 0 and not LinearAlgebra.equal_to_zero(tableau[0, -1]) or synthetic_in_basis:
+                results[k] = SolveResult(UNFEASIBLE, None, None, tableau[0, :n].copy())
+                continue
+
+            # drops the synthetic columns and puts the original objective function back
+            self.tableaus[k, 1:, :-1] = tableau[1:, :first_synthetic]
+            self.tableaus[k, 1:, -1] = tableau[1:, -1]
+            self.basis[k] = basis[p]
+
+        feasible = np.array([k for k in problems if results[k] is None], dtype=int)
+        if feasible.size > 0:
+            self.tableaus[feasible, 0] = 0
+            self.tableaus[feasible, 0, n:n + m] = -self.c[feasible]
+            self.tableaus[feasible] = self.canonicalize_first_rows(self.tableaus[feasible], self.basis[feasible])
+
+    def __drive_out_synthetic_variables(self, tableau: np.ndarray, basis: np.ndarray, synthetic_columns):
+        # the same degenerate pivots AuxiliarLP does, a row with no original column left keeps its synthetic
+        n = self.n_restrictions
+
+        for restriction in np.flatnonzero(np.isin(basis, synthetic_columns)):
+            row = restriction + 1
+            candidates = tableau[row, n:synthetic_columns[0]]
+            nonzero = np.flatnonzero(np.abs(candidates) > LinearAlgebra.TOLERANCE)
+
+            if nonzero.size == 0:
+                continue
+
+            column = int(nonzero[0]) + n
+            self.pivot_tableaus(tableau[np.newaxis], np.array([row]), np.array([column]))
+            basis[restriction] = column
+
+    def __run(self, tableaus: np.ndarray, basis: np.ndarray, problems: np.ndarray):
+        """
+        Primal simplex over the given problems until each one is optimal or unbounded, in place
+        :param problems: indexes of the problems to solve, in the first axis of tableaus
+        :return: the problems found unbounded and the pivots of every tableau
+        """
+        n = self.n_restrictions
+        k_total = tableaus.shape[0]
+        counts = np.zeros(k_total, dtype=int)
+
+        tableaus[problems] = self.snap_to_zero(tableaus[problems])
+
+        # the same single full scan Simplex.solve does before the first pivot
+        scanned = self.find_unbounded(tableaus[problems])
+        unbounded = list(problems[scanned])
+        active = problems[~scanned]
+
+        use_bland = np.full(k_total, self.pricing == "bland")
+        degenerate_streak = np.zeros(k_total, dtype=int)
+
+        while active.size > 0:
+            # whole array when every problem is running, a gathered copy otherwise
+            everything = active.size == k_total
+            tableau = tableaus if everything else tableaus[active]
+            size = active.size
+            index = np.arange(size)
+
+            reduced_costs = tableau[:, 0, n:-1]
+            negative = reduced_costs < -LinearAlgebra.TOLERANCE
+            running = np.any(negative, axis=1)
+
+            bland_columns = np.argmax(negative, axis=1)
+            dantzig_columns = np.argmin(reduced_costs, axis=1)
+            columns = np.where(use_bland[active], bland_columns, dantzig_columns) + n
+
+            entering = tableau[index, 1:, columns]
+            b_column = tableau[:, 1:, -1]
+            positive = entering > LinearAlgebra.TOLERANCE
+
+            ratios = np.full(entering.shape, np.inf)
+            np.divide(b_column, entering, out=ratios, where=positive)
+            rows = np.argmin(ratios, axis=1) + 1
+
+            # optimal problems stop, problems whose entering column has no positive entry are unbounded
+            bounded = np.any(positive, axis=1)
+            unbounded.extend(active[running & ~bounded])
+            pivoting = running & bounded
+
+            if not np.all(pivoting):
+                if not everything:
+                    tableaus[active] = tableau
+                active, tableau = active[pivoting], tableau[pivoting]
+                rows, columns = rows[pivoting], columns[pivoting]
+                everything = False
+                index = np.arange(active.size)
+
+            if active.size == 0:
+                break
+
+            degenerate = np.abs(tableau[index, rows, -1]) <= LinearAlgebra.TOLERANCE
+
+            self.pivot_tableaus(tableau, rows, columns)
+            if not everything:
+                tableaus[active] = tableau
+
+            basis[active, rows - 1] = columns
+            counts[active] += 1
+
+            degenerate_streak[active] = np.where(degenerate, degenerate_streak[active] + 1, 0)
+            use_bland[active] |= degenerate_streak[active] >= PricingStrategy.DEGENERATE_PIVOTS_LIMIT
+
+        return unbounded, counts
+
+    @staticmethod
+    def pivot_tableaus(tableaus: np.ndarray, rows: np.ndarray, columns: np.ndarray):
+        """
+        In place, pivots tableaus[k] at [rows[k], columns[k]] for every k, like Simplex.pivotTableauInPlace
+        """
+        index = np.arange(tableaus.shape[0])
+
+        pivot_values = tableaus[index, rows, columns]
+        pivot_rows = tableaus[index, rows] * (1.0 / pivot_values)[:, np.newaxis]
+        pivot_rows[index, columns] = 1.0
+
+        factors = tableaus[index, :, columns]
+        factors[index, rows] = 0
+
+        tableaus -= factors[:, :, np.newaxis] * pivot_rows[:, np.newaxis, :]
+        tableaus[index, rows] = pivot_rows
+
+        return BatchSimplex.snap_to_zero(tableaus)
+
+    @staticmethod
+    def snap_to_zero(tableaus: np.ndarray):
+        tableaus[np.abs(tableaus) <= LinearAlgebra.TOLERANCE] = 0
+        return tableaus
+
+    @staticmethod
+    def find_unbounded(tableaus: np.ndarray):
+        """
+        Simplex.isUnbounded for every tableau, true if any column with negative c has no positive entry
+        """
+        negative_c = tableaus[:, 0, :] < 0
+        non_positive = np.all(tableaus <= 0, axis=1)
+
+        return np.any(negative_c & non_positive, axis=1)
+
+    @staticmethod
+    def find_basic_columns(tableaus: np.ndarray):
+        """
+        LinearAlgebra.findBasicColumns(drop_c=True, get_rightmost=True) for every tableau, without the vero and b
+        :return: K x n basis headers, in tableau columns, -1 for the restrictions without a basic column
+        """
+        n = tableaus.shape[1] - 1
+        restrictions = tableaus[:, 1:, n:-1]
+
+        unit_columns = (np.count_nonzero(restrictions, axis=1) == 1) & (np.sum(restrictions, axis=1) == 1)
+        is_basic = unit_columns[:, np.newaxis, :] & (restrictions == 1)
+
+        width = restrictions.shape[2]
+        rightmost = width - 1 - np.argmax(is_basic[:, :, ::-1], axis=2)
+
+        return np.where(np.any(is_basic, axis=2), rightmost + n, -1)
+
+    @staticmethod
+    def canonicalize_first_rows(tableaus: np.ndarray, basis: np.ndarray):
+        """
+        In place, Simplex.canonicalizeFirstRow for every tableau, first row = c - c_B * [B^-1 A | B^-1 | B^-1 b]
+        """
+        index = np.arange(tableaus.shape[0])[:, np.newaxis]
+        c_basis = tableaus[index, 0, basis]
+
+        tableaus[:, 0] -= np.einsum('kr,krw->kw', c_basis, tableaus[:, 1:])
+        tableaus[index, 0, basis] = 0
+        first_rows = tableaus[:, 0]
+        first_rows[np.abs(first_rows) <= LinearAlgebra.TOLERANCE] = 0
+        tableaus[:, 0] = first_rows
+
+        return tableaus
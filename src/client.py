@@ -0,0 +1,56 @@
+import argparse
+import socket
+import sys
+
+from protocol import parse_address, send_message, receive_message
+
+"""
+Cliente do server.py, substitui "python src/main.py < entrada": le o problema da entrada padrao (ou de --input),
+manda para o servidor e imprime a resposta. Nao importa o numpy nem o simplex.
+"""
+
+
+def solve(text: str, socket_path=None, host="127.0.0.1", port=None):
+    """
+    :param text: o problema, no formato da entrada padrao ou em JSON
+    :return: as linhas que main.py imprimiria, None se o servidor fechar a conexao sem responder
+    """
+    family, address = parse_address(socket_path, host, port)
+
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        connection.connect(address)
+        send_message(connection, text)
+        return receive_message(connection)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Manda o problema da entrada padrao para o servidor do simplex")
+    parser.add_argument("--socket", default=None, help="caminho do socket unix do servidor")
+    parser.add_argument("--host", default="127.0.0.1", help="endereco tcp do servidor")
+    parser.add_argument("--port", type=int, default=None, help="porta tcp do servidor")
+    parser.add_argument("--input", default=None, help="arquivo com o problema, em vez da entrada padrao")
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+
+    if arguments.input is None:
+        text = sys.stdin.read()
+    else:
+        with open(arguments.input) as stream:
+            text = stream.read()
+
+    try:
+        output = solve(text, arguments.socket, arguments.host, arguments.port)
+    except (OSError, ValueError) as error:
+        sys.exit(f"Servidor indisponivel: {error}")
+
+    if output is None:
+        sys.exit("O servidor fechou a conexao sem responder")
+
+    sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
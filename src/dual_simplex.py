@@ -0,0 +1,112 @@
+import numpy as np
+import logging
+from Utils.linear_algebra import LinearAlgebra
+from exceptions import UnfeasibleError
+from pricing import PricingStrategy
+from simplex import Simplex
+
+
+class DualSimplex(Simplex):
+    """
+    Dual simplex over the same [VERO | A | I | b] tableau, for problems that are dual feasible at the starting
+    basis (every first row entry >= 0, eg. c <= 0 with the slack basis) but have negative b values.
+
+    Every pivot keeps the first row >= 0 and removes a negative b:
+        * the leaving row is the one with the most negative b
+        * the entering column is the smallest c_j / |a_rj| among the negative a_rj of that row, so the first row
+        stays >= 0
+    It ends at an optimal basis, in a single phase, without the auxiliary problem. If the leaving row has no
+    negative entry its VERO row y is a Farkas certificate, y >= 0, y^T A >= 0 and y^T b < 0, as the row is
+    y^T [A | I | b]. Without the vero the same row is read from the slack columns.
+    """
+
+    def __init__(self, m, n, tableau, pricing="bland", ratio_test="textbook", **simplex_options) -> None:
+        """
+        The leaving row and the entering column are always chosen as above, so pricing and ratio_test only take
+        their defaults. A PricingStrategy is accepted too, its rule is not used but it counts the dual pivots with
+        the ones of other solves
+        """
+        if not isinstance(pricing, PricingStrategy) and pricing != "bland":
+            raise ValueError(f"The dual simplex has its own entering column choice, pricing {pricing} is not used")
+        if ratio_test != "textbook":
+            raise ValueError(f"The dual simplex has its own ratio test, {ratio_test} is not used")
+
+        super().__init__(m, n, tableau, pricing=pricing, ratio_test=ratio_test, **simplex_options)
+
+    def is_dual_feasible(self):
+        """
+        True if every reduced cost (first row, without the vero and b) is >= 0
+        """
+        return not LinearAlgebra.any_below_zero(self.tableau[0, self.vero_columns:-1])
+
+    def solve(self):
+
+        self.workspace.snap_to_zero(self.tableau)
+
+        if not self.is_dual_feasible():
+            raise Exception(f"Dual simplex needs a dual feasible basis, first row is {self.tableau[0]}")
+
+        degenerate_streak = 0
+
+        while True:
+            self.raiseIfCancelled(self.cancel_event)
+
+            row = self.leaving_row(use_bland=degenerate_streak >= PricingStrategy.DEGENERATE_PIVOTS_LIMIT)
+
+            # every b >= 0, primal and dual feasible
+            if row == -1:
+                break
+
+            column = self.entering_column(row)
+
+            if column == -1:
+                self.raise_unfeasible(row)
+
+            degenerate = LinearAlgebra.equal_to_zero(self.tableau[0, column])
+            degenerate_streak = degenerate_streak + 1 if degenerate else 0
+
+            self.pivotTableauInPlace(self.tableau, row=row, column=column, workspace=self.workspace)
+            self.basis[row - 1] = column
+
+            self.pricing.record_pivot("dual")
+
+        logging.info(self.pricing.report())
+
+        return self.tableau
+
+    def leaving_row(self, use_bland=False):
+        """
+        :param use_bland: first negative b instead of the most negative one, avoids cycling
+        :return: tableau row with the most negative b or -1 if there is none
+        """
+        b_column = self.tableau[1:, -1]
+        negative = np.flatnonzero(b_column < -LinearAlgebra.TOLERANCE)
+
+        if negative.size == 0:
+            return -1
+
+        if use_bland:
+            return int(negative[0]) + 1
+
+        return int(negative[np.argmin(b_column[negative])]) + 1
+
+    def entering_column(self, row: int):
+        """
+        Dual ratio test over the negative entries of the leaving row, ties broken by the first column
+        :return: tableau column or -1 if the row has no negative entry
+        """
+        n = self.vero_columns
+        pivot_row = self.tableau[row, n:-1]
+        negative = np.flatnonzero(pivot_row < -LinearAlgebra.TOLERANCE)
+
+        if negative.size == 0:
+            return -1
+
+        ratios = self.tableau[0, n:-1][negative] / -pivot_row[negative]
+
+        return int(negative[np.argmin(ratios)]) + n
+
+    def raise_unfeasible(self, row: int):
+        # the vero row of the restriction, y^T [A | I | b] >= 0 everywhere but b
+        certificate = self.certificate(row).copy()
+        raise UnfeasibleError(certificate)
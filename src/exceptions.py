@@ -26,3 +26,17 @@ class UnfeasibleError(Exception):
             return str(self.certificate)
         else:
             return 'Inviavel'
+
+
+class SolveCancelledError(Exception):
+    """
+    The cancel event given to the engine was set, the solve stopped before its next pivot
+    """
+    pass
+
+
+class InputFormatError(ValueError):
+    """
+    The problem input does not follow the n m / c / ab format
+    """
+    pass
@@ -1,11 +1,21 @@
+import argparse
+import sys
 import numpy as np
 import logging
+import time
 from Utils.linear_algebra import LinearAlgebra
 
 from tableau import TableauParsing
+from mps import MpsParsing
+from presolve import Presolve
 from simplex import Simplex
+from revised_simplex import RevisedSimplex
+from dual_simplex import DualSimplex
 from auxiliar_lp import AuxiliarLP
-from exceptions import UnfeasibleError, UnboundedError
+from pricing import PRICING_RULES
+from exceptions import UnfeasibleError, UnboundedError, InputFormatError
+from solve_result import SolveResult, OPTIMAL, UNFEASIBLE, UNBOUNDED
+from output import print_result, save_result_arrays
 
 logging.basicConfig(
     format='[%(filename)s:%(lineno)d] %(message)s',
@@ -18,6 +28,19 @@ Para entendimento, temos um arquivo main, que possui a classe SimplexRunner, que
 * auxiliar_lp.py: responsavel pelo auxiliar
 * exceptions.py, que define as exceções utilizadas no programa no caso de inviavel ou ilimitada
 * tableau.py, que lê o arquivo de entrada e cria o tableau no formato correto
+* mps.py, que lê modelos no formato MPS e os converte para max c*x, Ax <= b, x >= 0
+* presolve.py, que reduz o problema antes do simplex e mapeia x e certificados de volta
+* simplex.py e revised_simplex.py, os dois motores do simplex (tableau completo e simplex revisado)
+* dual_simplex.py, simplex dual no mesmo tableau, para b negativo com c <= 0, sem a fase 1
+* warm_start.py, resolve de novo o mesmo modelo a partir da ultima base quando so c ou b mudam
+* batch_simplex.py, resolve de uma vez varios problemas com o mesmo A, empilhados num array 3D
+* solve_result.py, o resultado de um problema (status, valor, x, certificado, pivos e tempos) sem imprimir, e output.py,
+que o formata no texto impresso ou grava cada campo num .npy
+* batch_runner.py, resolve um diretorio ou glob de arquivos num pool de processos
+* shared_tableau.py, cenarios (c e b diferentes, mesmo A) em processos que leem o tableau base da memoria compartilhada
+* server.py e client.py, servidor local (socket unix ou tcp) que resolve problemas sem iniciar um python por problema, protocolo em protocol.py
+* async_solver.py, solve_async para codigo asyncio, com limite de concorrencia, timeout e cancelamento entre pivos
+* result_cache.py, cache dos resultados por hash do problema, em memoria (LRU) e opcionalmente em disco, usado pelo servidor
 
 Dentro da pasta Utils temos o arquivo linear_algebra.py, que possui funções úteis e modulares para lidar com vários aspectos do simplex.
 
@@ -41,70 +64,262 @@ class SimplexTester:
         self.Lp_Type = None
 
 
+# simplex implementations selectable by the runner
+ENGINES = {
+    "tableau": Simplex,
+    "revised": RevisedSimplex,
+}
+
+
+# problems in this format are loaded with TableauParsing.read_binary_problem
+BINARY_MODEL_SUFFIX = ".npy"
+# and these with MpsParsing.read_mps_file
+MPS_MODEL_SUFFIX = ".mps"
+
+
 class SimplexRunner:
-    def __init__(self) -> None:
+    def __init__(self, engine="tableau", pricing="bland", ratio_test="textbook", unbounded_check="entering",
+                 stream=None, model_path=None, presolve=False, remove_dependent=False, dual_simplex=True,
+                 problem=None, vero=True, tableau=None, cancel_event=None) -> None:
+        """
+        :param problem: (c, ab) already in memory, instead of a model file, stream or stdin
+        :param vero: False builds the tableau without the vero, n columns less to store and pivot, the certificate
+        is read from the slack columns at the end, with the same values
+        :param tableau: one already built by TableauParsing.create_full_tableau, with the same vero, instead of a
+        problem, solved from the slack basis without another copy and with its rows as they are, so there is no
+        presolve or row removal
+        :param cancel_event: threading.Event, the engines stop with SolveCancelledError before the next pivot once
+        it is set
+        """
+        start = time.perf_counter()
+
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown simplex engine {engine}, choose one of {list(ENGINES)}")
+        self.engine = ENGINES[engine]
+        # keyword arguments given to the engine, in both phases
+        self.engine_options = {"pricing": pricing, "ratio_test": ratio_test, "unbounded_check": unbounded_check,
+                               "vero": vero, "cancel_event": cancel_event}
+        self.vero = vero
+        # dual feasible problems with negative b skip phase 1 and are solved by the dual simplex (tableau engine)
+        self.dual_simplex = dual_simplex
+
+        # MPS models are converted to max c*x, Ax <= b, x >= 0, this maps the solution back to the file
+        self.mps_model = None
+
+        # certificate over the original rows when a restriction is found unfeasible before the simplex
+        self.unfeasible_certificate = None
+        # reductions made before the tableau is built, mapped back in the results
+        self.presolve = None
+        self.dependent_rows = []
+        self.removed_rows = []
+
+        if tableau is not None:
+            if presolve or remove_dependent:
+                raise ValueError("presolve and remove_dependent need the restrictions, not a built tableau")
+            self.tableau = np.asarray(tableau, dtype=float)
+            self.original_n = LinearAlgebra.get_number_of_n_restrictions(self.tableau)
+            self.m_variables = LinearAlgebra.get_number_of_m_variables(self.tableau, has_vero=vero)
+        else:
+            self.tableau = self.__read_tableau(problem, stream, model_path, presolve, remove_dependent)
+
+        self.n_restrictions = LinearAlgebra.get_number_of_n_restrictions(self.tableau)
+
+        # basis header, the slack columns are the trivial basis of a freshly read tableau
+        self.basis = LinearAlgebra.get_slack_basis(self.n_restrictions, self.m_variables, has_vero=vero)
+
+        # seconds and pivots of each stage, reported in the SolveResult
+        self.timings = {"read": time.perf_counter() - start}
+        self.iterations = {}
+
+    def __read_tableau(self, problem, stream, model_path, presolve, remove_dependent):
+        """
+        Reads the problem, applies the reductions that were asked for and builds the tableau over what is left
+        """
+        # the whole problem is read at once, from memory, a model file, stream or stdin
+        if problem is not None:
+            c, ab = problem
+            c, ab = np.asarray(c, dtype=float).reshape(1, -1), np.asarray(ab, dtype=float)
+            self.original_n, self.m_variables = ab.shape[0], ab.shape[1] - 1
+        elif model_path is not None and str(model_path).lower().endswith(MPS_MODEL_SUFFIX):
+            self.mps_model = MpsParsing.read_mps_file(model_path)
+            self.original_n, self.m_variables = self.mps_model.n_restrictions, self.mps_model.m_variables
+            c, ab = self.mps_model.c, self.mps_model.ab
+        elif model_path is not None:
+            self.original_n, self.m_variables, c, ab = TableauParsing.read_binary_problem(model_path)
+        else:
+            self.original_n, self.m_variables, c, ab = TableauParsing.read_problem(stream)
+
+        # opt-in presolve, shrinks the problem before the tableau is built and maps the results back
+        if presolve:
+            self.presolve = Presolve(c, ab)
+            c, ab, self.m_variables = self.presolve.c, self.presolve.ab, self.presolve.m_variables
+            self.unfeasible_certificate = self.presolve.unfeasible_certificate
+
+        # opt-in, equalities that are a combination of other equalities
+        if remove_dependent and self.unfeasible_certificate is None:
+            ab, self.dependent_rows, certificate = LinearAlgebra.remove_dependent_equalities(ab)
+            if certificate is not None:
+                self.unfeasible_certificate = self.__original_certificate(certificate, dual_feasible=False,
+                                                                          stage="dependent")
 
         # We can have a smaller n, if we have dependent restrictions
-        original_n, self.m_variables = TableauParsing.read_n_m_dimensions()
-        self.tableau, self.n_restrictions = TableauParsing.read_ab_and_create_tableau(original_n,
-                                                                                      self.m_variables)
+        # only positive multiples are removed, the a*x <= b and -a*x <= -b pair of an equality is kept
+        ab, self.removed_rows = LinearAlgebra.remove_equal_rows(ab)
 
-        self.original_n = original_n
+        return TableauParsing.create_full_tableau(c, ab, ab.shape[0], self.m_variables, remove_equal_rows=False,
+                                                  vero=self.vero)
 
-    def print_certificate(self, certificate=None):
+    def print_certificate(self, certificate=None, dual_feasible=True):
+        """
+        :param certificate: certificate over the tableau restrictions, the optimal one if not given
+        :param dual_feasible: True for the optimal certificate, False for the unfeasible and unbounded ones
+        """
         if certificate is None:
-            certificate = LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions)
+            certificate = self.__certificate()
+
+        LinearAlgebra.arrayPrint(self.__original_certificate(certificate, dual_feasible))
+
+    def __original_certificate(self, certificate, dual_feasible, stage="tableau"):
+        """
+        Maps a certificate back through every step that removed restrictions, from the given one on
+        :param stage: tableau, for a certificate of the tableau restrictions, or dependent, for one given by
+        remove_dependent_equalities
+        """
+        if stage == "tableau":
+            # add 0's to certificate at the positions of the removed restrictions
+            # happens when we have dependent restrictions, ie, one scaled by a constant
+            certificate = self.__insert_zeros(certificate, self.removed_rows)
+            # the same for the removed dependent equalities
+            certificate = self.__insert_zeros(certificate, self.dependent_rows)
+
+        # and the entries of the restrictions removed by presolve
+        if self.presolve is not None:
+            certificate = self.presolve.postsolve_certificate(certificate, dual_feasible=dual_feasible)
 
-        # add missing 0's to certificate, corresponding to the removed restrictions
-        # happens when we have dependent restrictions, ie, one scaled by a constant
-        if self.original_n > self.n_restrictions:
-            delta_zeros = self.original_n - self.n_restrictions
-            certificate = np.append(certificate, np.zeros(delta_zeros))
+        return certificate
 
-        LinearAlgebra.arrayPrint(certificate)
+    @staticmethod
+    def __insert_zeros(certificate, removed_rows):
+        if len(removed_rows) == 0:
+            return certificate
+
+        padded = np.zeros(len(certificate) + len(removed_rows))
+        padded[np.delete(np.arange(padded.shape[0]), removed_rows)] = certificate
+        return padded
+
+    def __certificate(self):
+        return LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions, self.m_variables, self.vero)
 
     def print_x_solution(self):
 
-        x_solution = LinearAlgebra.get_x_solution(self.tableau)
-        LinearAlgebra.arrayPrint(x_solution)
+        x_solution = LinearAlgebra.get_x_solution(self.tableau, self.basis, has_vero=self.vero)
+        LinearAlgebra.arrayPrint(self.__original_x(x_solution))
+
+    def __original_x(self, x_solution):
+        # variables removed by presolve are 0
+        if self.presolve is not None:
+            x_solution = self.presolve.original_x(x_solution)
+        # MPS models print the variables of the file, not the ones the simplex solved
+        if self.mps_model is not None:
+            return self.mps_model.original_x(x_solution)
+        return x_solution
 
     def get_optimal_value(self):
+        return round(self.__original_objective(), 7)
+
+    def __original_objective(self):
         optimal = self.tableau[0][-1]
-        return round(optimal, 7)
+        if self.mps_model is not None:
+            optimal = self.mps_model.original_objective(optimal)
+        return optimal
 
     def run_simplex(self):
+        print_result(self.solve())
+
+    def solve(self):
+        """
+        Runs both phases (or the dual simplex) and returns the outcome, mapped back to the original problem
+        :return: SolveResult, with the same values run_simplex prints
+        """
+        # presolve or the dependent equalities found a restriction that cannot be satisfied,
+        # its certificate is already over the original rows
+        if self.unfeasible_certificate is not None:
+            return self.__result(UNFEASIBLE, certificate=self.unfeasible_certificate)
+
         try:
+            if self.__should_use_dual_simplex():
+                # negative b but dual feasible slack basis, solved in a single phase
+                # the dual simplex chooses its own rows and columns, pricing and ratio_test are only for the primal
+                dual_options = {option: value for option, value in self.engine_options.items()
+                                if option not in ("pricing", "ratio_test")}
+                solver = DualSimplex(m=self.m_variables, n=self.n_restrictions, tableau=self.tableau,
+                                     basis=self.basis, **dual_options)
+                self.__run_stage("dual_simplex", solver)
+                return self.__optimal_result(solver)
+
             # execute phase 1
             if not self.__should_skip_auxiliar():
                 # if there is a trivial solution, skip auxiliar
-                tableau_with_trivial_basis = AuxiliarLP(self.tableau).phase_1()
+                start = time.perf_counter()
+                auxiliar = AuxiliarLP(self.tableau, engine=self.engine, **self.engine_options)
+                try:
+                    tableau_with_trivial_basis = auxiliar.phase_1()
+                finally:
+                    self.timings["phase_1"] = time.perf_counter() - start
+                    self.iterations["phase_1"] = auxiliar.pivots
+                trivial_basis = auxiliar.basis
             else:
                 tableau_with_trivial_basis = self.tableau
+                trivial_basis = self.basis
 
             # execute phase 2
-            phase2 = Simplex(m=self.m_variables, n=self.n_restrictions, tableau=tableau_with_trivial_basis)
-
-            phase2.solve()
-
-            self.tableau = phase2.tableau
-            print("otima")
-            print(self.get_optimal_value())
-            self.print_x_solution()
-            self.print_certificate()
+            phase2 = self.engine(m=self.m_variables, n=self.n_restrictions, tableau=tableau_with_trivial_basis,
+                                 basis=trivial_basis, **self.engine_options)
+            self.__run_stage("phase_2", phase2)
+            return self.__optimal_result(phase2)
 
         except UnboundedError as Ub:
-            print("ilimitada")
-            LinearAlgebra.arrayPrint(Ub.x_solution)
-            self.print_certificate(Ub.certificate)
+            return self.__result(UNBOUNDED, x=self.__original_x(Ub.x_solution),
+                                 certificate=self.__original_certificate(Ub.certificate, dual_feasible=False))
         except UnfeasibleError as Uf:
-            print("inviavel")
-            self.print_certificate(Uf.certificate)
+            return self.__result(UNFEASIBLE,
+                                 certificate=self.__original_certificate(Uf.certificate, dual_feasible=False))
 
-    def __should_skip_auxiliar(self):
-        basic_columns = LinearAlgebra.findBasicColumns(self.tableau)
+    def __run_stage(self, stage, solver):
+        start = time.perf_counter()
+        try:
+            solver.solve()
+        finally:
+            self.timings[stage] = time.perf_counter() - start
+            self.iterations[stage] = solver.pricing.total_pivots
+
+    def __optimal_result(self, solver):
+        self.tableau = solver.tableau
+        self.basis = solver.basis
+
+        x_solution = LinearAlgebra.get_x_solution(self.tableau, self.basis, has_vero=self.vero)
+        certificate = self.__certificate()
+
+        return self.__result(OPTIMAL, objective=self.__original_objective(), x=self.__original_x(x_solution),
+                             certificate=self.__original_certificate(certificate, dual_feasible=True))
 
+    def __result(self, status, objective=None, x=None, certificate=None):
+        self.timings["total"] = sum(self.timings.values())
+        return SolveResult(status, objective, x, certificate, iterations=dict(self.iterations),
+                           timings=dict(self.timings))
+
+    def __should_use_dual_simplex(self):
+        # only when phase 1 would be needed, ie, there is a negative b
+        if not self.dual_simplex or self.__should_skip_auxiliar() or np.any(self.basis == -1):
+            return False
+
+        # and the first row is already >= 0, which is the case of every c <= 0 with the slack basis
+        vero_columns = self.n_restrictions if self.vero else 0
+        return not LinearAlgebra.any_below_zero(self.tableau[0, vero_columns:-1])
+
+    def __should_skip_auxiliar(self):
         # if there is a trivial solution, skip auxiliar
-        trivial_basis_found = np.all(basic_columns != -1)
+        trivial_basis_found = np.all(self.basis != -1)
 
         b_column = self.tableau.T[-1]
         # if there is a negative b value the trivial solution is unfeasible
@@ -113,9 +328,116 @@ class SimplexRunner:
         return trivial_solution_is_feasible and trivial_basis_found
 
 
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Simplex duas fases, le o problema da entrada padrao")
+    parser.add_argument("--input", default=None,
+                        help="arquivo com o problema, no mesmo formato da entrada padrao, binario .npy ou MPS .mps "
+                             "(imprime x e o valor objetivo nas variaveis e no sentido do arquivo)")
+    parser.add_argument("--convert-to", default=None,
+                        help="so converte o problema para o formato binario .npy nesse arquivo, sem resolver")
+    parser.add_argument("--binary-output", default=None,
+                        help="tambem grava o resultado nesse diretorio, um .npy por campo (status, objective, x e "
+                             "certificate)")
+    add_runner_arguments(parser)
+    parser.add_argument("--verbose", action="store_true",
+                        help="mostra no stderr a regra de pricing usada e quantos pivos ela fez")
+    return parser.parse_args()
+
+
+def add_runner_arguments(parser):
+    """
+    Opcoes do SimplexRunner, as mesmas para um problema ou para um lote (batch_runner.py)
+    """
+    parser.add_argument("--engine", choices=list(ENGINES), default="tableau",
+                        help="tableau: atualiza o tableau inteiro a cada pivo, revised: simplex revisado")
+    parser.add_argument("--pricing", choices=list(PRICING_RULES), default="bland",
+                        help="regra de escolha da coluna que entra na base")
+    parser.add_argument("--ratio-test", choices=Simplex.RATIO_TESTS, default="textbook",
+                        help="textbook: menor razao, harris: duas passadas com tolerancia, maior pivo entre empates")
+    parser.add_argument("--unbounded-check", choices=Simplex.UNBOUNDED_CHECKS, default="entering",
+                        help="entering: so a coluna que entra na base, full: todas as colunas a cada pivo (diagnostico)")
+    parser.add_argument("--presolve", action="store_true",
+                        help="remove restricoes redundantes e forcantes e variaveis dominadas antes do simplex")
+    parser.add_argument("--remove-dependent", action="store_true",
+                        help="remove igualdades (pares a*x <= b e -a*x <= -b) que sao combinacao linear de outras")
+    parser.add_argument("--no-dual-simplex", action="store_true",
+                        help="usa sempre as duas fases, mesmo quando c <= 0 permitiria o simplex dual com b negativo")
+    parser.add_argument("--no-vero", action="store_true",
+                        help="monta o tableau sem o vero (n colunas a menos a cada pivo), o certificado sai das "
+                             "colunas de folga no fim, com os mesmos valores")
+
+
+def runner_options(arguments):
+    """
+    Argumentos do SimplexRunner a partir das opcoes de add_runner_arguments
+    """
+    return {"engine": arguments.engine, "pricing": arguments.pricing, "ratio_test": arguments.ratio_test,
+            "unbounded_check": arguments.unbounded_check, "presolve": arguments.presolve,
+            "remove_dependent": arguments.remove_dependent, "dual_simplex": not arguments.no_dual_simplex,
+            "vero": not arguments.no_vero}
+
+
+def solve(c, ab, **options):
+    """
+    Resolve max c*x, Ax <= b, x >= 0 sem imprimir nada
+    :param c: funcao objetivo, m valores
+    :param ab: restricoes [A | b], n x (m + 1)
+    :param options: argumentos do SimplexRunner (engine, pricing, presolve, ...)
+    :return: SolveResult, com status, valor objetivo, x, certificado, pivos e tempos
+    """
+    return SimplexRunner(problem=(c, ab), **options).solve()
+
+
+def create_runner(input_path=None, stream=None, **options):
+    """
+    Le o problema do arquivo (texto, binario .npy ou MPS .mps), do stream de texto ou da entrada padrao, se
+    nenhum dos dois for dado
+    """
+    if input_path is None:
+        return SimplexRunner(stream=stream, **options)
+
+    if str(input_path).lower().endswith((BINARY_MODEL_SUFFIX, MPS_MODEL_SUFFIX)):
+        return SimplexRunner(model_path=input_path, **options)
+
+    with open(input_path) as stream:
+        return SimplexRunner(stream=stream, **options)
+
+
+def convert_input(input_path, output_path):
+    """
+    Converte o problema em texto (arquivo ou entrada padrao) para o formato binario
+    """
+    if input_path is None:
+        n_restrictions, m_variables = TableauParsing.convert_text_to_binary(sys.stdin, output_path)
+    else:
+        with open(input_path) as stream:
+            n_restrictions, m_variables = TableauParsing.convert_text_to_binary(stream, output_path)
+
+    logging.info(f"{n_restrictions} restricoes e {m_variables} variaveis escritas em {output_path}")
+
+
 def main():
-    simplex_runner = SimplexRunner()
-    simplex_runner.run_simplex()
+    arguments = parse_arguments()
+
+    if arguments.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+
+    try:
+        if arguments.convert_to is not None:
+            convert_input(arguments.input, arguments.convert_to)
+            return
+
+        simplex_runner = create_runner(arguments.input, **runner_options(arguments))
+    except InputFormatError as error:
+        sys.exit(f"Entrada invalida: {error}")
+
+    if arguments.binary_output is None:
+        simplex_runner.run_simplex()
+        return
+
+    result = simplex_runner.solve()
+    print_result(result)
+    save_result_arrays(result, arguments.binary_output)
 
 
 # run main
@@ -0,0 +1,388 @@
+import logging
+from array import array
+import numpy as np
+
+from exceptions import InputFormatError
+
+
+class MpsModel:
+    """
+    LP read from an MPS file, already in the form the simplex solves, max c*x, Ax <= b, x >= 0, along with what
+    is needed to map a solution back to the variables and objective of the file.
+
+    Every variable j of the file is x_j = shift_j + x'[positive_j] - x'[negative_j], where x' are the simplex
+    variables and -1 means the term is not used:
+        * lower bound l: x_j = l + x', with x' <= u - l as a restriction if there is an upper bound u
+        * only an upper bound u: x_j = u - x'
+        * free: x_j = x'+ - x'-
+        * fixed: x_j = l, the column is removed
+
+    Certificates are over the restrictions of ab, not over the rows of the file: each file row gives its <= side,
+    its >= side negated or both, in that order and in the ROWS order, followed by one x' <= u - l restriction per
+    variable with both bounds.
+    """
+
+    def __init__(self, name, c, ab, row_names, column_names, objective_sense, objective_offset,
+                 shift, positive, negative):
+        self.name = name
+        self.c = c
+        self.ab = ab
+        self.n_restrictions = ab.shape[0]
+        self.m_variables = ab.shape[1] - 1
+
+        self.row_names = row_names
+        self.column_names = column_names
+
+        # 1 if the file minimizes, -1 if it maximizes
+        self.objective_sense = objective_sense
+        # constant part of the objective, from the objective rhs and the shifted variables
+        self.objective_offset = objective_offset
+
+        self.shift = shift
+        self.positive = positive
+        self.negative = negative
+
+    def original_x(self, x_solution: np.ndarray):
+        """
+        :param x_solution: values of the simplex variables
+        :return: values of the variables of the file, in the COLUMNS order
+        """
+        # extra 0 at the end, picked by the -1 indexes
+        padded = np.append(np.asarray(x_solution, dtype=float), 0)
+        return self.shift + padded[self.positive] - padded[self.negative]
+
+    def original_objective(self, value: float):
+        """
+        :param value: optimal value of the simplex, which maximizes
+        :return: objective value of the file, in its own sense
+        """
+        return self.objective_offset - self.objective_sense * value
+
+
+class MpsParsing:
+    """
+    Streaming reader of free MPS files, sections NAME, OBJSENSE, ROWS, COLUMNS, RHS, RANGES and BOUNDS.
+
+    The file is read line by line and the coefficients are kept in coordinate form (row, column, value), in
+    compact typed arrays, the dense ab is only created at the end, already with the final shape.
+    Fixed MPS files work as long as the names have no spaces.
+    """
+
+    SECTIONS = ("NAME", "OBJSENSE", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "ENDATA")
+
+    ROW_TYPES = ("N", "L", "G", "E")
+
+    # bound types followed by a value
+    VALUE_BOUNDS = ("UP", "LO", "FX", "LI", "UI")
+    # bound types without a value
+    FLAG_BOUNDS = ("FR", "MI", "PL", "BV")
+
+    @staticmethod
+    def read_mps_file(path):
+        with open(path) as stream:
+            return MpsParsing.read_mps(stream)
+
+    @staticmethod
+    def read_mps(stream):
+        """
+        Reads an MPS model from a text stream
+        :return: MpsModel
+        """
+        name = ""
+        objective_sense = 1
+        objective_row = None
+        # file row index of every row name, the objective and the other N rows are not restrictions
+        row_index = {}
+        row_names = []
+        row_types = []
+        free_rows = set()
+
+        column_index = {}
+        column_names = []
+
+        # coordinate form of A, over the file rows and columns
+        entry_rows = array('q')
+        entry_columns = array('q')
+        entry_values = array('d')
+        objective_columns = array('q')
+        objective_values = array('d')
+
+        rhs = {}
+        ranges = {}
+        objective_constant = 0.0
+        lower_bounds = {}
+        upper_bounds = {}
+
+        section = None
+
+        for line_number, line in enumerate(stream, start=1):
+            tokens = line.split()
+
+            if not tokens or line.startswith("*"):
+                continue
+
+            # section headers start at the first column, data lines are indented
+            if not line[0].isspace():
+                section = tokens[0].upper()
+
+                if section not in MpsParsing.SECTIONS:
+                    raise InputFormatError(f"Line {line_number}: unknown MPS section {tokens[0]}")
+                if section == "NAME":
+                    name = " ".join(tokens[1:])
+                elif section == "OBJSENSE" and len(tokens) > 1:
+                    objective_sense = MpsParsing.__read_sense(tokens[1], line_number)
+                elif section == "ENDATA":
+                    break
+                continue
+
+            if section == "OBJSENSE":
+                objective_sense = MpsParsing.__read_sense(tokens[0], line_number)
+
+            elif section == "ROWS":
+                if len(tokens) != 2 or tokens[0].upper() not in MpsParsing.ROW_TYPES:
+                    raise InputFormatError(f"Line {line_number}: expected a row type N, L, G or E and a row name")
+                row_type, row_name = tokens[0].upper(), tokens[1]
+
+                if row_type == "N":
+                    if objective_row is None:
+                        objective_row = row_name
+                    else:
+                        free_rows.add(row_name)
+                    continue
+
+                row_index[row_name] = len(row_names)
+                row_names.append(row_name)
+                row_types.append(row_type)
+
+            elif section == "COLUMNS":
+                # integer markers, the relaxation is solved
+                if "'MARKER'" in tokens:
+                    continue
+                if len(tokens) not in (3, 5):
+                    raise InputFormatError(f"Line {line_number}: expected a column name and one or two row/value pairs")
+
+                column_name = tokens[0]
+                if column_name not in column_index:
+                    column_index[column_name] = len(column_names)
+                    column_names.append(column_name)
+                column = column_index[column_name]
+
+                for row_name, value in MpsParsing.__pairs(tokens[1:], line_number):
+                    if row_name == objective_row:
+                        objective_columns.append(column)
+                        objective_values.append(value)
+                    elif row_name in row_index:
+                        entry_rows.append(row_index[row_name])
+                        entry_columns.append(column)
+                        entry_values.append(value)
+                    elif row_name not in free_rows:
+                        raise InputFormatError(f"Line {line_number}: unknown row {row_name}")
+
+            elif section in ("RHS", "RANGES"):
+                # the set name is optional
+                pairs = tokens[1:] if len(tokens) % 2 == 1 else tokens
+
+                for row_name, value in MpsParsing.__pairs(pairs, line_number):
+                    if section == "RHS" and row_name == objective_row:
+                        # rhs of the objective is minus its constant
+                        objective_constant = -value
+                    elif row_name in row_index:
+                        target = rhs if section == "RHS" else ranges
+                        target[row_index[row_name]] = value
+                    elif row_name not in free_rows:
+                        raise InputFormatError(f"Line {line_number}: unknown row {row_name}")
+
+            elif section == "BOUNDS":
+                bound_type = tokens[0].upper()
+
+                if bound_type in MpsParsing.VALUE_BOUNDS:
+                    if len(tokens) not in (3, 4):
+                        raise InputFormatError(f"Line {line_number}: bound {bound_type} needs a column and a value")
+                    column_name, value = tokens[-2], MpsParsing.__read_float(tokens[-1], line_number)
+                elif bound_type in MpsParsing.FLAG_BOUNDS:
+                    if len(tokens) not in (2, 3):
+                        raise InputFormatError(f"Line {line_number}: bound {bound_type} needs only a column")
+                    column_name, value = tokens[-1], None
+                else:
+                    raise InputFormatError(f"Line {line_number}: unsupported bound type {tokens[0]}")
+
+                if column_name not in column_index:
+                    raise InputFormatError(f"Line {line_number}: unknown column {column_name}")
+                column = column_index[column_name]
+
+                MpsParsing.__apply_bound(bound_type, value, column, lower_bounds, upper_bounds, line_number)
+
+            else:
+                raise InputFormatError(f"Line {line_number}: data outside of a section")
+
+        if not column_names:
+            raise InputFormatError("The MPS model has no columns")
+
+        n_rows = len(row_names)
+        n_columns = len(column_names)
+
+        c_file = np.zeros(n_columns)
+        np.add.at(c_file, np.frombuffer(objective_columns, dtype=np.int64), np.frombuffer(objective_values))
+
+        row_rhs = np.zeros(n_rows)
+        row_rhs[list(rhs)] = list(rhs.values())
+        row_ranges = np.full(n_rows, np.nan)
+        row_ranges[list(ranges)] = list(ranges.values())
+
+        lower = np.zeros(n_columns)
+        lower[list(lower_bounds)] = list(lower_bounds.values())
+        upper = np.full(n_columns, np.inf)
+        upper[list(upper_bounds)] = list(upper_bounds.values())
+
+        coordinates = (np.frombuffer(entry_rows, dtype=np.int64), np.frombuffer(entry_columns, dtype=np.int64),
+                       np.frombuffer(entry_values))
+
+        return MpsParsing.__build_model(name, objective_sense, objective_constant, c_file, coordinates,
+                                        np.array(row_types, dtype='U1'), row_rhs, row_ranges, lower, upper,
+                                        row_names, column_names)
+
+    @staticmethod
+    def __read_sense(token, line_number):
+        token = token.upper()
+        if token in ("MIN", "MINIMIZE"):
+            return 1
+        if token in ("MAX", "MAXIMIZE"):
+            return -1
+        raise InputFormatError(f"Line {line_number}: unknown objective sense {token}")
+
+    @staticmethod
+    def __read_float(token, line_number):
+        try:
+            return float(token)
+        except ValueError:
+            raise InputFormatError(f"Line {line_number}: could not read {token} as a number")
+
+    @staticmethod
+    def __pairs(tokens, line_number):
+        if len(tokens) not in (2, 4):
+            raise InputFormatError(f"Line {line_number}: expected one or two name/value pairs")
+
+        for position in range(0, len(tokens), 2):
+            yield tokens[position], MpsParsing.__read_float(tokens[position + 1], line_number)
+
+    @staticmethod
+    def __apply_bound(bound_type, value, column, lower_bounds, upper_bounds, line_number):
+        if bound_type in ("UP", "UI"):
+            # MPS convention, a negative upper bound without a lower bound makes the variable unbounded below
+            if value < 0 and column not in lower_bounds:
+                logging.warning(f"Line {line_number}: negative upper bound, lower bound set to -inf")
+                lower_bounds[column] = -np.inf
+            upper_bounds[column] = value
+        elif bound_type in ("LO", "LI"):
+            lower_bounds[column] = value
+        elif bound_type == "FX":
+            lower_bounds[column] = value
+            upper_bounds[column] = value
+        elif bound_type == "FR":
+            lower_bounds[column] = -np.inf
+            upper_bounds[column] = np.inf
+        elif bound_type == "MI":
+            lower_bounds[column] = -np.inf
+        elif bound_type == "PL":
+            upper_bounds[column] = np.inf
+        elif bound_type == "BV":
+            lower_bounds[column] = 0
+            upper_bounds[column] = 1
+
+    @staticmethod
+    def __build_model(name, objective_sense, objective_constant, c_file, coordinates, row_types, row_rhs,
+                      row_ranges, lower, upper, row_names, column_names):
+        """
+        Converts the file LP, min/max c*x with L/G/E rows, ranges and bounds, to max c*x, Ax <= b, x >= 0
+        """
+        entry_rows, entry_columns, entry_values = coordinates
+        n_columns = c_file.shape[0]
+
+        if np.any(lower > upper):
+            column = int(np.flatnonzero(lower > upper)[0])
+            raise InputFormatError(f"Column {column_names[column]} has lower bound bigger than its upper bound")
+
+        # columns of the simplex variables, see MpsModel
+        has_lower = np.isfinite(lower)
+        has_upper = np.isfinite(upper)
+        fixed = has_lower & has_upper & (lower == upper)
+        free = ~has_lower & ~has_upper
+
+        shift = np.where(has_lower, lower, np.where(has_upper, upper, 0.0))
+        uses_positive = has_lower & ~fixed | free
+        uses_negative = ~has_lower & has_upper | free
+
+        # positive and negative columns are numbered in the file order, the negative one right after the positive
+        columns_per_variable = uses_positive.astype(np.int64) + uses_negative
+        first_column = np.cumsum(columns_per_variable) - columns_per_variable
+        positive = np.where(uses_positive, first_column, -1)
+        negative = np.where(uses_negative, first_column + uses_positive, -1)
+        m_variables = int(columns_per_variable.sum())
+
+        if m_variables == 0:
+            raise InputFormatError("Every variable of the MPS model is fixed")
+
+        # rows, a * x between row_lower and row_upper
+        is_less = row_types == "L"
+        is_greater = row_types == "G"
+        is_equal = row_types == "E"
+        has_range = ~np.isnan(row_ranges)
+        absolute_range = np.abs(np.nan_to_num(row_ranges))
+
+        row_upper = np.where(is_less | is_equal, row_rhs, np.inf)
+        row_lower = np.where(is_greater | is_equal, row_rhs, -np.inf)
+        row_lower = np.where(has_range & is_less, row_rhs - absolute_range, row_lower)
+        row_upper = np.where(has_range & is_greater, row_rhs + absolute_range, row_upper)
+        row_upper = np.where(has_range & is_equal & (row_ranges > 0), row_rhs + absolute_range, row_upper)
+        row_lower = np.where(has_range & is_equal & (row_ranges < 0), row_rhs - absolute_range, row_lower)
+
+        # moving the shifted part of every variable to the right hand side
+        shifted_activity = np.bincount(entry_rows, weights=entry_values * shift[entry_columns],
+                                       minlength=len(row_names))
+        row_upper = row_upper - shifted_activity
+        row_lower = row_lower - shifted_activity
+
+        # every row becomes up to two restrictions, a*x <= upper and -a*x <= -lower, one after the other
+        has_row_upper = np.isfinite(row_upper)
+        has_row_lower = np.isfinite(row_lower)
+        restrictions_per_row = has_row_upper.astype(np.int64) + has_row_lower
+        first_restriction = np.cumsum(restrictions_per_row) - restrictions_per_row
+        upper_restriction = np.where(has_row_upper, first_restriction, -1)
+        lower_restriction = np.where(has_row_lower, first_restriction + has_row_upper, -1)
+        n_row_restrictions = int(restrictions_per_row.sum())
+
+        # and every variable with both bounds gets x' <= upper - lower
+        bounded = has_lower & has_upper & ~fixed
+        bounded_columns = np.flatnonzero(bounded)
+        n_restrictions = n_row_restrictions + bounded_columns.shape[0]
+
+        if n_restrictions == 0:
+            raise InputFormatError("The MPS model has no restrictions")
+
+        ab = np.zeros((n_restrictions, m_variables + 1))
+
+        for restriction, sign in ((upper_restriction, 1.0), (lower_restriction, -1.0)):
+            for variable_column, column_sign in ((positive, 1.0), (negative, -1.0)):
+                used = (restriction[entry_rows] != -1) & (variable_column[entry_columns] != -1)
+                np.add.at(ab, (restriction[entry_rows[used]], variable_column[entry_columns[used]]),
+                          sign * column_sign * entry_values[used])
+
+        ab[upper_restriction[has_row_upper], -1] = row_upper[has_row_upper]
+        ab[lower_restriction[has_row_lower], -1] = -row_lower[has_row_lower]
+
+        bound_restrictions = np.arange(n_row_restrictions, n_restrictions)
+        ab[bound_restrictions, positive[bounded_columns]] = 1
+        ab[bound_restrictions, -1] = upper[bounded_columns] - lower[bounded_columns]
+
+        # the simplex maximizes, so a minimization objective is negated
+        c = np.zeros(m_variables)
+        c[positive[uses_positive]] = -objective_sense * c_file[uses_positive]
+        c[negative[uses_negative]] = objective_sense * c_file[uses_negative]
+
+        objective_offset = objective_constant + c_file @ shift
+
+        logging.debug(f"MPS model {name}: {len(row_names)} rows and {n_columns} columns read, "
+                      f"{n_restrictions} restrictions and {m_variables} variables after conversion")
+
+        return MpsModel(name, c, ab, row_names, column_names, objective_sense, objective_offset,
+                        shift, positive, negative)
@@ -0,0 +1,120 @@
+import io
+import os
+import sys
+import numpy as np
+
+from solve_result import SolveResult, OPTIMAL, UNBOUNDED
+
+"""
+Formatacao do SolveResult no texto que main.py imprime:
+
+    otima                       ilimitada                   inviavel
+    valor objetivo              x                           certificado
+    x                           certificado
+    certificado
+
+com 7 casas decimais, separado do simplex, que so devolve o resultado.
+
+ResultWriter junta as saidas de varios problemas num buffer e escreve no arquivo em blocos grandes, e
+save_result_arrays grava cada campo num .npy, para quem vai ler o resultado com o numpy em vez de texto
+"""
+
+# the fields save_result_arrays writes, each one as <field>.npy
+ARRAY_FIELDS = ("status", "objective", "x", "certificate")
+
+
+def format_array(array):
+    # the same text LinearAlgebra.arrayPrint prints, tolist converts the whole array at once, str of a python float
+    # is the same shortest repr numpy prints, without creating a numpy scalar per value
+    return " ".join(map(str, np.asarray(array).round(7).tolist()))
+
+
+def format_result(result):
+    """
+    :return: as linhas do resultado, cada uma terminando em \\n
+    """
+    lines = [result.status]
+
+    if result.status == OPTIMAL:
+        lines.append(str(round(result.objective, 7)))
+    if result.status in (OPTIMAL, UNBOUNDED):
+        lines.append(format_array(result.x))
+    lines.append(format_array(result.certificate))
+
+    return "".join(f"{line}\n" for line in lines)
+
+
+def print_result(result, file=None):
+    if file is None:
+        file = sys.stdout
+    file.write(format_result(result))
+
+
+class ResultWriter:
+    """
+    Writes the text of many results to a file in large blocks instead of one write per line.
+    The text is kept in a buffer that is reused after each flush, and flushed when it reaches buffer_size characters
+    or when the writer is closed
+    """
+
+    def __init__(self, file=None, buffer_size=1 << 20):
+        """
+        :param file: text stream the blocks are written to, stdout by default
+        :param buffer_size: characters kept before a flush
+        """
+        self.file = sys.stdout if file is None else file
+        self.buffer_size = buffer_size
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        if self.buffer.tell() >= self.buffer_size:
+            self.flush()
+
+    def write_result(self, result):
+        self.write(format_result(result))
+
+    def flush(self):
+        if self.buffer.tell() == 0:
+            return
+
+        self.file.write(self.buffer.getvalue())
+        self.file.flush()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def save_result_arrays(result, directory):
+    """
+    Grava o resultado em directory, um .npy por campo (status.npy, objective.npy, x.npy e certificate.npy), que
+    podem ser lidos com np.load sem pickle. Os campos que sao None nao sao gravados
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    for field in ARRAY_FIELDS:
+        value = getattr(result, field)
+        if value is not None:
+            np.save(os.path.join(directory, f"{field}.npy"), np.asarray(value))
+
+
+def load_result_arrays(directory):
+    """
+    :return: SolveResult com os campos gravados por save_result_arrays, sem pivos e tempos
+    """
+    fields = {}
+    for field in ARRAY_FIELDS:
+        path = os.path.join(directory, f"{field}.npy")
+        fields[field] = np.load(path, allow_pickle=False) if os.path.exists(path) else None
+
+    objective = fields["objective"]
+    return SolveResult(str(fields["status"]), None if objective is None else float(objective), fields["x"],
+                       fields["certificate"])
@@ -0,0 +1,184 @@
+import logging
+import numpy as np
+
+from Utils.linear_algebra import LinearAlgebra
+
+
+class Presolve:
+    """
+    Shrinks max c*x, Ax <= b, x >= 0 before the tableau is built, and maps the results of the reduced problem back
+    to the original rows and columns.
+
+    Reductions, repeated until none applies:
+        * redundant rows, every coefficient <= 0 and b >= 0 (empty rows included), are satisfied by any x >= 0
+        * forcing rows, every coefficient >= 0 and b = 0 (singleton rows included), force every variable with a
+        positive coefficient to 0, so the row and those columns are removed
+        * dominated columns, c <= 0 and every coefficient >= 0 (empty columns included), never improve the
+        objective and only tighten the restrictions, so the variable is 0 at an optimum
+        * rows with every coefficient >= 0 and b < 0 cannot be satisfied, the problem is unfeasible
+
+    Singleton rows and fixed variables, as a general presolve finds them, only exist here in this form: with
+    Ax <= b and x >= 0 there are no variable bounds and no equality rows, so a singleton row a*x_j <= b is a
+    bound that stays a restriction, and a variable is only fixed when a forcing row (b = 0) bounds it at 0.
+    Those forcing rows are the singleton row and fixed variable reductions of this form.
+
+    Every removed variable is 0, so the objective value does not change and is used as it is. The removed rows are
+    kept in the postsolve stack, which is undone in reverse order to rebuild their certificate entries. An
+    unfeasible row is reported in unfeasible_certificate, which the runner prints without building the tableau.
+    """
+
+    REDUNDANT_ROW = "redundant_row"
+    FORCING_ROW = "forcing_row"
+    DOMINATED_COLUMN = "dominated_column"
+
+    def __init__(self, c: np.ndarray, ab: np.ndarray):
+        """
+        :param c: objective function, 1d or as a 1 x m matrix
+        :param ab: restrictions, n x (m + 1)
+        """
+        self.original_c = np.asarray(c, dtype=float).reshape(-1)
+        self.original_ab = np.asarray(ab, dtype=float)
+        self.original_n = self.original_ab.shape[0]
+        self.original_m = self.original_c.shape[0]
+
+        self.a = self.original_ab[:, :-1]
+        self.b = self.original_ab[:, -1]
+
+        self.active_rows = np.ones(self.original_n, dtype=bool)
+        self.active_columns = np.ones(self.original_m, dtype=bool)
+
+        # operations in the order they were done, see postsolve_certificate
+        self.postsolve_stack = []
+
+        # set when a row is found to be unfeasible, the Farkas certificate over the original rows
+        self.unfeasible_certificate = None
+
+        self.__reduce()
+
+        self.kept_rows = np.flatnonzero(self.active_rows)
+        self.kept_columns = np.flatnonzero(self.active_columns)
+
+        # reduced problem
+        self.c = self.original_c[self.kept_columns]
+        self.ab = np.hstack((self.original_ab[np.ix_(self.kept_rows, self.kept_columns)],
+                             self.b[self.kept_rows].reshape(-1, 1)))
+        self.n_restrictions = self.kept_rows.shape[0]
+        self.m_variables = self.kept_columns.shape[0]
+
+        logging.info(self.report())
+
+    def __reduce(self):
+        changed = True
+
+        while changed and self.unfeasible_certificate is None:
+            changed = self.__reduce_rows() | self.__reduce_columns()
+
+    def __reduce_rows(self):
+        changed = False
+
+        for row in np.flatnonzero(self.active_rows):
+            columns = np.flatnonzero(self.active_columns)
+            coefficients = self.a[row, columns]
+            b_i = self.b[row]
+
+            has_positive = np.any(coefficients > LinearAlgebra.TOLERANCE)
+            has_negative = np.any(coefficients < -LinearAlgebra.TOLERANCE)
+
+            if not has_negative and LinearAlgebra.smaller_than_zero(b_i):
+                # a*x >= 0 > b for every x >= 0, y = e_row is a certificate
+                certificate = np.zeros(self.original_n)
+                certificate[row] = 1
+                self.unfeasible_certificate = self.postsolve_certificate(certificate, dual_feasible=False,
+                                                                         reduced=False)
+                logging.info(f"presolve: restriction {row} is unfeasible")
+                return changed
+
+            # the problem keeps at least one restriction
+            if np.count_nonzero(self.active_rows) == 1:
+                continue
+
+            if not has_positive and not LinearAlgebra.smaller_than_zero(b_i):
+                self.active_rows[row] = False
+                self.postsolve_stack.append((self.REDUNDANT_ROW, row))
+                changed = True
+
+            elif not has_negative and LinearAlgebra.equal_to_zero(b_i):
+                forced_columns = columns[coefficients > LinearAlgebra.TOLERANCE]
+
+                # and at least one variable
+                if forced_columns.shape[0] == columns.shape[0]:
+                    continue
+
+                self.active_rows[row] = False
+                self.active_columns[forced_columns] = False
+                self.postsolve_stack.append((self.FORCING_ROW, row, forced_columns))
+                changed = True
+
+        return changed
+
+    def __reduce_columns(self):
+        changed = False
+        rows = np.flatnonzero(self.active_rows)
+
+        for column in np.flatnonzero(self.active_columns):
+            if np.count_nonzero(self.active_columns) == 1:
+                break
+
+            if self.original_c[column] > LinearAlgebra.TOLERANCE:
+                continue
+
+            if np.all(self.a[rows, column] >= -LinearAlgebra.TOLERANCE):
+                self.active_columns[column] = False
+                self.postsolve_stack.append((self.DOMINATED_COLUMN, column))
+                changed = True
+
+        return changed
+
+    def original_x(self, x_solution: np.ndarray):
+        """
+        :param x_solution: values of the reduced problem variables
+        :return: values of the original variables, the removed ones are 0
+        """
+        x_original = np.zeros(self.original_m)
+        x_original[self.kept_columns] = x_solution
+        return x_original
+
+    def postsolve_certificate(self, certificate: np.ndarray, dual_feasible=True, reduced=True):
+        """
+        Maps a certificate of the reduced problem to the original rows.
+        Redundant rows get 0. A forcing row gets the smallest y_i >= 0 that keeps y^T A_j >= c_j (optimal
+        certificate) or y^T A_j >= 0 (unfeasible and unbounded certificates) for every column it removed, which
+        costs nothing, as its b is 0. The stack is undone in reverse, so every row the column still had when it
+        was removed already has its final value.
+        :param certificate: one value per reduced restriction
+        :param dual_feasible: True for the optimal certificate
+        :param reduced: False when the certificate is already over the original rows
+        :return: certificate over the original rows
+        """
+        if reduced:
+            y = np.zeros(self.original_n)
+            y[self.kept_rows] = certificate
+        else:
+            y = np.array(certificate, dtype=float)
+
+        for operation in reversed(self.postsolve_stack):
+            if operation[0] != self.FORCING_ROW:
+                continue
+
+            _, row, columns = operation
+            targets = self.original_c[columns] if dual_feasible else np.zeros(columns.shape[0])
+
+            deficit = targets - y @ self.a[:, columns]
+            y[row] = max(0.0, np.max(deficit / self.a[row, columns]))
+
+        return y
+
+    def report(self):
+        removed_rows = self.original_n - np.count_nonzero(self.active_rows)
+        removed_columns = self.original_m - np.count_nonzero(self.active_columns)
+        counts = {}
+        for operation in self.postsolve_stack:
+            counts[operation[0]] = counts.get(operation[0], 0) + 1
+
+        details = ", ".join(f"{name}: {count}" for name, count in counts.items())
+        return f"presolve removed {removed_rows} restrictions and {removed_columns} variables ({details})"
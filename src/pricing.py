@@ -0,0 +1,250 @@
+import logging
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class PricingRule(ABC):
+    """
+    Chooses the entering column among the negative reduced costs.
+    The reduced costs are the first tableau row without the vero and b columns, so every index here is relative
+    to the first A column.
+    """
+
+    name = "abstract"
+
+    # rules that read the tableau columns, they only work with the tableau engine
+    needs_tableau = False
+
+    def reset(self, tableau: np.ndarray, n_restrictions: int):
+        """
+        Called once before the first pivot of a solve
+        """
+        pass
+
+    @abstractmethod
+    def choose_column(self, reduced_costs: np.ndarray, tableau: np.ndarray = None, n_restrictions: int = 0):
+        """
+        :return: index of the entering column in reduced_costs or -1 if there is no negative reduced cost
+        """
+
+    def update(self, tableau: np.ndarray, row: int, column: int, n_restrictions: int):
+        """
+        Called after every pivot, with the already pivoted tableau
+        :param column: index of the column that entered the basis, relative to reduced_costs
+        """
+        pass
+
+
+class BlandPricing(PricingRule):
+    """
+    Leftmost negative reduced cost, guarantees termination
+    """
+
+    name = "bland"
+
+    def choose_column(self, reduced_costs, tableau=None, n_restrictions=0):
+        negative = np.flatnonzero(reduced_costs < 0)
+
+        if negative.size == 0:
+            return -1
+
+        return int(negative[0])
+
+
+class DantzigPricing(PricingRule):
+    """
+    Most negative reduced cost
+    """
+
+    name = "dantzig"
+
+    def choose_column(self, reduced_costs, tableau=None, n_restrictions=0):
+        column = int(np.argmin(reduced_costs))
+
+        if reduced_costs[column] >= 0:
+            return -1
+
+        return column
+
+
+class SteepestEdgePricing(PricingRule):
+    """
+    Exact steepest edge, the most negative reduced cost scaled by the norm of its tableau column,
+    ie, the edge with the biggest objective improvement per unit of movement
+    """
+
+    name = "steepest_edge"
+    needs_tableau = True
+
+    def choose_column(self, reduced_costs, tableau=None, n_restrictions=0):
+        candidates = np.flatnonzero(reduced_costs < 0)
+
+        if candidates.size == 0:
+            return -1
+
+        columns = tableau[1:, candidates + n_restrictions]
+        squared_norms = 1 + np.einsum('ij,ij->j', columns, columns)
+
+        scores = reduced_costs[candidates] ** 2 / squared_norms
+
+        return int(candidates[np.argmax(scores)])
+
+
+class DevexPricing(PricingRule):
+    """
+    Devex approximation of steepest edge, keeps reference weights updated from the pivot row
+    instead of computing every column norm
+    """
+
+    name = "devex"
+    needs_tableau = True
+
+    # weights bigger than this mean the reference framework is stale, so it is reset
+    RESET_THRESHOLD = 1e6
+
+    def __init__(self):
+        self.weights = None
+
+    def reset(self, tableau, n_restrictions):
+        width = tableau.shape[1] - n_restrictions - 1
+        self.weights = np.ones(width)
+
+    def choose_column(self, reduced_costs, tableau=None, n_restrictions=0):
+        if self.weights is None or self.weights.shape != reduced_costs.shape:
+            self.weights = np.ones(reduced_costs.shape)
+
+        candidates = np.flatnonzero(reduced_costs < 0)
+
+        if candidates.size == 0:
+            return -1
+
+        scores = reduced_costs[candidates] ** 2 / self.weights[candidates]
+
+        return int(candidates[np.argmax(scores)])
+
+    def update(self, tableau, row, column, n_restrictions):
+        # after the pivot, the pivot row is alpha_r / alpha_rq
+        pivot_row = tableau[row, n_restrictions:-1]
+        entering_weight = self.weights[column]
+
+        np.maximum(self.weights, pivot_row ** 2 * entering_weight, out=self.weights)
+        self.weights[column] = 1
+
+        if self.weights.max() > self.RESET_THRESHOLD:
+            self.weights.fill(1)
+
+
+class PartialPricing(PricingRule):
+    """
+    Prices one segment of the columns at a time, in round robin, and takes the most negative reduced cost of
+    the first segment that has one. The next iteration starts where the last one stopped.
+    """
+
+    name = "partial"
+
+    def __init__(self, segment_size: int = 0):
+        # 0 means sqrt of the number of columns
+        self.segment_size = segment_size
+        self.start = 0
+
+    def reset(self, tableau, n_restrictions):
+        self.start = 0
+
+    def choose_column(self, reduced_costs, tableau=None, n_restrictions=0):
+        width = reduced_costs.shape[0]
+
+        if width == 0:
+            return -1
+
+        segment_size = self.segment_size or max(1, int(np.sqrt(width)))
+        start = self.start % width
+
+        for segment_start in range(start, start + width, segment_size):
+            segment = np.arange(segment_start, min(segment_start + segment_size, start + width)) % width
+            segment_costs = reduced_costs[segment]
+            best = int(np.argmin(segment_costs))
+
+            if segment_costs[best] < 0:
+                self.start = segment[best] + 1
+                return int(segment[best])
+
+        return -1
+
+
+PRICING_RULES = {
+    BlandPricing.name: BlandPricing,
+    DantzigPricing.name: DantzigPricing,
+    SteepestEdgePricing.name: SteepestEdgePricing,
+    DevexPricing.name: DevexPricing,
+    PartialPricing.name: PartialPricing,
+}
+
+
+class PricingStrategy:
+    """
+    Active pricing rule of a solve. Counts the pivots done by each rule and falls back to Bland after a run of
+    degenerate pivots, as Bland is the only one that cannot cycle.
+    """
+
+    # consecutive degenerate pivots before switching to Bland
+    DEGENERATE_PIVOTS_LIMIT = 20
+
+    def __init__(self, rule="bland", degenerate_pivots_limit=None):
+
+        if isinstance(rule, str):
+            if rule not in PRICING_RULES:
+                raise ValueError(f"Unknown pricing rule {rule}, choose one of {list(PRICING_RULES)}")
+            rule = PRICING_RULES[rule]()
+
+        self.rule = rule
+        self.chosen_rule = rule.name
+
+        self.degenerate_pivots_limit = self.DEGENERATE_PIVOTS_LIMIT
+        if degenerate_pivots_limit is not None:
+            self.degenerate_pivots_limit = degenerate_pivots_limit
+
+        self.degenerate_streak = 0
+        self.fell_back_to_bland = False
+        self.pivot_counts = {}
+
+    @property
+    def needs_tableau(self):
+        return self.rule.needs_tableau
+
+    def reset(self, tableau, n_restrictions):
+        self.rule.reset(tableau, n_restrictions)
+
+    def choose_column(self, reduced_costs, tableau=None, n_restrictions=0):
+        return self.rule.choose_column(reduced_costs, tableau, n_restrictions)
+
+    def register_pivot(self, tableau, row, column, n_restrictions, degenerate: bool):
+        """
+        :param column: index of the column that entered the basis, relative to the reduced costs
+        :param degenerate: whether the pivot kept the objective value, ie, b at the pivot row was zero
+        """
+        self.record_pivot(self.rule.name)
+        self.rule.update(tableau, row, column, n_restrictions)
+
+        self.degenerate_streak = self.degenerate_streak + 1 if degenerate else 0
+
+        if self.degenerate_streak >= self.degenerate_pivots_limit and not isinstance(self.rule, BlandPricing):
+            logging.info(f"{self.degenerate_streak} degenerate pivots with {self.rule.name}, falling back to bland")
+            self.rule = BlandPricing()
+            self.fell_back_to_bland = True
+
+    def record_pivot(self, name):
+        """
+        Counts a pivot under name, the rule name or the one of a method with its own choice, like the dual simplex
+        """
+        self.pivot_counts[name] = self.pivot_counts.get(name, 0) + 1
+
+    @property
+    def total_pivots(self):
+        return sum(self.pivot_counts.values())
+
+    def report(self):
+        counts = ", ".join(f"{name}: {count} pivots" for name, count in self.pivot_counts.items())
+        if not counts:
+            counts = "0 pivots"
+        return f"pricing {self.chosen_rule} ({counts})"
@@ -0,0 +1,60 @@
+import socket
+import struct
+
+"""
+Protocolo do servidor (server.py) e do cliente (client.py): cada mensagem e um tamanho de 4 bytes, big endian, seguido
+de tantos bytes de texto utf-8. O cliente manda o problema, no formato da entrada padrao ou em JSON, e recebe as
+linhas que main.py imprimiria.
+
+Nao importa o numpy, para o cliente continuar leve.
+"""
+
+HEADER = struct.Struct(">I")
+
+
+def parse_address(socket_path=None, host="127.0.0.1", port=None):
+    """
+    :return: familia e endereco do socket, unix se o caminho for dado, tcp no host e porta caso contrario
+    """
+    if socket_path is not None:
+        return socket.AF_UNIX, socket_path
+    if port is None:
+        raise ValueError("Informe o caminho do socket unix ou a porta tcp")
+    return socket.AF_INET, (host, port)
+
+
+def send_message(connection: socket.socket, text: str):
+    payload = text.encode("utf-8")
+    connection.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def receive_message(connection: socket.socket):
+    """
+    :return: texto da mensagem ou None se a conexao foi fechada antes de uma nova mensagem
+    """
+    header = _receive_exactly(connection, HEADER.size)
+    if header is None:
+        return None
+
+    size, = HEADER.unpack(header)
+    payload = _receive_exactly(connection, size)
+    if payload is None:
+        raise ConnectionError(f"Conexao fechada no meio de uma mensagem de {size} bytes")
+
+    return payload.decode("utf-8")
+
+
+def _receive_exactly(connection, size):
+    chunks = []
+    missing = size
+
+    while missing > 0:
+        chunk = connection.recv(min(missing, 1 << 16))
+        if not chunk:
+            if missing == size:
+                return None
+            raise ConnectionError(f"Conexao fechada com {missing} de {size} bytes faltando")
+        chunks.append(chunk)
+        missing -= len(chunk)
+
+    return b"".join(chunks)
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from solve_result import SolveResult
+from main import solve as solve_problem
+from Utils.linear_algebra import LinearAlgebra
+
+
+class ResultCache:
+    """
+    Results of already solved problems, keyed by a hash of the problem as the runner sees it (c and [A | b] as
+    floats, after LinearAlgebra.remove_equal_rows) and of the runner options, so byte different inputs with the
+    same numbers, or with the same rows scaled, share an entry.
+
+    The memory tier is an LRU with at most max_entries results. With a directory, every result is also written
+    there as <key>.npz and read back when it is not in memory, so the cache survives restarts and is shared by
+    processes using the same directory.
+
+    The cached arrays are read only copies, the same result object is given to every caller. A lock guards the
+    entries and counters, so one cache can be shared by threads.
+    """
+
+    def __init__(self, max_entries=1024, directory=None):
+        """
+        :param max_entries: results kept in memory, the least recently used ones are dropped first
+        :param directory: optional directory of the disk tier, created if needed
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def problem_key(c, ab, options=None):
+        """
+        Problems with the same c, the same rows left by remove_equal_rows and the same removed rows have the same
+        result, the runner only solves what is left and puts zeros in the certificate for the removed rows
+        :param c: objective function, 1d or as a 1 x m matrix
+        :param ab: restrictions, n x (m + 1)
+        :param options: runner options that change the result, like engine and pricing
+        :return: hex sha256 of the problem and options
+        """
+        c = np.ascontiguousarray(c, dtype=np.float64).reshape(-1)
+        ab = np.ascontiguousarray(ab, dtype=np.float64)
+        reduced, removed_rows = LinearAlgebra.remove_equal_rows(ab)
+
+        digest = hashlib.sha256()
+        digest.update(np.array(ab.shape, dtype=np.int64).tobytes())
+        digest.update(np.array(removed_rows, dtype=np.int64).tobytes())
+        # + 0.0 turns -0.0 into 0.0, both are the same coefficient
+        digest.update((c + 0.0).tobytes())
+        digest.update((np.ascontiguousarray(reduced) + 0.0).tobytes())
+        digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode())
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        :return: the cached SolveResult or None
+        """
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+            result = self.__read(key)
+            if result is not None:
+                self.__remember(key, result)
+                self.hits += 1
+                self.disk_hits += 1
+                return result
+
+            self.misses += 1
+            return None
+
+    def put(self, key, result: SolveResult):
+        """
+        Caches a copy of the result, the arrays of the given one are left as they are
+        :return: the cached result, with read only x and certificate
+        """
+        x, certificate = (self.__read_only_copy(array) for array in (result.x, result.certificate))
+        result = SolveResult(result.status, result.objective, x, certificate, result.iterations, result.timings)
+
+        with self.lock:
+            self.__remember(key, result)
+        self.__write(key, result)
+        return result
+
+    def solve(self, c, ab, **options):
+        """
+        main.solve with the cache in front of it
+        """
+        key = self.problem_key(c, ab, options)
+        result = self.get(key)
+
+        if result is None:
+            result = self.put(key, solve_problem(c, ab, **options))
+
+        return result
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "entries": len(self.entries)}
+
+    @staticmethod
+    def __read_only_copy(array):
+        if array is None:
+            return None
+
+        array = np.array(array, dtype=float)
+        array.flags.writeable = False
+        return array
+
+    def __remember(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            evicted, _ = self.entries.popitem(last=False)
+            logging.debug(f"result cache evicted {evicted}")
+
+    def __path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def __write(self, key, result):
+        if self.directory is None:
+            return
+
+        # the fields that are None are left out of the file
+        fields = {"status": np.array(result.status)}
+        if result.objective is not None:
+            fields["objective"] = np.array(result.objective, dtype=float)
+        for field in ("x", "certificate"):
+            if getattr(result, field) is not None:
+                fields[field] = np.asarray(getattr(result, field), dtype=float)
+        for field in ("iterations", "timings"):
+            if getattr(result, field) is not None:
+                fields[field] = np.array(json.dumps(getattr(result, field)))
+
+        # written to a temporary file and renamed, readers never see half a file
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".npz")
+        with os.fdopen(descriptor, "wb") as stream:
+            np.savez(stream, **fields)
+        os.replace(temporary, self.__path(key))
+
+    def __read(self, key):
+        if self.directory is None or not os.path.exists(self.__path(key)):
+            return None
+
+        with np.load(self.__path(key), allow_pickle=False) as data:
+            def field(name, convert):
+                return convert(data[name]) if name in data.files else None
+
+            result = SolveResult(str(data["status"]), field("objective", float), field("x", np.array),
+                                 field("certificate", np.array), field("iterations", lambda v: json.loads(str(v))),
+                                 field("timings", lambda v: json.loads(str(v))))
+
+        for array in (result.x, result.certificate):
+            if array is not None:
+                array.flags.writeable = False
+
+        return result
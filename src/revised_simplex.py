@@ -0,0 +1,208 @@
+import logging
+import numpy as np
+from Utils.linear_algebra import LinearAlgebra
+from exceptions import UnboundedError
+from pricing import PricingStrategy
+from simplex import Simplex
+
+
+class RevisedSimplex:
+    """
+    Revised simplex engine, interchangeable with Simplex.
+
+    Instead of rewriting the whole [VERO | A | I | b] tableau on every pivot, only the basis header and the
+    basis inverse are kept. Every iteration computes, on demand:
+        * the reduced costs d = r0 - (r0_B * B^-1) * A
+        * the entering column B^-1 * a_q
+        * the ratio test against the current basic values B^-1 * b
+
+    Every pivot is a row operation over the starting tableau, so the final tableau is
+    | 1  -r0_B * B^-1 | * starting tableau
+    | 0        B^-1   |
+    which is only materialized once, at the end, so the rest of the program (certificate, x solution and
+    optimal value retrieval) works the same way for both engines.
+    """
+
+    # after this many eta (rank-1) updates the basis inverse is rebuilt from B, bounding the accumulated error
+    REFACTORIZATION_INTERVAL = 50
+
+    def __init__(self, m, n, tableau, pricing="bland", ratio_test="textbook", basis=None,
+                 unbounded_check="entering", cancel_event=None, vero=True) -> None:
+
+        self.m_variables = m
+        self.n_restrictions = n
+
+        # False for a [A | I | b] tableau, see Simplex
+        self.vero = vero
+        self.vero_columns = n if vero else 0
+        # if tableau is a list, convert to np.ndarray
+        if isinstance(tableau, list):
+            self.tableau = np.array(tableau, dtype=float)
+        else:
+            # only read, see starting_tableau
+            self.tableau = np.asarray(tableau, dtype=float)
+
+        # starting tableau split in its blocks, they are never modified
+        # row 0 is [v0 | r0 | z0] and the restrictions are [V0 | A0 | b0]
+        self.starting_tableau = self.tableau
+        self.r0 = self.starting_tableau[0, self.vero_columns:-1]
+        self.A0 = self.starting_tableau[1:, self.vero_columns:-1]
+        self.b0 = self.starting_tableau[1:, -1]
+
+        if not isinstance(pricing, PricingStrategy):
+            pricing = PricingStrategy(pricing)
+        if pricing.needs_tableau:
+            raise ValueError(f"Pricing rule {pricing.rule.name} reads tableau columns, use the tableau engine")
+        self.pricing = pricing
+
+        if ratio_test not in Simplex.RATIO_TESTS:
+            raise ValueError(f"Unknown ratio test {ratio_test}, choose one of {Simplex.RATIO_TESTS}")
+        self.ratio_test = ratio_test
+
+        # unboundedness is always found by the ratio test of the entering column
+        if unbounded_check != "entering":
+            raise ValueError(f"Unbounded check {unbounded_check} needs every tableau column, use the tableau engine")
+
+        # basis header, each restriction has the index (in A0 coordinates) of its basic column
+        if basis is None:
+            self.header = self.__find_initial_basis()
+        else:
+            self.header = np.array(basis) - self.vero_columns
+
+        # checked before every pivot, see Simplex.raiseIfCancelled
+        self.cancel_event = cancel_event
+
+        self.basis_inverse = None
+        self.basic_values = None
+        self.updates_since_refactorization = 0
+        self.__refactorize()
+
+    def __find_initial_basis(self):
+        basic_columns = LinearAlgebra.findBasicColumns(self.tableau, drop_vero=self.vero)
+
+        if np.any(basic_columns == -1):
+            raise Exception(f"Revised simplex needs a tableau with a basis in canonical form, found {basic_columns}")
+
+        # findBasicColumns counts the vero columns, the engine works over A0 only
+        return basic_columns - self.vero_columns
+
+    @property
+    def basis(self):
+        """
+        Basis header in tableau coordinates (counting the vero), the same as Simplex.basis
+        """
+        return self.header + self.vero_columns
+
+    def __refactorize(self):
+        """
+        Recomputes B^-1 and B^-1 * b from the current basis header
+        """
+        basis_matrix = self.A0[:, self.header]
+        self.basis_inverse = np.linalg.inv(basis_matrix)
+        self.basic_values = LinearAlgebra.replace_values_smaller_then_tol(self.basis_inverse @ self.b0)
+        self.updates_since_refactorization = 0
+
+    def __simplex_multipliers(self):
+        """
+        Row vector r0_B * B^-1, every pivot subtracts this combination of restrictions from the first row
+        """
+        return self.r0[self.header] @ self.basis_inverse
+
+    def reduced_costs(self):
+        multipliers = self.__simplex_multipliers()
+        reduced = self.r0 - multipliers @ self.A0
+
+        # basic columns are zero by construction, remove rounding noise from them
+        reduced[self.header] = 0
+        return LinearAlgebra.replace_values_smaller_then_tol(reduced)
+
+    def entering_column(self, column: int):
+        alpha = self.basis_inverse @ self.A0[:, column]
+        return LinearAlgebra.replace_values_smaller_then_tol(alpha)
+
+    def solve(self):
+
+        # sanity check, there should be no negative b values(last column)
+        if LinearAlgebra.any_below_zero(self.basic_values):
+            raise Exception(f"Negative b value inputed at b column {self.basic_values}")
+
+        # the same single full scan the tableau engine does before its first pivot, the starting tableau is
+        # already materialized
+        if Simplex.isUnbounded(self.starting_tableau):
+            self.raise_unbounded()
+
+        self.pricing.reset(self.tableau, self.vero_columns)
+
+        while True:
+            Simplex.raiseIfCancelled(self.cancel_event)
+
+            reduced_costs = self.reduced_costs()
+            column = self.pricing.choose_column(reduced_costs)
+
+            if column == -1:
+                break
+
+            alpha = self.entering_column(column)
+            row = Simplex.ratioTest(alpha, self.basic_values, harris=self.ratio_test == "harris")
+
+            if row == -1:
+                self.raise_unbounded()
+
+            degenerate = LinearAlgebra.equal_to_zero(self.basic_values[row])
+            self.pivot(row, column, alpha)
+            self.pricing.register_pivot(None, row, column, self.vero_columns, degenerate=degenerate)
+
+        logging.info(self.pricing.report())
+
+        self.tableau = self.materialize_tableau()
+        return self.tableau
+
+    def raise_unbounded(self):
+        self.tableau = self.materialize_tableau()
+        certificate = LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions, self.m_variables, self.vero)
+        x_solution = LinearAlgebra.get_x_solution(self.tableau, self.basis, has_vero=self.vero)
+        raise UnboundedError(certificate, x_solution)
+
+    def pivot(self, row: int, column: int, alpha: np.ndarray):
+        """
+        Eta update of B^-1 and B^-1 * b, column enters the basis at the given restriction
+        """
+        self.header[row] = column
+
+        if self.updates_since_refactorization >= self.REFACTORIZATION_INTERVAL:
+            self.__refactorize()
+            return
+
+        pivot_value = alpha[row]
+        multipliers = alpha.copy()
+        multipliers[row] = 0
+
+        self.basis_inverse[row] /= pivot_value
+        self.basis_inverse -= np.outer(multipliers, self.basis_inverse[row])
+
+        self.basic_values[row] /= pivot_value
+        self.basic_values -= multipliers * self.basic_values[row]
+        self.basic_values = LinearAlgebra.replace_values_smaller_then_tol(self.basic_values)
+
+        self.updates_since_refactorization += 1
+
+    def materialize_tableau(self):
+        """
+        Builds the tableau the tableau engine would have after the same pivots
+        """
+        restrictions = self.starting_tableau[1:]
+        first_row = self.starting_tableau[0]
+
+        pivoted_restrictions = self.basis_inverse @ restrictions
+        pivoted_first_row = first_row - self.__simplex_multipliers() @ restrictions
+
+        materialized = np.vstack((pivoted_first_row, pivoted_restrictions))
+        materialized = LinearAlgebra.replace_values_smaller_then_tol(materialized)
+
+        # basic columns must be exact identity columns, otherwise findBasicColumns will not recognize them
+        basic_columns = self.basis
+        materialized[:, basic_columns] = 0
+        materialized[np.arange(1, len(basic_columns) + 1), basic_columns] = 1
+        materialized[1:, -1] = self.basic_values
+
+        return materialized
@@ -0,0 +1,207 @@
+import argparse
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from main import add_runner_arguments, runner_options, solve
+from tableau import TableauParsing
+from exceptions import InputFormatError
+from output import format_result
+from result_cache import ResultCache
+from protocol import parse_address, send_message, receive_message
+
+"""
+Servidor local que mantem o interpretador, o numpy e um pool de processos vivos entre os problemas, para problemas
+pequenos em que iniciar o python custa mais que o simplex.
+
+    python src/server.py --socket /tmp/simplex.sock --workers 4
+    python src/client.py --socket /tmp/simplex.sock < tests/cases/Testes/01
+"""
+
+
+def problem_text(request: str):
+    """
+    :param request: o problema no formato da entrada padrao ou um objeto JSON, com "input" nesse formato ou com
+        "C" e "AB", como em tests/cases/input.json
+    :return: o problema no formato da entrada padrao
+    """
+    if not request.lstrip().startswith("{"):
+        return request
+
+    problem = json.loads(request)
+    if "input" in problem:
+        return problem["input"]
+
+    c, ab = problem["C"], problem["AB"]
+    lines = [f"{len(ab)} {len(c)}", " ".join(map(str, c))]
+    lines += [" ".join(map(str, row)) for row in ab]
+    return "\n".join(lines)
+
+
+def read_request(request: str):
+    """
+    :return: c e [A | b] do problema, como TableauParsing le
+    """
+    try:
+        text = problem_text(request)
+    except (KeyError, TypeError) as error:
+        raise InputFormatError(f"JSON sem o problema ({error})")
+    except ValueError as error:
+        raise InputFormatError(f"JSON invalido ({error})")
+
+    _, _, c, ab = TableauParsing.read_problem(io.StringIO(text))
+    return c, ab
+
+
+class SolverRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Uma thread por conexao, que pode mandar varios problemas, um depois do outro. O problema e lido e procurado no
+    cache nessa thread, o simplex roda no pool do servidor, que limita quantos problemas sao resolvidos ao mesmo tempo
+    """
+
+    def handle(self):
+        while True:
+            request = receive_message(self.request)
+            if request is None:
+                return
+
+            send_message(self.request, self.server.answer(request))
+
+
+class SolverServerMixin:
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def start_pool(self, workers=None, cache=None, **options):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.cache = cache
+        self.runner_options = options
+
+    def answer(self, request: str):
+        """
+        :return: as linhas que main.py imprimiria para o problema
+        """
+        try:
+            c, ab = read_request(request)
+        except InputFormatError as error:
+            return f"Entrada invalida: {error}\n"
+
+        key = None
+        if self.cache is not None:
+            key = ResultCache.problem_key(c, ab, self.runner_options)
+            result = self.cache.get(key)
+            if result is not None:
+                return format_result(result)
+
+        try:
+            result = self.executor.submit(solve, c, ab, **self.runner_options).result()
+        except Exception as error:
+            # the connection stays open and the client gets an answer, whatever went wrong in the pool
+            logging.exception("falha ao resolver o problema")
+            return f"Erro ao resolver: {error}\n"
+
+        if self.cache is not None:
+            self.cache.put(key, result)
+
+        return format_result(result)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown()
+
+
+class UnixSolverServer(SolverServerMixin, socketserver.ThreadingUnixStreamServer):
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class TcpSolverServer(SolverServerMixin, socketserver.ThreadingTCPServer):
+    pass
+
+
+def validate_options(options):
+    """
+    Resolve max x, x <= 1 com as opcoes, para que uma combinacao invalida (engine, pricing, ratio test, ...) seja
+    recusada ao criar o servidor, e nao em cada problema
+    :raises ValueError: se o SimplexRunner recusar as opcoes
+    """
+    try:
+        solve([1], [[1, 1]], **options)
+    except TypeError as error:
+        raise ValueError(f"Opcao desconhecida: {error}")
+
+
+def create_server(socket_path=None, host="127.0.0.1", port=None, workers=None, cache=None, **options):
+    """
+    :param socket_path: caminho do socket unix, se nao for dado o servidor escuta em host:port (tcp)
+    :param workers: quantidade de processos do pool, os.cpu_count() se nao for dado
+    :param cache: ResultCache opcional, problemas repetidos sao respondidos sem resolver de novo
+    :param options: argumentos do SimplexRunner, os mesmos para todos os problemas
+    :raises ValueError: se as opcoes forem invalidas, antes de abrir o socket
+    """
+    validate_options(options)
+
+    family, address = parse_address(socket_path, host, port)
+
+    if family == socket.AF_UNIX:
+        server = UnixSolverServer(address, SolverRequestHandler)
+    else:
+        server = TcpSolverServer(address, SolverRequestHandler)
+
+    server.start_pool(workers, cache, **options)
+    return server
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Servidor do simplex, resolve os problemas mandados por client.py")
+    parser.add_argument("--socket", default=None, help="caminho do socket unix")
+    parser.add_argument("--host", default="127.0.0.1", help="endereco tcp, se o socket unix nao for dado")
+    parser.add_argument("--port", type=int, default=None, help="porta tcp, se o socket unix nao for dado")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="problemas resolvidos ao mesmo tempo, a quantidade de cpus se nao for dado")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="quantos resultados ficam em memoria para problemas repetidos, 0 desliga o cache")
+    parser.add_argument("--cache-dir", default=None,
+                        help="diretorio onde os resultados tambem sao guardados (.npz), entre execucoes do servidor")
+    add_runner_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="mostra no stderr o endereco do servidor")
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+
+    if arguments.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+
+    cache = None
+    if arguments.cache_size > 0 or arguments.cache_dir is not None:
+        cache = ResultCache(max_entries=arguments.cache_size, directory=arguments.cache_dir)
+
+    try:
+        server = create_server(arguments.socket, arguments.host, arguments.port, arguments.workers, cache,
+                               **runner_options(arguments))
+    except ValueError as error:
+        sys.exit(f"Opcoes invalidas: {error}")
+
+    # kill fecha o servidor como ctrl+c, apagando o socket unix
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    with server:
+        logging.info(f"escutando em {server.server_address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+from tableau import TableauParsing
+from main import SimplexRunner
+
+
+class SharedTableau:
+    """
+    A float tableau in a multiprocessing.shared_memory block. The process that creates it copies the tableau
+    in once, the others attach to the block by name and read it without copying, every process maps the same
+    pages.
+    """
+
+    def __init__(self, tableau: np.ndarray = None, name: str = None, shape=None):
+        """
+        Creates a block with a copy of the tableau or, with name and shape, attaches to an existing one
+        """
+        if tableau is not None:
+            tableau = np.asarray(tableau, dtype=float)
+            self.shared_memory = shared_memory.SharedMemory(create=True, size=max(tableau.nbytes, 1))
+            self.shape = tableau.shape
+            self.owner = True
+        else:
+            self.shared_memory = shared_memory.SharedMemory(name=name)
+            self.shape = tuple(shape)
+            self.owner = False
+
+        self.array = np.ndarray(self.shape, dtype=float, buffer=self.shared_memory.buf)
+
+        if tableau is not None:
+            self.array[:] = tableau
+        else:
+            # attached blocks are read only, every scenario copies what it changes
+            self.array.flags.writeable = False
+
+    @property
+    def name(self):
+        return self.shared_memory.name
+
+    def close(self):
+        """
+        Releases the mapping of this process, the creator also frees the block
+        """
+        self.array = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# base tableau of each worker process, attached once by _attach_base_tableau
+_worker_state = {}
+
+
+def _attach_base_tableau(name, shape, n_restrictions, m_variables, options):
+    shared = SharedTableau(name=name, shape=shape)
+    # released when the worker process exits, the pool does not run atexit handlers
+    util.Finalize(shared, shared.close, exitpriority=0)
+
+    _worker_state["base"] = shared
+    _worker_state["problem"] = (n_restrictions, m_variables, options)
+
+
+def _solve_scenario(scenario):
+    """
+    Copies the shared base tableau, puts the scenario c and b in it and solves it, in a worker process
+    """
+    c, b = scenario
+    n, m, options = _worker_state["problem"]
+
+    # the only copy of the base tableau a scenario makes, the runner and the engines pivot it in place
+    tableau = np.array(_worker_state["base"].array)
+    if c is not None:
+        c_start = n if options.get("vero", True) else 0
+        tableau[0] = 0
+        tableau[0, c_start:c_start + m] = -np.asarray(c, dtype=float)
+    if b is not None:
+        tableau[1:, -1] = b
+
+    return SimplexRunner(tableau=tableau, **options).solve()
+
+
+def solve_scenarios(c: np.ndarray, ab: np.ndarray, objectives=None, rhs=None, workers=None, chunksize=1,
+                    **options):
+    """
+    Solves scenarios of max c*x, Ax <= b, x >= 0 that share A in a process pool. The base tableau is built once
+    and placed in shared memory, every worker attaches to it when it starts and only copies it for each scenario
+    it solves, so the memory of the workers does not grow with a copy of A each.
+    Proportional rows are not removed, as they may differ in some b.
+    :param c: base objective function
+    :param ab: base restrictions, n x (m + 1)
+    :param objectives: one c per scenario, K x m, None keeps the base one
+    :param rhs: one b per scenario, K x n, None keeps the base one
+    :param workers: processes of the pool, os.cpu_count() if not given
+    :param options: arguments of SimplexRunner over a built tableau (engine, pricing, vero, ...), so no presolve
+    :return: one SolveResult per scenario
+    """
+    ab = np.asarray(ab, dtype=float)
+    n, m = ab.shape[0], ab.shape[1] - 1
+    base = TableauParsing.create_full_tableau(np.asarray(c, dtype=float).reshape(1, -1), ab, n, m,
+                                              remove_equal_rows=False, vero=options.get("vero", True))
+
+    if objectives is None and rhs is None:
+        scenarios = [(None, None)]
+    else:
+        k = len(objectives) if objectives is not None else len(rhs)
+        scenarios = [(objectives[i] if objectives is not None else None, rhs[i] if rhs is not None else None)
+                     for i in range(k)]
+
+    with SharedTableau(base) as shared:
+        initializer_arguments = (shared.name, shared.shape, n, m, options)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_base_tableau,
+                                 initargs=initializer_arguments) as executor:
+            results = list(executor.map(_solve_scenario, scenarios, chunksize=chunksize))
+
+    logging.info(f"{len(results)} scenarios solved over a shared {base.shape} tableau")
+    return results
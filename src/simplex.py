@@ -1,20 +1,66 @@
 import numpy as np
 import logging
 from Utils.linear_algebra import LinearAlgebra
-from exceptions import UnboundedError
+from Utils.workspace import PivotWorkspace
+from exceptions import UnboundedError, SolveCancelledError
+from pricing import PricingStrategy, BlandPricing
 
 
 class Simplex:
 
-    def __init__(self, m, n, tableau) -> None:
+    # textbook: smallest b_i / a_i, ties broken by the first row
+    # harris: two passes with relaxed b, picking the largest pivot among the near ties
+    RATIO_TESTS = ("textbook", "harris")
+
+    # entering: an entering column without positive entries, found by the ratio test, means unbounded
+    # full: every column with negative c is scanned after every pivot, for diagnostics
+    UNBOUNDED_CHECKS = ("entering", "full")
+
+    # how much each b may be relaxed by the harris ratio test, below the zero tolerance so relaxed rows
+    # are cleaned up back to zero after the pivot
+    HARRIS_TOLERANCE = 1e-9
+
+    def __init__(self, m, n, tableau, pricing="bland", ratio_test="textbook", basis=None,
+                 unbounded_check="entering", cancel_event=None, vero=True) -> None:
 
         self.m_variables = m
         self.n_restrictions = n
+
+        # False for a [A | I | b] tableau, the vero columns are not there to be skipped and the certificate is
+        # read from the slack columns
+        self.vero = vero
+        self.vero_columns = n if vero else 0
         # if tableau is a list, convert to np.ndarray
         if isinstance(tableau, list):
             self.tableau = np.array(tableau, dtype=float)
         else:
-            self.tableau = tableau.astype(float)
+            # a writable float tableau is pivoted in place, callers that keep theirs pass a copy
+            self.tableau = np.require(tableau, dtype=float, requirements="W")
+
+        # buffers of the pivot loop, allocated once per solve
+        self.workspace = PivotWorkspace(self.tableau.shape)
+
+        # entering column rule, a name from pricing.PRICING_RULES, a PricingRule or a PricingStrategy
+        if not isinstance(pricing, PricingStrategy):
+            pricing = PricingStrategy(pricing)
+        self.pricing = pricing
+
+        if ratio_test not in self.RATIO_TESTS:
+            raise ValueError(f"Unknown ratio test {ratio_test}, choose one of {self.RATIO_TESTS}")
+        self.ratio_test = ratio_test
+
+        if unbounded_check not in self.UNBOUNDED_CHECKS:
+            raise ValueError(f"Unknown unbounded check {unbounded_check}, choose one of {self.UNBOUNDED_CHECKS}")
+        self.unbounded_check = unbounded_check
+
+        # basis header, the tableau column (counting the vero) that is basic in each restriction.
+        # It is updated on every pivot, so the tableau is only searched when the caller does not know it
+        if basis is None:
+            basis = LinearAlgebra.findBasicColumns(self.tableau, drop_vero=vero)
+        self.basis = np.array(basis)
+
+        # anything with is_set(), like a threading.Event, checked before every pivot
+        self.cancel_event = cancel_event
 
     def solve(self):
 
@@ -26,17 +72,23 @@ class Simplex:
         if LinearAlgebra.any_below_zero(b_column):
             raise Exception(f"Negative b value inputed at b column {b_column}")
 
+        # a single full scan before the first pivot, afterwards only the entering columns are checked
         self.assert_not_unbounded()
 
         stop = self.isSimplexDone()
 
+        self.pricing.reset(self.tableau, self.vero_columns)
+
         while not stop:
 
+            self.raiseIfCancelled(self.cancel_event)
+
             # pivot
-            row, column = self.findPivot(self.tableau, n_restrictions=self.n_restrictions)
+            row, column = self.findPivot(self.tableau, n_restrictions=self.vero_columns, pricing=self.pricing,
+                                         ratio_test=self.ratio_test, workspace=self.workspace)
 
             # this happens when an unfeasible problem is found
-            if column == -1 or row == -1:
+            if column == -1:
                 break
                 # obj_value = self.tableau[0][-1]
                 #
@@ -45,37 +97,73 @@ class Simplex:
                 #     certificate = LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions)
                 #     raise UnfeasibleError(certificate)
 
-            self.tableau = self.pivotTableau(self.tableau, row=row, column=column)
-            self.__remove_values_lower_than_tolerance()
+            # the entering column has no positive entry, it can grow forever
+            if row == -1:
+                self.raise_unbounded()
+
+            degenerate = LinearAlgebra.equal_to_zero(self.tableau[row][-1])
+
+            # also cleans up the values below tolerance in the rows it changed
+            self.pivotTableauInPlace(self.tableau, row=row, column=column, workspace=self.workspace)
+            self.basis[row - 1] = column
+
+            self.pricing.register_pivot(self.tableau, row, column - self.vero_columns, self.vero_columns,
+                                        degenerate=degenerate)
 
             stop = self.isSimplexDone()
 
-            # check if it became unbounded
-            self.assert_not_unbounded()
+            if self.unbounded_check == "full":
+                # check if it became unbounded
+                self.assert_not_unbounded()
+
+        logging.info(self.pricing.report())
 
         return self.tableau
 
     def __remove_values_lower_than_tolerance(self):
-        self.tableau = LinearAlgebra.replace_values_smaller_then_tol(self.tableau)
+        # in place, the tableau object is kept for the whole solve
+        self.workspace.snap_to_zero(self.tableau)
 
     def assert_not_unbounded(self):
         is_unbounded = self.isUnbounded(self.tableau)
         if is_unbounded:
-            certificate = LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions)
-            x_solution = LinearAlgebra.get_x_solution(self.tableau)
-            raise UnboundedError(certificate, x_solution)
+            self.raise_unbounded()
+
+    def raise_unbounded(self):
+        certificate = self.certificate()
+        x_solution = LinearAlgebra.get_x_solution(self.tableau, self.basis, has_vero=self.vero)
+        raise UnboundedError(certificate, x_solution)
+
+    def certificate(self, row=0):
+        """
+        Operations register of a tableau row, y for the first row and B^-1 for the restrictions, from the vero
+        or from the slack columns, see LinearAlgebra.get_register_columns
+        """
+        register = LinearAlgebra.get_register_columns(self.n_restrictions, self.m_variables, self.vero)
+        return self.tableau[row, register]
+
+    @staticmethod
+    def raiseIfCancelled(cancel_event):
+        """
+        Raises SolveCancelledError if the cancel event was set, called by the engines between pivots
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            raise SolveCancelledError("Solve cancelled between pivots")
 
     @staticmethod
     def isUnbounded(tableau: np.ndarray):
+        """
+        Full scan, true if any column with negative c has no positive entry
+        """
 
-        for column in tableau.T:
-            if column[0] < 0:
-                is_negative_array = column <= 0
+        negative_c_columns = np.flatnonzero(tableau[0] < 0)
 
-                if all(is_negative_array):
-                    return True
+        if negative_c_columns.size == 0:
+            return False
 
-        return False
+        is_negative_array = tableau[:, negative_c_columns] <= 0
+
+        return bool(np.any(np.all(is_negative_array, axis=0)))
 
 
     def isSimplexDone(self):
@@ -84,7 +172,7 @@ class Simplex:
         :return:
         """
 
-        start = self.n_restrictions
+        start = self.vero_columns
         end = -1
         c_slice = self.tableau[0][start:end]
 
@@ -94,87 +182,162 @@ class Simplex:
         return True
 
     @staticmethod
-    def putInCanonicalForm(original_tableau: np.ndarray):
+    def putInCanonicalForm(original_tableau: np.ndarray, basic_columns=None):
         # for each basic column, subtract the column from the objective function c times such
         # that the basic column is zero in the first row
 
-        basic_columns = LinearAlgebra.findBasicColumns(original_tableau, drop_c=True)
+        # the basis header is only searched if the caller does not track it
+        if basic_columns is None:
+            basic_columns = LinearAlgebra.findBasicColumns(original_tableau, drop_c=True)
 
-        pivoted_tableau = original_tableau
-        # print(basic_columns)
-        # matprint(pivoted_tableau)
-        for restriction, x_index in enumerate(basic_columns):
+        # single copy, the first row is updated in place
+        canonical_tableau = np.array(original_tableau, dtype=float)
+        Simplex.canonicalizeFirstRow(canonical_tableau, basic_columns)
 
-            # pivoting at the c_i, such that i is the ith variable in basis
-            c_index = pivoted_tableau[0, x_index]
-            if c_index == 0:
-                # print(f"C pivot with value {c_index} at i = {x_index}, skipping")
-                continue
+        return canonical_tableau
 
-            # print(f"C pivot with value {c_index} at i = {x_index}")
-            pivoted_tableau = Simplex.pivotTableau(pivoted_tableau, column=x_index, row=restriction + 1)
+    @staticmethod
+    def canonicalizeFirstRow(tableau: np.ndarray, basic_columns):
+        """
+        In place, first row = c - c_B * [B^-1 A | B^-1 | B^-1 b].
+        The basic columns are an identity in the restrictions, so the restrictions already are B^-1 times the
+        starting ones and the whole canonical form is a single product of c_B with them, instead of one pivot
+        per basic column. Restrictions without a basic column (-1) are skipped.
+        """
+        basic_columns = np.asarray(basic_columns)
+        restrictions = np.flatnonzero(basic_columns != -1)
+        columns = basic_columns[restrictions]
 
-            # the first row is the objective function
-            # and the i_th item is the current pivot
-            # c_i = original_tableau[0, x_index]
+        c_basis = tableau[0, columns].copy()
+        tableau[0] -= c_basis @ tableau[restrictions + 1]
 
-            # variable_row = np.where(original_tableau[1:, basicColumn] == 1)[0][0] + 1
+        # exact zeros at the basis and no rounding noise elsewhere
+        tableau[0, columns] = 0
+        tableau[0, np.abs(tableau[0]) <= LinearAlgebra.TOLERANCE] = 0
 
-            # subtract the basis (an identity) times c_i, resulting in c_i = 0
-            # original_tableau[0] -= c_i * original_tableau[variable_row]
-        # print("___")
-        # matprint(pivoted_tableau)
-        return pivoted_tableau
+        return tableau
 
     @staticmethod
-    def findPivot(original_tableau: np.ndarray, n_restrictions: int):
-        # find column < 0
-        column_i = -1
-
-        feasible_c_columns = LinearAlgebra.extract_feasible_columns(original_tableau, n_restrictions)
+    def findPivot(original_tableau: np.ndarray, n_restrictions: int, pricing=None, ratio_test="textbook",
+                  workspace: PivotWorkspace = None):
+        """
+        Finds the pivot, the entering column is chosen by the pricing rule (bland if not given)
+        and the row by the ratio test
+        :param n_restrictions: vero columns before A, 0 for a tableau without the vero
+        :param workspace: optional buffers for the ratio test
+        :return: row, column or -1, -1 if there is no pivotable column
+        """
+        if pricing is None:
+            pricing = BlandPricing()
 
-        # use bland rule (leftmost c value)
-        for i, value in enumerate(feasible_c_columns[0]):
-            if value < 0:
-                # need to re-add the vero
-                column_i = i + n_restrictions
-                break
+        # find column < 0
+        reduced_costs = original_tableau[0, n_restrictions:-1]
 
-        row = -1
-        smallestRatio = np.inf
+        column_i = pricing.choose_column(reduced_costs, original_tableau, n_restrictions)
 
         if column_i == -1:
             return -1, -1
 
-        # find smallest ratio (b_i/a_i), such that a_i > 0
+        # need to re-add the vero
+        column_i += n_restrictions
 
-        for j, a_j in enumerate(original_tableau.T[column_i]):
-            b_j = original_tableau[j][-1]
-            if a_j > 0:
-                ratio = b_j / a_j
+        # the first row is c, only the restrictions take part in the ratio test
+        row = Simplex.ratioTest(original_tableau[1:, column_i], original_tableau[1:, -1],
+                                harris=ratio_test == "harris", workspace=workspace)
 
-                if ratio < smallestRatio:
-                    smallestRatio = ratio
-                    row = j
-
-        # if column_i == -1:
-        #     certificate = LinearAlgebra.retrive_certificate(original_tableau, n_restrictions)
-        #     raise UnfeasibleError(certificate)
+        if row != -1:
+            row += 1
 
         return row, column_i
 
+    @staticmethod
+    def ratioTest(column: np.ndarray, b_column: np.ndarray, harris=False, tolerance=None,
+                  workspace: PivotWorkspace = None):
+        """
+        Chooses the leaving row for an entering column, among the rows with a_i > 0.
+
+        Textbook: smallest b_i / a_i, ties broken by the first row.
+        Harris: the first pass finds the smallest relaxed ratio (b_i + tolerance) / a_i, the second one picks,
+        among the rows whose ratio is below it, the one with the largest a_i. Bigger pivots are more
+        stable and degenerate ties stop being decided by the row order.
+        :param column: entering column, without the c row
+        :param b_column: b values, without the objective value
+        :param tolerance: b relaxation of the harris pass, defaults to HARRIS_TOLERANCE
+        :param workspace: optional preallocated buffers, with at least one entry per restriction
+        :return: restriction index (0 based, without the c row) or -1 if no a_i is positive (unbounded column)
+        """
+
+        size = column.shape[0]
+
+        if workspace is None:
+            workspace = PivotWorkspace((size, 1))
+
+        positive = np.greater(column, LinearAlgebra.TOLERANCE, out=workspace.positive[:size])
+
+        if not np.any(positive):
+            return -1
+
+        ratios = workspace.ratios[:size]
+        ratios.fill(np.inf)
+        np.divide(b_column, column, out=ratios, where=positive)
+
+        if not harris:
+            return int(np.argmin(ratios))
+
+        if tolerance is None:
+            tolerance = Simplex.HARRIS_TOLERANCE
+
+        relaxed_b = np.add(b_column, tolerance, out=workspace.candidates[:size])
+        relaxed_ratios = workspace.relaxed_ratios[:size]
+        relaxed_ratios.fill(np.inf)
+        np.divide(relaxed_b, column, out=relaxed_ratios, where=positive)
+        max_ratio = relaxed_ratios.min()
+
+        # among the near ties, the largest pivot
+        pivot_candidates = workspace.candidates[:size]
+        pivot_candidates.fill(-np.inf)
+        np.copyto(pivot_candidates, column, where=positive & (ratios <= max_ratio))
+
+        return int(np.argmax(pivot_candidates))
+
     @staticmethod
     def pivotTableau(original_tableau: np.ndarray, column: int, row: int):
+        """
+        Pivots a copy of the tableau, the original one is left untouched
+        """
 
         # se passar lista inves de np.array() não quebra
-        if type(original_tableau) is list:
-            tableau = np.array(original_tableau, dtype=float)
-        else:
-            tableau = np.copy(original_tableau)
+        # always a float copy, the in place kernel cannot divide an integer tableau
+        tableau = np.array(original_tableau, dtype=float)
+
+        return Simplex.pivotTableauInPlace(tableau, column=column, row=row)
+
+    @staticmethod
+    def pivotTableauInPlace(tableau: np.ndarray, column: int, row: int, buffer: np.ndarray = None,
+                            workspace: PivotWorkspace = None):
+        """
+        Pivots the tableau at [row, column], modifying it.
+
+        Se eu tenho
+        [[3 2 3],
+        [1 4 5]]
+        e quero transformar o 3 em 0 , preciso aplicar qual operacao na coluna?
 
-        num_rows, _ = tableau.shape
+        Subtrair 3 * linhaPivo (o pivo já vai ser 1), ou seja:
 
-        pivotable_rows = list(range(num_rows))
+        [3, 2, 3] = [3, 2, 3] - [1, 4, 5] * 3
+        == [0, - 10, -12]
+
+        Every row is eliminated at once, subtracting the outer product (pivot column x pivot row).
+        Rows that already have a zero in the pivot column are left alone.
+        :param tableau: float tableau, pivoted in place
+        :param buffer: optional preallocated array with the tableau shape, receives the outer product
+        :param workspace: optional PivotWorkspace for the tableau shape. Every buffer comes from it and the
+            values below tolerance are replaced by zero, only in the rows the pivot changed
+        :return: the same tableau object
+        """
+
+        num_rows, num_columns = tableau.shape
 
         pivot_value = tableau[row][column]
         # print(f"Pivoting {pivotValue} at [{row},{column}] ")
@@ -182,34 +345,53 @@ class Simplex:
         if pivot_value == 0:
             logging.fatal(f"Pivoting by 0 at tableau[{row}, {column}]")
 
-        # make pivot 1
-        tableau[row] = tableau[row] * (1.0 / pivot_value)
+        # make pivot 1, exactly, pivot_value * (1 / pivot_value) may round to 0.9999999999999999
+        tableau[row] *= (1.0 / pivot_value)
+        tableau[row][column] = 1.0
+
+        if workspace is not None:
+            workspace.snap_to_zero(tableau[row])
+            buffer = workspace.outer
 
-        # remove pivot row from list, as it is already done
-        idx_pivot = pivotable_rows.index(row)
-        pivotable_rows.pop(idx_pivot)
+        # how many times the pivot row is subtracted from each row, the pivot row itself is already done
+        if workspace is not None:
+            factors = workspace.factors
+            np.copyto(factors, tableau[:, column])
+        else:
+            factors = tableau[:, column].copy()
+        factors[row] = 0
+
+        rows_to_update = np.flatnonzero(factors)
+        update_size = rows_to_update.size
 
-        # print("Pivotable rows", pivotableRows)
+        if update_size == 0:
+            return tableau
 
-        # make each value in column zero
-        for current_row in pivotable_rows:
-            """
-            Se eu tenho
-            [[3 2 3],
-            [1 4 5]]
-            e quero transformar o 3 em 0 , preciso aplicar qual operacao na coluna?
+        # when every other row changes, update the whole tableau without fancy indexing copies
+        update_everything = update_size == num_rows - 1
 
-            Subtrair 3 * linhaPivo (o pivo já vai ser 1), ou seja:
+        if buffer is None:
+            buffer = np.empty((num_rows if update_everything else update_size, num_columns))
 
-            [3, 2, 3] = [3, 2, 3] - [1, 4, 5] * 3
-            == [0, - 10, -12]
+        if update_everything:
+            row_subtractor = np.multiply.outer(factors, tableau[row], out=buffer[:num_rows])
+            np.subtract(tableau, row_subtractor, out=tableau)
 
-            """
+            if workspace is not None:
+                workspace.snap_to_zero(tableau)
 
-            # if the current_row is 0, this will do nothing
-            row_subtractor = tableau[row] * tableau[current_row][column]
-            # print("I want to zero ")
-            # print(f"Subtracting {rowSubtractor} from {tableau[current_row]} ")
-            tableau[current_row] -= row_subtractor
+        elif workspace is not None:
+            # gather the changing rows in a buffer, update and clean them there and scatter them back
+            updated_rows = np.take(tableau, rows_to_update, axis=0, out=workspace.gathered[:update_size],
+                                   mode='clip')
+            row_subtractor = np.multiply.outer(factors[rows_to_update], tableau[row], out=buffer[:update_size])
+            np.subtract(updated_rows, row_subtractor, out=updated_rows)
+            workspace.snap_to_zero(updated_rows)
+            tableau[rows_to_update] = updated_rows
+
+        else:
+            row_subtractor = np.multiply.outer(factors[rows_to_update], tableau[row],
+                                               out=buffer[:update_size])
+            tableau[rows_to_update] -= row_subtractor
 
         return tableau
@@ -0,0 +1,36 @@
+# the same words SimplexRunner.run_simplex prints
+OPTIMAL = "otima"
+UNFEASIBLE = "inviavel"
+UNBOUNDED = "ilimitada"
+
+
+class SolveResult:
+    """
+    Outcome of a single problem, without printing or raising, see output.py for the text SimplexRunner prints.
+        status: OPTIMAL, UNFEASIBLE or UNBOUNDED
+        objective: optimal value, None if the problem is not optimal
+        x: optimal solution, or the basic solution where the unbounded column was found (UnboundedError.x_solution),
+            None if unfeasible
+        certificate: the vero row, the same one run_simplex prints for the status
+        iterations: pivots of each stage (phase_1, phase_2 or dual_simplex), None if they were not counted
+        timings: seconds spent in each stage (read, phase_1, phase_2 or dual_simplex and total), None if they were
+            not measured
+    """
+
+    __slots__ = ("status", "objective", "x", "certificate", "iterations", "timings")
+
+    def __init__(self, status, objective, x, certificate, iterations=None, timings=None):
+        self.status = status
+        self.objective = objective
+        self.x = x
+        self.certificate = certificate
+        self.iterations = iterations
+        self.timings = timings
+
+    @property
+    def total_iterations(self):
+        return sum(self.iterations.values()) if self.iterations else 0
+
+    def __repr__(self):
+        return (f"SolveResult(status={self.status!r}, objective={self.objective!r}, x={self.x!r}, "
+                f"certificate={self.certificate!r}, iterations={self.iterations!r})")
@@ -1,6 +1,8 @@
+import sys
 import numpy as np
 
 from Utils.linear_algebra import LinearAlgebra
+from exceptions import InputFormatError
 
 
 class TableauParsing:
@@ -19,116 +21,154 @@ class TableauParsing:
         return dupla_n_m
 
     @staticmethod
-    def __read_crude_c_ab_input(n_restrictions: int) -> tuple:
+    def read_problem(stream=None):
         """
-        Reads c and ab, without numerical cleanup
-        :param n_restrictions: number of restrictions
-        :return: (c, ab)
+        Reads the whole problem, n m, c and ab, with a single read of the stream.
+        Every row is checked against n and m and all of c and ab is converted to float64 at once, so a malformed
+        input fails here, with the offending line, instead of somewhere inside the simplex
+        :param stream: text stream with the problem, stdin by default
+        :return: n_restrictions, m_variables, c, ab
         """
+        rows = TableauParsing.__split_rows(TableauParsing.__read_stream(stream))
 
-        # pegando o vetor c normal da linha
-        array_c = np.array([input().strip().split()], float)
-        # pegando a matriz AB normal, a cada n linha de restricao (restante)
+        if not rows:
+            raise InputFormatError("Empty input, expected the first line with n and m")
 
-        array_ab = np.array([input().strip().split()
-                             for _ in range(n_restrictions)], int)
+        line_number, first_line = rows[0]
+        dimensions = first_line.split()
 
-        return array_c, array_ab
+        try:
+            n_restrictions, m_variables = map(int, dimensions)
+        except ValueError:
+            raise InputFormatError(f"Line {line_number}: expected two integers, n and m, found '{first_line.strip()}'")
 
-    @staticmethod
-    def __add_auxilliary_variables_to_a(ab: np.ndarray, n_restrictions: int, m_columns: int):
-        """
-        Adds slack variables to Ab matrix, such that it will become [A | I | b), with a n * n identity matrix
-        :param ab:
-        :param n_restrictions: number of restrictions
-        :param m_columns:
-        :return: tableau with [A | I | B] combined
-        """
+        if n_restrictions < 1 or m_variables < 1:
+            raise InputFormatError(f"Line {line_number}: n and m must be positive, found {n_restrictions} {m_variables}")
 
-        if isinstance(ab, list):
-            ab = np.array(ab, dtype=float)
+        c, ab = TableauParsing.__parse_c_and_ab(rows[1:], n_restrictions, m_variables)
 
-        # insert at m column, last A column, an identity matrix
-        position = m_columns
-        tableau_base = np.insert(ab, position, np.identity(n_restrictions), axis=1)
+        return n_restrictions, m_variables, c, ab
 
-        return tableau_base
+    @staticmethod
+    def __read_stream(stream=None) -> str:
+        if stream is None:
+            stream = sys.stdin
+        return stream.read()
 
     @staticmethod
-    def __normalize_first_row(c: np.ndarray, n_restrictions: int):
-        """
-        Creates tableau first row from C.
-        We need to make sure that the first row is [ -c | 0*n | 0)
-            * C is negative because we are making a restriction C*x -w = 0, such that w is the value,
-            which is equivalent to -C*x = w
-            * We have n 0's, equivalent to every row, representing slack variables
-            * Additional 0 as w restriction, which starts at 0, as simplex starts in trivial basis
-        Exemple:
-        [1, 2, 3], with n = 3 -> [-1, -2, -3 | 0, 0, 0 | 0]
-        :param c: objective function, as 2d ndarray
-        :param n_restrictions: number of restrictions
-        :return: normalized c row with slack variables objective values
+    def __split_rows(text: str) -> list:
         """
+        :return: list of (line number, line), without the blank lines
+        """
+        return [(number, line) for number, line in enumerate(text.splitlines(), start=1) if line.strip()]
+
+    @staticmethod
+    def __parse_c_and_ab(rows: list, n_restrictions: int, m_variables: int) -> tuple:
+        """
+        Checks the token count of every line and converts every token of c and ab to float64 in a single call
+        :param rows: (line number, line) of c and of every restriction
+        :return: (c, ab), c as a 1 x m matrix and ab as n x (m + 1)
+        """
+        if len(rows) != n_restrictions + 1:
+            raise InputFormatError(f"Expected the c line and {n_restrictions} restriction lines, "
+                                   f"found {len(rows)} lines after n and m")
 
-        if type(c) == list:
-            c = np.array(c)
+        tokens = [line.split() for _, line in rows]
+        widths = [m_variables] + [m_variables + 1] * n_restrictions
 
-        # sanity check as C cannot be 1-d in my login neither multirow
-        # I prefer to fix it then to raise the exception
-        if len(c.shape) != 2 or c.shape[0] != 1:
-            # raise Exception(f"You messed up c dimensions, you must make it 2dimensional: 1 row with multiple columns. You have {c.shape}")
-            c = c.reshape(1, -1)
-        negated_c = np.negative(np.array(c))
+        for (line_number, _), line_tokens, width in zip(rows, tokens, widths):
+            if len(line_tokens) != width:
+                raise InputFormatError(f"Line {line_number}: expected {width} values, found {len(line_tokens)}")
 
-        # I need to make this a 2d array, as C is 2d due to input parsing
-        remaining_zeros = np.zeros(n_restrictions + 1).reshape(1, -1)
+        try:
+            values = np.array([token for line_tokens in tokens for token in line_tokens], dtype=float)
+        except ValueError:
+            raise TableauParsing.__unreadable_line(rows, tokens)
 
-        first_row = np.hstack((negated_c, remaining_zeros))
+        array_c = values[:m_variables].reshape(1, -1)
+        array_ab = values[m_variables:].reshape(n_restrictions, m_variables + 1)
 
-        return first_row
+        if not (np.all(np.isfinite(array_c)) and np.all(np.isfinite(array_ab))):
+            raise InputFormatError("The input has nan or infinite values")
+
+        return array_c, array_ab
 
     @staticmethod
-    def __add_operations_register_tableau(tableau, n_restrictions: int):
+    def __unreadable_line(rows: list, tokens: list) -> InputFormatError:
         """
-        Adds an operation register to the left side of tableau, see VERO in the documentation to understand its reason
-        :param tableau: ab tableau
-        :param n_restrictions:  number of restrictions
-        :return: concatenated tableau with vero at beginning
+        Only after the bulk conversion failed, finds the first line with a token that is not a number
         """
+        for (line_number, line), line_tokens in zip(rows, tokens):
+            try:
+                np.array(line_tokens, dtype=float)
+            except ValueError:
+                return InputFormatError(f"Line {line_number}: could not read '{line.strip()[:80]}' as numbers")
 
-        """ this matrix helps keep track of every gaussian elimination and 
-        will be the inverse o the A coeficients in the base, with the first row being the
-        optimal y solution for the dual problem
-        
-        First row: y^t * B
-        1..n rows: Ab^-1
-        
-        | 0 .... 0 0 0 |
-        | 1 .... 0 0 0 |
-        | 0 .... 1 0 0 |
-        | 0 .... 0 1 0 |
-        | 0 .... 0 0 1 |
+        return InputFormatError("Could not read the input as numbers")
+
+    @staticmethod
+    def __assemble_tableau(c: np.ndarray, ab: np.ndarray, n_restrictions: int, m_columns: int, vero=True):
+        """
+        Writes every block of the tableau into a single preallocated matrix, so c and ab, which may be memory
+        mapped, are read exactly once and no intermediate [A | I | b] or [c | ab] matrices are built.
+
+        | 0    | -c | 0 | 0 |
+        | VERO |  A | I | b |
+
+            * The first row is [ -c | 0*n | 0 ]. C is negative because we are making a restriction C*x -w = 0,
+            such that w is the value, which is equivalent to -C*x = w. The n 0's are the slack variables, and the
+            last 0 is w, which starts at 0, as simplex starts in the trivial basis
+            * I is the n * n identity of the slack variables, inserted after the last A column
+            * VERO is the operations register, see the documentation to understand its reason. It keeps track of
+            every gaussian elimination and will be the inverse of the A coeficients in the base, with the first
+            row being the optimal y solution for the dual problem
+                First row: y^t * B
+                1..n rows: Ab^-1
+        Exemple:
+        c = [1, 2, 3], with n = 3 -> first row [0, 0, 0 | -1, -2, -3 | 0, 0, 0 | 0]
+        :param c: objective function, 1d or as a 1 x m matrix
+        :param ab: restrictions, n x (m + 1)
+        :param n_restrictions: number of restrictions
+        :param m_columns: number of variables
+        :param vero: False leaves the vero out, [A | I | b], see LinearAlgebra.get_register_columns
+        :return: full tableau
         """
 
-        # n width c
-        zeros = np.zeros(n_restrictions)
-        # n * n Ab
-        identity = np.identity(n_restrictions)
+        c = np.asarray(c).reshape(-1)
+        ab = np.asarray(ab)
 
-        operations_register = np.vstack((zeros, identity))
+        if c.shape[0] != m_columns or ab.shape != (n_restrictions, m_columns + 1):
+            raise Exception("You messed up AB and C shapes, they arent stackable")
 
-        full_tableau = np.hstack((operations_register, tableau))
+        vero_columns = n_restrictions if vero else 0
+        width = vero_columns + m_columns + n_restrictions + 1
+        full_tableau = np.zeros((n_restrictions + 1, width))
+
+        restrictions = np.arange(1, n_restrictions + 1)
+        a_start = vero_columns
+        slack_start = vero_columns + m_columns
+
+        # vero
+        if vero:
+            full_tableau[restrictions, restrictions - 1] = 1
+        # -c
+        np.negative(c, out=full_tableau[0, a_start:slack_start])
+        # A and b
+        full_tableau[1:, a_start:slack_start] = ab[:, :m_columns]
+        full_tableau[1:, -1] = ab[:, -1]
+        # slack variables
+        full_tableau[restrictions, slack_start + restrictions - 1] = 1
 
         return full_tableau
 
     @staticmethod
-    def read_everything_and_create_tableau():
+    def read_everything_and_create_tableau(stream=None):
         """
         Reads n, m, c and ab from input and create tableau
+        :param stream: text stream with the problem, stdin by default
         :return:  n, m, full_tableau
         """
-        n_restrictions, m_variables = TableauParsing.read_n_m_dimensions()
-        c, ab = TableauParsing.__read_c_and_ab(n_restrictions)
+        n_restrictions, m_variables, c, ab = TableauParsing.read_problem(stream)
 
         full_tableau = TableauParsing.create_full_tableau(c, ab, n_restrictions, m_variables)
 
@@ -137,16 +177,17 @@ class TableauParsing:
         return n_restrictions, m_variables, full_tableau
 
     @staticmethod
-    def read_ab_and_create_tableau(n_restrictions: int, m: int):
+    def read_ab_and_create_tableau(n_restrictions: int, m: int, stream=None):
         """
-        Reads c and ab  from input and create tableau
+        Reads c and ab  from input and create tableau, after read_n_m_dimensions consumed the first line
         :param n_restrictions:
         :param m: number of variables
+        :param stream: text stream with the rest of the problem, stdin by default
         :return: full_tableau, new_number_of_restrictions
         """
 
         # reads input and fixes negative b here
-        c, ab = TableauParsing.__read_c_and_ab(n_restrictions)
+        c, ab = TableauParsing.__read_c_and_ab(n_restrictions, m, stream)
 
         full_tableau = TableauParsing.create_full_tableau(c, ab, n_restrictions, m)
 
@@ -155,50 +196,103 @@ class TableauParsing:
         return full_tableau, new_n_restrictions
 
     @staticmethod
-    def __read_c_and_ab(n_restrictions: int):
+    def __read_c_and_ab(n_restrictions: int, m: int, stream=None):
         """
-        Reads c and ab from input
+        Reads c and ab from input, in a single read
         :param n_restrictions: number of restrictions in tableau
-        :return: c, ab_fixed
+        :param m: number of variables
+        :return: c, ab
         """
-        c, ab = TableauParsing.__read_crude_c_ab_input(n_restrictions)
+        rows = TableauParsing.__split_rows(TableauParsing.__read_stream(stream))
 
-        return c, ab
+        # line numbers are relative to the stream, which starts after the n m line
+        rows = [(line_number + 1, line) for line_number, line in rows]
+
+        return TableauParsing.__parse_c_and_ab(rows, n_restrictions, m)
 
     @staticmethod
-    def __create_c_ab_tableau(c: np.ndarray, a: np.ndarray, n_restrictions: int, m: int):
+    def read_binary_problem(path):
+        """
+        Loads a problem written by write_binary_problem. The file is memory mapped, so nothing is parsed and
+        the pages of A are only read when the tableau is built
+        :param path: .npy file
+        :return: n_restrictions, m_variables, c, ab, with c and ab being read only views of the file
+        """
+        model = np.load(path, mmap_mode='r')
 
-        tableau_base, removed_rows = LinearAlgebra.remove_equal_rows(a)
+        if model.ndim != 2 or model.shape[0] < 2 or model.shape[1] < 2:
+            raise InputFormatError(f"{path}: expected a (n + 1) x (m + 1) matrix, found shape {model.shape}")
 
-        n_restrictions -= len(removed_rows)
+        if not np.issubdtype(model.dtype, np.number):
+            raise InputFormatError(f"{path}: expected a numeric matrix, found {model.dtype}")
 
-        tableau_base = TableauParsing.__add_auxilliary_variables_to_a(tableau_base, n_restrictions, m)
+        n_restrictions = model.shape[0] - 1
+        m_variables = model.shape[1] - 1
 
-        first_line = TableauParsing.__normalize_first_row(c, n_restrictions)
+        c = model[0:1, :m_variables]
+        ab = model[1:]
 
-        c_width = first_line.shape[1]
-        ab_width = tableau_base.shape[1]
+        return n_restrictions, m_variables, c, ab
 
-        if c_width != ab_width:
-            raise Exception("You messed up AB and C shapes, they arent stackable")
+    @staticmethod
+    def write_binary_problem(path, c: np.ndarray, ab: np.ndarray):
+        """
+        Writes a problem as a single float64 .npy matrix, with header and data ready for np.load(mmap_mode='r')
+        | c | 0 |
+        | A | b |
+        :param path: .npy file
+        :param c: objective function, 1d or as a 1 x m matrix
+        :param ab: restrictions, n x (m + 1)
+        """
+        c = np.asarray(c).reshape(-1)
+        ab = np.asarray(ab)
+        n_restrictions, width = ab.shape
+
+        if c.shape[0] + 1 != width:
+            raise InputFormatError(f"c has {c.shape[0]} values but ab has {width} columns, expected {c.shape[0] + 1}")
 
-        combined_c_ab = np.vstack((first_line, tableau_base))
+        # written straight to the file, without building the whole matrix in memory
+        model = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(n_restrictions + 1, width))
+        model[0, :-1] = c
+        model[0, -1] = 0
+        model[1:] = ab
+        model.flush()
+        del model
+
+    @staticmethod
+    def convert_text_to_binary(stream, path):
+        """
+        Converts a problem in the text format (n m / c / ab) to the binary format
+        :param stream: text stream with the problem
+        :param path: .npy file to write
+        :return: n_restrictions, m_variables
+        """
+        n_restrictions, m_variables, c, ab = TableauParsing.read_problem(stream)
+        TableauParsing.write_binary_problem(path, c, ab)
 
-        return combined_c_ab, n_restrictions
+        return n_restrictions, m_variables
 
     @staticmethod
-    def create_full_tableau(c: np.ndarray, a: np.ndarray, n_restrictions: int, m: int):
+    def create_full_tableau(c: np.ndarray, a: np.ndarray, n_restrictions: int, m: int, remove_equal_rows=True,
+                            vero=True):
         """
-        Creates tableau and adds operation register
+        Creates tableau and adds operation register, unless vero is False
         :param c: objective vector
         :param a: restriction matrix
         :param n_restrictions: number of restrictions
         :param m: number of vriables
+        :param remove_equal_rows: removes rows that are a positive multiple of an earlier one first. Turned off
+        by callers that need the indexes of the removed rows, like SimplexRunner, or that change b later, when rows
+        proportional for this b may not be for the next one
+        :param vero: False builds [A | I | b], the certificate is read from the slack columns
         :return: generated tableau
         """
 
-        combined_c_ab, n_restrictions = TableauParsing.__create_c_ab_tableau(c, a, n_restrictions, m)
+        ab = a
+        if remove_equal_rows:
+            ab, removed_rows = LinearAlgebra.remove_equal_rows(a)
+            n_restrictions -= len(removed_rows)
 
-        full_tableau = TableauParsing.__add_operations_register_tableau(combined_c_ab, n_restrictions)
+        full_tableau = TableauParsing.__assemble_tableau(c, ab, n_restrictions, m, vero)
 
         return full_tableau
@@ -0,0 +1,133 @@
+import logging
+import numpy as np
+
+from Utils.linear_algebra import LinearAlgebra
+from tableau import TableauParsing
+from simplex import Simplex
+from dual_simplex import DualSimplex
+from auxiliar_lp import AuxiliarLP
+from pricing import PricingStrategy
+
+
+class WarmStartSolver:
+    """
+    Keeps the final tableau and basis of a solve, so the same model can be solved again after changing only c or b,
+    starting from that basis instead of the slack one.
+
+    The VERO columns of the tableau are the multipliers of the starting restrictions, so for the current basis
+        * a new c only changes the first row, which is rebuilt as c - c_B * B^-1 [A | I]. The basis stays primal
+        feasible and the primal simplex continues from it
+        * a new b only changes the last column, B^-1 b is the VERO rows times b and the objective value is y * b.
+        The first row does not change, the basis stays dual feasible and the dual simplex continues from it
+    Only when the basis is neither primal nor dual feasible the problem is solved again from the slack basis.
+
+    Rows are never removed, not even proportional ones, as a new b can make them different.
+    """
+
+    def __init__(self, c: np.ndarray, ab: np.ndarray, engine=Simplex, pricing="bland", ratio_test="textbook",
+                 unbounded_check="entering"):
+        """
+        :param c: objective function of max c*x, 1d or as a 1 x m matrix
+        :param ab: restrictions Ax <= b, n x (m + 1)
+        :param engine: simplex implementation of the primal pivots, Simplex or RevisedSimplex
+        """
+        self.c = np.array(c, dtype=float).reshape(-1)
+        self.ab = np.array(ab, dtype=float)
+        self.n_restrictions, self.m_variables = self.ab.shape[0], self.ab.shape[1] - 1
+
+        self.engine = engine
+        # a single pricing strategy for every solve, its pivot counts are the total of all of them
+        self.pricing = PricingStrategy(pricing)
+        self.engine_options = {"pricing": self.pricing, "ratio_test": ratio_test, "unbounded_check": unbounded_check}
+
+        # current tableau and basis, always consistent with c and b, even after an unfeasible or unbounded solve
+        self.tableau = None
+        self.basis = None
+        self.__reset_to_slack_basis()
+
+        # pivots done by the last solve and how it started
+        self.last_pivots = 0
+        self.last_start = None
+
+    def __reset_to_slack_basis(self):
+        self.tableau = TableauParsing.create_full_tableau(self.c.reshape(1, -1), self.ab, self.n_restrictions,
+                                                          self.m_variables, remove_equal_rows=False)
+        self.basis = LinearAlgebra.get_slack_basis(self.n_restrictions, self.m_variables)
+
+    def solve(self):
+        """
+        Solves from the current basis, primal simplex if it is primal feasible, dual simplex if it is dual feasible
+        and both phases from the slack basis otherwise
+        :return: final tableau, raises UnfeasibleError or UnboundedError like the engines
+        """
+        pivots_before = self.pricing.total_pivots
+
+        try:
+            if self.__is_primal_feasible():
+                self.last_start = "primal"
+                solver = self.engine(m=self.m_variables, n=self.n_restrictions, tableau=self.tableau.copy(),
+                                     basis=self.basis, **self.engine_options)
+            elif self.__is_dual_feasible():
+                self.last_start = "dual"
+                # its own ratio test, the pricing strategy only counts the pivots
+                solver = DualSimplex(m=self.m_variables, n=self.n_restrictions, tableau=self.tableau.copy(),
+                                     basis=self.basis, pricing=self.pricing)
+            else:
+                self.last_start = "two_phase"
+                self.__reset_to_slack_basis()
+                auxiliar = AuxiliarLP(self.tableau, engine=self.engine, **self.engine_options)
+                tableau = auxiliar.phase_1()
+                solver = self.engine(m=self.m_variables, n=self.n_restrictions, tableau=tableau,
+                                     basis=auxiliar.basis, **self.engine_options)
+
+            solver.solve()
+
+            # the engines pivot a copy, on an exception the current tableau and basis are kept
+            self.tableau = np.ascontiguousarray(solver.tableau)
+            self.basis = np.array(solver.basis)
+        finally:
+            self.last_pivots = self.pricing.total_pivots - pivots_before
+            logging.info(f"warm start: {self.last_start} solve with {self.last_pivots} pivots")
+
+        return self.tableau
+
+    def change_objective(self, c: np.ndarray):
+        """
+        Replaces c, reprices the current basis and solves again
+        """
+        self.c = np.array(c, dtype=float).reshape(-1)
+
+        n = self.n_restrictions
+        self.tableau[0] = 0
+        self.tableau[0, n:n + self.m_variables] = -self.c
+        Simplex.canonicalizeFirstRow(self.tableau, self.basis)
+
+        return self.solve()
+
+    def change_rhs(self, b: np.ndarray):
+        """
+        Replaces b, computes B^-1 b and the objective value from the VERO columns and solves again
+        """
+        b = np.array(b, dtype=float).reshape(-1)
+        self.ab[:, -1] = b
+
+        multipliers = self.tableau[:, :self.n_restrictions]
+        self.tableau[:, -1] = multipliers @ b
+        self.tableau[np.abs(self.tableau[:, -1]) <= LinearAlgebra.TOLERANCE, -1] = 0
+
+        return self.solve()
+
+    def __is_primal_feasible(self):
+        return not LinearAlgebra.any_below_zero(self.tableau[1:, -1])
+
+    def __is_dual_feasible(self):
+        return not LinearAlgebra.any_below_zero(self.tableau[0, self.n_restrictions:-1])
+
+    def optimal_value(self):
+        return self.tableau[0, -1]
+
+    def x_solution(self):
+        return LinearAlgebra.get_x_solution(self.tableau, self.basis)
+
+    def certificate(self):
+        return LinearAlgebra.retrive_certificate(self.tableau, self.n_restrictions)
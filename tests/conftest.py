@@ -1,5 +1,7 @@
 import pytest
 import os
+import io
+import contextlib
 from pathlib import Path
 from pytest_cases import fixture
 
@@ -22,6 +24,8 @@ if ADD_TO_SYSPATH:
 
 # delayed import to garantee that the sys.path is updated
 from Utils.read_json import inject_test_data
+from main import create_runner
+from exceptions import InputFormatError
 
 
 @fixture(scope="module")
@@ -29,6 +33,24 @@ def input_data():
     return get_json_input()
 
 
+@fixture
+def capture_output():
+    """ Funcao que resolve o problema do arquivo ou do stream de texto e devolve o que main.py imprimiria
+    """
+    def capture(input_path=None, stream=None, **options):
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            try:
+                create_runner(input_path, stream=stream, **options).run_simplex()
+            except InputFormatError as error:
+                print(f"Entrada invalida: {error}")
+
+        return output.getvalue()
+
+    return capture
+
+
 def pytest_configure():
     pytest.input_test_data = get_json_input()
 
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from async_solver import AsyncSolver
+from simplex import Simplex
+from revised_simplex import RevisedSimplex
+from dual_simplex import DualSimplex
+from tableau import TableauParsing
+from exceptions import SolveCancelledError
+from solve_result import OPTIMAL, UNFEASIBLE
+from output import format_result
+from main import solve
+
+
+def klee_minty(n):
+    """
+    max sum 2^(n-j) x_j, with 2^n vertices, the dantzig rule visits every one of them
+    """
+    c = np.array([2.0 ** (n - j) for j in range(1, n + 1)])
+    ab = np.zeros((n, n + 1))
+    for i in range(1, n + 1):
+        ab[i - 1, :i - 1] = [2.0 ** (i - j + 1) for j in range(1, i)]
+        ab[i - 1, i - 1] = 1
+        ab[i - 1, -1] = 5.0 ** i
+    return c, ab
+
+
+SMALL_C = np.array([1, 1])
+SMALL_AB = np.array([[1, 0, 2], [0, 1, 3]])
+
+
+class TestCancellation:
+
+    @pytest.mark.parametrize("engine", [Simplex, RevisedSimplex, DualSimplex])
+    def test_engines_stop_before_the_first_pivot(self, engine):
+        c, ab = klee_minty(4)
+        if engine is DualSimplex:
+            c, ab[0, -1] = -c, -1
+        tableau = TableauParsing.create_full_tableau(c.reshape(1, -1), ab, 4, 4, remove_equal_rows=False)
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        solver = engine(m=4, n=4, tableau=tableau, basis=np.arange(8, 12), cancel_event=cancel_event)
+
+        with pytest.raises(SolveCancelledError):
+            solver.solve()
+
+        assert solver.pricing.total_pivots == 0
+
+
+class TestAsyncSolver:
+
+    def test_concurrent_solves(self):
+        problems = [(SMALL_C, SMALL_AB), (SMALL_C, np.array([[1, 0, 2], [0, 1, -3]])), klee_minty(6)]
+
+        async def solve_all():
+            async with AsyncSolver(max_concurrency=2) as solver:
+                return await asyncio.gather(*(solver.solve_async(c, ab) for c, ab in problems))
+
+        results = asyncio.run(solve_all())
+
+        assert [result.status for result in results] == [OPTIMAL, UNFEASIBLE, OPTIMAL]
+        npt.assert_allclose(results[0].objective, 5)
+        npt.assert_allclose(results[2].objective, 5.0 ** 6)
+
+    def test_same_result_as_main_solve(self):
+        # x1 + x2 <= 2 written twice, removed by the runner like in main.solve
+        c, ab = np.array([1, 1]), np.array([[1, 1, 2], [2, 2, 4], [1, 0, 1]])
+        options = {"engine": "revised", "presolve": True}
+
+        async def solve_one():
+            async with AsyncSolver(max_concurrency=1, **options) as solver:
+                return await solver.solve_async(c, ab)
+
+        result = asyncio.run(solve_one())
+
+        assert format_result(result) == format_result(solve(c, ab, **options))
+        assert "total" in result.timings
+
+    def test_timeout_frees_the_worker(self):
+        # thousands of pivots with dantzig, far longer than the timeout
+        c, ab = klee_minty(16)
+
+        async def timeout_then_solve():
+            async with AsyncSolver(max_concurrency=1, pricing="dantzig") as solver:
+                with pytest.raises(asyncio.TimeoutError):
+                    await solver.solve_async(c, ab, timeout=0.05)
+
+                # the single thread is already free
+                start = time.perf_counter()
+                result = await solver.solve_async(SMALL_C, SMALL_AB)
+                return result, time.perf_counter() - start
+
+        result, elapsed = asyncio.run(timeout_then_solve())
+
+        assert result.status == OPTIMAL
+        assert elapsed < 1
+
+    def test_cancelled_task(self):
+        c, ab = klee_minty(16)
+
+        async def cancel():
+            async with AsyncSolver(max_concurrency=1, pricing="dantzig") as solver:
+                task = asyncio.ensure_future(solver.solve_async(c, ab))
+                await asyncio.sleep(0.05)
+                task.cancel()
+
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+                return await asyncio.wait_for(solver.solve_async(SMALL_C, SMALL_AB), timeout=1)
+
+        assert asyncio.run(cancel()).status == OPTIMAL
@@ -14,7 +14,8 @@ class TestAuxiliar:
 
     def test_auxiliar_lp_phase_1(self):
         """
-        Test the first phase of simplex, auxiliar
+        Test the first phase of simplex, auxiliar. Every b is positive, so the slack columns are already a basis,
+        no synthetic variable is added and the tableau comes back unchanged
         """
         baseTableau = np.array([
             [0, 0, 0, -3, -2, 0, 0, 0, 0],
@@ -27,13 +28,42 @@ class TestAuxiliar:
 
         result_tableau = pl.phase_1()
 
-        expectedTableau = np.array(
-            [[0., -1., 4., 0., 0., 0., -1., 4., 12],
-             [0., -1., 2., 1., 0., 0., -1., 2., 2.],
-             [1., 1., -3., 0., 0., 1., 1., -3., 1.],
-             [0., 1., -1., 0., 1., 0., 1., -1., 3.]])
+        npt.assert_allclose(result_tableau, baseTableau)
+        assert pl.slack_variables_added == 0
 
-        npt.assert_allclose(result_tableau, expectedTableau)
+    def test_auxiliar_lp_phase_1_with_negative_b(self):
+        baseTableau = np.array([
+            [0, 0, 0, -3, -2, 0, 0, 0, 0],
+            [1, 0, 0, 2, 1, 1, 0, 0, 8],
+            [0, 1, 0, 1, 2, 0, 1, 0, 8],
+            [0, 0, 1, -1, -1, 0, 0, 1, -2],
+        ])
+
+        pl = AuxiliarLP(baseTableau)
+        result_tableau = pl.phase_1()
+
+        # only the restriction with negative b needs a synthetic variable, which is gone after phase 1
+        assert pl.slack_variables_added == 1
+        assert result_tableau.shape == baseTableau.shape
+
+        # feasible basis in canonical form, x = (2, 0)
+        npt.assert_equal(pl.basis, LinearAlgebra.findBasicColumns(result_tableau))
+        npt.assert_allclose(result_tableau[0, pl.basis], 0)
+        npt.assert_allclose(LinearAlgebra.get_x_solution(result_tableau, pl.basis), [2, 0])
+        assert not LinearAlgebra.any_below_zero(result_tableau[1:, -1])
+
+    def test_basis_header_after_phase_1(self):
+        baseTableau = np.array([
+            [0, 0, 0, -3, -2, 0, 0, 0, 0],
+            [1, 0, 0, 2, 1, 1, 0, 0, 8],
+            [0, 1, 0, 1, 2, 0, 1, 0, 8],
+            [0, 0, 1, 1, 1, 0, 0, 1, 5],
+        ])
+
+        pl = AuxiliarLP(baseTableau)
+        result_tableau = pl.phase_1()
+
+        npt.assert_equal(pl.basis, LinearAlgebra.findBasicColumns(result_tableau))
 
     def test_auxiliar_tableau_pre_solve(self):
         """
@@ -51,10 +81,11 @@ class TestAuxiliar:
 
         resultC = presolved_tableau[0]
 
-        # should represent a canonical form
-        expectedC = [-1, -1, -1, -4, -4, -1, -1, -1, 0, 0, 0, -21]
+        # the slack columns are the basis, no synthetic variable, so nothing to minimize
+        expectedC = np.zeros(baseTableau.shape[1])
 
         npt.assert_allclose(resultC, expectedC)
+        npt.assert_equal(pl.basis, [5, 6, 7])
 
     def test_pre_solve_fixes_negative_b_entry(self):
         baseTableau = np.array([
@@ -146,12 +177,14 @@ class TestAuxiliar:
 
         tableau = pl.pre_solve_auxiliar_problem()
 
-        expectedTableau = np.array([[-1., -1., 1., -2., -2., -1., -1., 1., 0., 0., 0., -21.],
-                                    [1., 0., 0., 2., 1., 1., 0., 0., 1., 0., 0., 8.],
-                                    [0., 1., 0., 1., 2., 0., 1., 0., 0., 1., 0., 8.],
-                                    [0., 0., -1., -1., -1., 0., 0., -1., 0., 0., 1., 5.]])
+        # a single synthetic column, for the restriction multiplied by -1, the others keep their slack
+        expectedTableau = np.array([[0., 0., 1., 1., 1., 0., 0., 1., 0., -5.],
+                                    [1., 0., 0., 2., 1., 1., 0., 0., 0., 8.],
+                                    [0., 1., 0., 1., 2., 0., 1., 0., 0., 8.],
+                                    [0., 0., -1., -1., -1., 0., 0., -1., 1., 5.]])
 
         npt.assert_almost_equal(tableau, expectedTableau)
+        npt.assert_equal(pl.basis, [5, 6, 8])
 
     def test_correct_c_restauration(self):
         """
@@ -188,11 +221,12 @@ class TestAuxiliar:
 
         tableau = aux.pre_solve_auxiliar_problem()
 
+        # the slack columns are already a trivial basis in canonical form, nothing is added
         expectedTableau = np.array([
-            [-1., -1., -1., -1., -1., -1., -1., -1., -1., 0., 0., 0., -3.],
-            [1., 0., 0., 1., 0., 0., 1., 0., 0., 1., 0., 0., 1.],
-            [0., 1., 0., 0., 1., 0., 0., 1., 0., 0., 1., 0., 1.],
-            [0., 0., 1., 0., 0., 1., 0., 0., 1., 0., 0., 1., 1.]
+            [0., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
+            [1., 0., 0., 1., 0., 0., 1., 0., 0., 1.],
+            [0., 1., 0., 0., 1., 0., 0., 1., 0., 1.],
+            [0., 0., 1., 0., 0., 1., 0., 0., 1., 1.]
         ])
 
         npt.assert_allclose(tableau, expectedTableau)
@@ -208,11 +242,22 @@ class TestAuxiliar:
         aux = AuxiliarLP(baseTableau)
         aux.phase_1()
 
-        expectedOutput = np.array([
-            [2, 4, 8, 0, 0, 0, 2, 4, 8, 14],
-            [1, 0, 0, 1, 0, 0, 1, 0, 0, 1],
-            [0, 1, 0, 0, 1, 0, 0, 1, 0, 1],
-            [0, 0, 1, 0, 0, 1, 0, 0, 1, 1]
-        ])
+        # slack basis, phase 1 has nothing to do and phase 2 starts from the original tableau
+        npt.assert_allclose(aux.tableau, baseTableau)
+
+    def test_synthetic_in_basis_is_not_printed(self, capfd):
+        """
+        A synthetic variable left in the basis at zero level makes the problem unfeasible, reported without
+        writing to stdout, which is the output of main.solve callers and of the server workers
+        """
+        pl = AuxiliarLP(np.array([
+            [0, 0, 0, 0, 0],
+            [1, 1, 1, 0, 0],
+        ]))
+        pl.auxiliary_columns = [3]
+        pl.basis = np.array([3])
+
+        assert pl.is_unfeasible()
 
-        npt.assert_allclose(aux.tableau, expectedOutput)
+        out, _ = capfd.readouterr()
+        assert out == ""
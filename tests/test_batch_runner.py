@@ -0,0 +1,66 @@
+import io
+import os
+from pathlib import Path
+
+from batch_runner import expand_inputs, solve_file, run_batch
+from main import SimplexRunner
+from output import format_result, load_result_arrays
+
+CASES = Path(__file__).resolve().parent / "cases" / "Testes"
+
+
+class TestBatchRunner:
+
+    @staticmethod
+    def expected_output(path, capfd):
+        with open(path) as stream:
+            SimplexRunner(stream=stream).run_simplex()
+        out, _ = capfd.readouterr()
+        return out
+
+    def test_expand_inputs(self):
+        from_directory = expand_inputs([str(CASES)])
+        from_glob = expand_inputs([str(CASES / "0*"), str(CASES / "01")])
+
+        assert [os.path.basename(path) for path in from_directory] == [f"{case:02d}" for case in range(1, 16)]
+        assert [os.path.basename(path) for path in from_glob] == [f"{case:02d}" for case in range(1, 10)]
+
+    def test_solve_file_captures_the_output(self, capfd):
+        path = str(CASES / "01")
+
+        assert solve_file(path) == (path, self.expected_output(path, capfd))
+
+    def test_invalid_input(self, tmp_path):
+        path = tmp_path / "invalida"
+        path.write_text("2 2\n1 1\n1 1 1\n")
+
+        _, output = solve_file(str(path))
+
+        assert output.startswith("Entrada invalida")
+
+    def test_output_files_and_combined_stream(self, tmp_path, capfd):
+        paths = expand_inputs([str(CASES)])
+        stream = io.StringIO()
+
+        solved = run_batch(paths, workers=2, chunksize=4, output_dir=tmp_path, stream=stream)
+
+        assert solved == len(paths)
+
+        combined = stream.getvalue()
+        for path in paths:
+            expected = self.expected_output(path, capfd)
+            assert (tmp_path / os.path.basename(path)).read_text() == expected
+            assert f"==> {path} <==\n{expected}" in combined
+
+        # the outputs keep the order of the inputs
+        positions = [combined.index(f"==> {path} <==") for path in paths]
+        assert positions == sorted(positions)
+
+    def test_binary_output(self, tmp_path):
+        paths = [str(CASES / case) for case in ("01", "02", "03")]
+
+        run_batch(paths, workers=2, binary_dir=tmp_path)
+
+        for path in paths:
+            _, expected = solve_file(path)
+            assert format_result(load_result_arrays(tmp_path / os.path.basename(path))) == expected
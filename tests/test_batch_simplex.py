@@ -0,0 +1,82 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import sys
+import io
+
+from batch_simplex import BatchSimplex
+from main import SimplexRunner
+from solve_result import OPTIMAL, UNFEASIBLE, UNBOUNDED
+
+
+class TestBatchSimplex:
+
+    A = np.array([
+        [1, 1, 0],
+        [2, -1, -1],
+        [-1, 2, 0],
+        [-1, -2, 0],
+    ])
+
+    BOUNDED_A = np.array([
+        [1, 1, 1],
+        [2, 1, 0],
+        [0, 1, 2],
+    ])
+
+    @staticmethod
+    def run_one(a, b, c, capfd):
+        lines = [f"{a.shape[0]} {a.shape[1]}", " ".join(map(str, c))]
+        lines += [" ".join(map(str, list(row) + [b_i])) for row, b_i in zip(a, b)]
+
+        sys.stdin = io.StringIO("\n".join(lines))
+        SimplexRunner(dual_simplex=False).run_simplex()
+        out, _ = capfd.readouterr()
+        return out.splitlines()
+
+    def test_same_results_as_the_runner(self, capfd):
+        rng = np.random.default_rng(7)
+        b = rng.integers(-4, 8, (40, 4))
+        c = rng.integers(-3, 5, (40, 3))
+
+        results = BatchSimplex(self.A, b, c).solve()
+
+        statuses = set()
+        for k, result in enumerate(results):
+            output = self.run_one(self.A, b[k], c[k], capfd)
+            statuses.add(result.status)
+
+            assert output[0] == result.status
+            npt.assert_allclose([float(y) for y in output[-1].split()], result.certificate, atol=1e-7)
+            if result.status == OPTIMAL:
+                npt.assert_allclose(float(output[1]), result.objective, atol=1e-7)
+            if result.status != UNFEASIBLE:
+                npt.assert_allclose([float(x) for x in output[1 if result.status == UNBOUNDED else 2].split()],
+                                    result.x, atol=1e-7)
+
+        assert statuses == {OPTIMAL, UNFEASIBLE, UNBOUNDED}
+
+    def test_finished_problems_are_masked_out(self):
+        # the first one is optimal at the slack basis, the second one needs pivots
+        b = np.array([[1, 1, 1], [4, 5, 6]])
+        c = np.array([[-1, -1, -1], [1, 1, 1]])
+
+        batch = BatchSimplex(self.BOUNDED_A, b, c)
+        results = batch.solve()
+
+        assert results[0].status == OPTIMAL
+        assert results[0].objective == 0
+        assert batch.pivot_counts[0] == 0
+        assert batch.pivot_counts[1] > 0
+
+    def test_single_objective_for_every_problem(self):
+        b = np.array([[4, 5, 6], [8, 10, 12]])
+
+        results = BatchSimplex(self.BOUNDED_A, b, np.array([1, 1, 1])).solve()
+
+        npt.assert_allclose(results[1].objective, 2 * results[0].objective)
+        npt.assert_allclose(results[1].x, 2 * results[0].x)
+
+    def test_unknown_pricing(self):
+        with pytest.raises(ValueError):
+            BatchSimplex(self.A, np.ones((1, 3)), np.ones(3), pricing="devex")
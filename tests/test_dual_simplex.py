@@ -0,0 +1,95 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import sys
+import io
+
+from dual_simplex import DualSimplex
+from exceptions import UnfeasibleError
+from main import SimplexRunner
+from tableau import TableauParsing
+
+
+class TestDualSimplex:
+
+    @staticmethod
+    def create_solver(c, ab):
+        n, m = ab.shape[0], ab.shape[1] - 1
+        tableau = TableauParsing.create_full_tableau(c.reshape(1, -1), ab, n, m, remove_equal_rows=False)
+        basis = np.arange(n + m, 2 * n + m)
+        return DualSimplex(m=m, n=n, tableau=tableau, basis=basis)
+
+    @staticmethod
+    def run(entrada, capfd, **kwargs):
+        sys.stdin = io.StringIO(entrada)
+        SimplexRunner(**kwargs).run_simplex()
+        out, _ = capfd.readouterr()
+        return out.splitlines()
+
+    def test_optimal_without_phase_1(self):
+        # min x1 + x2 with x1 + 2x2 >= 4 and 3x1 + x2 >= 6
+        c = np.array([-1, -1])
+        ab = np.array([
+            [-1, -2, -4],
+            [-3, -1, -6],
+        ])
+
+        solver = self.create_solver(c, ab)
+        assert solver.is_dual_feasible()
+
+        tableau = solver.solve()
+
+        npt.assert_allclose(tableau[0, -1], -2.8)
+        assert np.all(tableau[1:, -1] >= 0)
+        # the vero row is a dual optimal certificate, y >= 0 and y^T A >= c
+        y = tableau[0, :2]
+        assert np.all(y >= 0)
+        assert np.all(ab[:, :-1].T @ y >= c - 1e-9)
+        npt.assert_allclose(y @ ab[:, -1], -2.8)
+
+    def test_unfeasible_certificate(self):
+        # x1 + x2 <= 1 and x1 + x2 >= 3
+        c = np.array([-1, -1])
+        ab = np.array([
+            [1, 1, 1],
+            [-1, -1, -3],
+        ])
+
+        solver = self.create_solver(c, ab)
+
+        with pytest.raises(UnfeasibleError) as exc:
+            solver.solve()
+
+        y = exc.value.certificate
+        assert np.all(y >= 0)
+        assert np.all(ab[:, :-1].T @ y >= -1e-9)
+        assert y @ ab[:, -1] < 0
+
+    def test_needs_dual_feasible_basis(self):
+        solver = self.create_solver(np.array([1, -1]), np.array([[-1, -1, -2]]))
+
+        assert not solver.is_dual_feasible()
+        with pytest.raises(Exception):
+            solver.solve()
+
+    @pytest.mark.parametrize("options", [{"pricing": "dantzig"}, {"ratio_test": "harris"}])
+    def test_rejects_primal_options(self, options):
+        c, ab = np.array([-1, -1]), np.array([[-1, -2, -4]])
+        tableau = TableauParsing.create_full_tableau(c.reshape(1, -1), ab, 1, 2, remove_equal_rows=False)
+
+        with pytest.raises(ValueError):
+            DualSimplex(m=2, n=1, tableau=tableau, basis=np.array([3]), **options)
+
+        # the runner only gives them to the primal stages
+        result = SimplexRunner(problem=(c, ab), **options).solve()
+        assert result.iterations["dual_simplex"] == 1
+
+    def test_runner_matches_two_phases(self, capfd):
+        entrada = "2 2\n-1 -1\n-1 -2 -4\n-3 -1 -6"
+
+        dual = self.run(entrada, capfd)
+        two_phases = self.run(entrada, capfd, dual_simplex=False)
+
+        assert dual[0] == two_phases[0] == "otima"
+        npt.assert_allclose(float(dual[1]), float(two_phases[1]))
+        npt.assert_allclose([float(x) for x in dual[2].split()], [1.6, 1.2])
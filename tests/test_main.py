@@ -5,6 +5,7 @@ import sys
 import io
 
 from main import SimplexRunner
+from tableau import TableauParsing
 
 
 class TestSimplexRunner:
@@ -87,3 +88,49 @@ class TestSimplexRunner:
         optimal_value = obj.get_optimal_value()
 
         npt.assert_allclose(optimal_value, 14)
+
+    def test_binary_model_prints_same_as_text(self, capfd, entrada, tmp_path):
+        path = tmp_path / "problema.npy"
+        TableauParsing.convert_text_to_binary(io.StringIO(entrada), path)
+
+        sys.stdin = io.StringIO(entrada)
+        SimplexRunner().run_simplex()
+        expected, _ = capfd.readouterr()
+
+        SimplexRunner(model_path=path).run_simplex()
+        out, _ = capfd.readouterr()
+
+        assert out == expected
+
+    def test_inconsistent_equalities_found_before_simplex(self, capfd):
+        entrada = "6 3\n1 1 1\n1 1 0 2\n-1 -1 0 -2\n0 1 1 3\n0 -1 -1 -3\n1 2 1 6\n-1 -2 -1 -6"
+        sys.stdin = io.StringIO(entrada)
+
+        obj = SimplexRunner(remove_dependent=True)
+        obj.run_simplex()
+        out, _ = capfd.readouterr()
+
+        output = out.splitlines()
+        certificate = numpy.array(output[1].split(), dtype=float)
+        ab = numpy.array([line.split() for line in entrada.splitlines()[2:]], dtype=float)
+
+        assert output[0] == "inviavel"
+        assert numpy.all(certificate >= 0)
+        npt.assert_allclose(certificate @ ab[:, :-1], 0, atol=1e-9)
+        assert certificate @ ab[:, -1] < 0
+
+    @pytest.mark.parametrize("entrada, expected", [
+        # -5x <= -5 and 2x <= 2 force x = 1, they are not the same restriction
+        ("6 1\n2\n-4 9\n-5 -5\n0 2\n4 7\n2 2\n-4 -1", ["otima", "2.0", "1.0", "0.0 0.0 0.0 0.0 1.0 0.0"]),
+        # x >= 1/4 and x <= -1
+        ("4 1\n1\n-5 5\n-5 2\n-4 -1\n4 -4", ["inviavel", "0.0 0.0 1.0 1.0"]),
+        # 0 <= 1 and 0 <= -2, only the second one is unfeasible
+        ("3 1\n-2\n-2 5\n0 1\n0 -2", ["inviavel", "0.0 0.0 1.0"]),
+    ])
+    def test_opposite_restrictions_are_not_merged(self, capfd, entrada, expected):
+        sys.stdin = io.StringIO(entrada)
+
+        SimplexRunner().run_simplex()
+        out, _ = capfd.readouterr()
+
+        assert out.splitlines() == expected
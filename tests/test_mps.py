@@ -0,0 +1,181 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import io
+
+from exceptions import InputFormatError
+from mps import MpsParsing
+from main import SimplexRunner
+
+# the same LP as tests/cases/Testes/04, with the last two restrictions written as one equality
+EQUALITY_MODEL = """NAME          CASO04
+* max -3x1 -4x2 +5x3 -5x4 written as a minimization
+ROWS
+ N  COST
+ L  R1
+ G  R2
+ E  R3
+COLUMNS
+    X1        COST      3.0        R1        1.0
+    X1        R2        1.0        R3        2.0
+    X2        COST      4.0        R1        1.0
+    X2        R3        1.0
+    X3        COST      -5.0       R2        5.0
+    X3        R3        1.0
+    X4        COST      5.0        R2        -5.0
+    X4        R3        -1.0
+RHS
+    RHS       R1        5.0        R2        10.0
+    RHS       R3        10.0
+ENDATA
+"""
+
+BOUNDS_MODEL = """NAME BOUNDS
+OBJSENSE
+    MAX
+ROWS
+ N obj
+ L lim
+COLUMNS
+ x obj 2 lim 1
+ y obj 1 lim 1
+RHS
+ rhs lim 10 obj -7
+RANGES
+ rng lim 4
+BOUNDS
+ UP bnd x 3
+ LO bnd y 2
+ UP bnd y 8
+ENDATA
+"""
+
+FREE_MODEL = """NAME FREE
+ROWS
+ N obj
+ G r1
+COLUMNS
+ x obj 1 r1 1
+ y r1 -1
+ z obj 1 r1 1
+RHS
+ r1 -5
+BOUNDS
+ FR bnd x
+ UP bnd y 3
+ FX bnd z 2
+ENDATA
+"""
+
+# the upper bound of x is the same row as r1
+REPEATED_BOUND_MODEL = """NAME REPEATED
+OBJSENSE
+    MAX
+ROWS
+ N obj
+ L r1
+ L r2
+COLUMNS
+ x obj 1 r1 1
+ y obj 1 r2 1
+RHS
+ rhs r1 3 r2 4
+BOUNDS
+ UP bnd x 3
+ENDATA
+"""
+
+
+class TestMps:
+
+    @staticmethod
+    def run_model(tmp_path, text, capfd):
+        path = tmp_path / "modelo.mps"
+        path.write_text(text)
+
+        runner = SimplexRunner(model_path=path)
+        runner.run_simplex()
+        out, _ = capfd.readouterr()
+
+        return runner, out.splitlines()
+
+    def test_equality_becomes_two_restrictions(self):
+        model = MpsParsing.read_mps(io.StringIO(EQUALITY_MODEL))
+
+        assert model.name == "CASO04"
+        assert model.row_names == ["R1", "R2", "R3"]
+        assert model.column_names == ["X1", "X2", "X3", "X4"]
+        # the simplex maximizes
+        npt.assert_allclose(model.c, [-3, -4, 5, -5])
+        npt.assert_allclose(model.ab, [
+            [1, 1, 0, 0, 5],
+            [-1, 0, -5, 5, -10],
+            [2, 1, 1, -1, 10],
+            [-2, -1, -1, 1, -10],
+        ])
+
+    def test_equality_model_optimum(self, tmp_path, capfd):
+        _, output = self.run_model(tmp_path, EQUALITY_MODEL, capfd)
+
+        assert output[0] == "otima"
+        # the file minimizes, so the value is the negative of the maximization
+        npt.assert_allclose(float(output[1]), -50)
+        npt.assert_allclose([float(x) for x in output[2].split()], [0, 0, 10, 0])
+
+    def test_bounds_ranges_and_objective_constant(self, tmp_path, capfd):
+        model = MpsParsing.read_mps(io.StringIO(BOUNDS_MODEL))
+
+        # the range makes 6 <= x + y <= 10, y is shifted by its lower bound 2 and both upper bounds are rows
+        npt.assert_allclose(model.ab, [
+            [1, 1, 8],
+            [-1, -1, -4],
+            [1, 0, 3],
+            [0, 1, 6],
+        ])
+
+        _, output = self.run_model(tmp_path, BOUNDS_MODEL, capfd)
+
+        assert output[0] == "otima"
+        # 2 * 3 + 7 plus the constant 7
+        npt.assert_allclose(float(output[1]), 20)
+        npt.assert_allclose([float(x) for x in output[2].split()], [3, 7])
+
+    def test_repeated_generated_row(self, tmp_path, capfd):
+        runner, output = self.run_model(tmp_path, REPEATED_BOUND_MODEL, capfd)
+
+        assert runner.removed_rows == [2]
+        assert output[0] == "otima"
+        npt.assert_allclose(float(output[1]), 7)
+        # the certificate is over the generated rows, 0 for the removed one
+        npt.assert_allclose([float(y) for y in output[3].split()], [1, 1, 0])
+
+    def test_free_and_fixed_variables(self, tmp_path, capfd):
+        model = MpsParsing.read_mps(io.StringIO(FREE_MODEL))
+
+        # x is split in x+ and x-, y keeps its column and z is fixed, so it has none
+        assert model.m_variables == 3
+        npt.assert_allclose(model.positive, [0, 2, -1])
+        npt.assert_allclose(model.negative, [1, -1, -1])
+        npt.assert_allclose(model.shift, [0, 0, 2])
+
+        _, output = self.run_model(tmp_path, FREE_MODEL, capfd)
+
+        assert output[0] == "otima"
+        # x >= y - 7, with y = 0, plus z = 2
+        npt.assert_allclose(float(output[1]), -5)
+        npt.assert_allclose([float(x) for x in output[2].split()], [-7, 0, 2])
+
+    @pytest.mark.parametrize("text, message", [
+        ("ROWS\n N obj\n L r1\nCOLUMNS\n x r2 1\nENDATA\n", "Line 5: unknown row r2"),
+        ("ROWS\n X obj\n", "Line 2"),
+        ("ROWS\n N obj\n L r1\nCOLUMNS\n x r1 abc\n", "could not read abc"),
+        ("ROWS\n N obj\n L r1\nCOLUMNS\n x r1 1\nBOUNDS\n SC bnd x 1\n", "unsupported bound type SC"),
+        ("ROWS\n N obj\n L r1\nCOLUMNS\n x r1 1\nBOUNDS\n LO bnd x 5\n UP bnd x 1\n", "lower bound bigger"),
+        ("ROWS\n N obj\nCOLUMNS\n x obj 1\n", "no restrictions"),
+        ("SOMETHING\n", "unknown MPS section"),
+    ])
+    def test_malformed_models(self, text, message):
+        with pytest.raises(InputFormatError) as exc:
+            MpsParsing.read_mps(io.StringIO(text))
+
+        assert message in str(exc.value)
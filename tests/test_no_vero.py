@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from main import SimplexRunner, solve
+from simplex import Simplex
+from dual_simplex import DualSimplex
+from auxiliar_lp import AuxiliarLP
+from tableau import TableauParsing
+from exceptions import UnfeasibleError
+from output import format_result
+from Utils.linear_algebra import LinearAlgebra
+
+CASES = Path(__file__).resolve().parent / "cases" / "Testes"
+
+
+class TestNoVero:
+
+    def test_tableau_layout(self):
+        c = np.array([[1, 2, 3]])
+        ab = np.array([[1, 0, 1, 4], [0, 1, 1, 5]])
+
+        with_vero = TableauParsing.create_full_tableau(c, ab, 2, 3)
+        without_vero = TableauParsing.create_full_tableau(c, ab, 2, 3, vero=False)
+
+        npt.assert_array_equal(without_vero, with_vero[:, 2:])
+        npt.assert_array_equal(LinearAlgebra.get_slack_basis(2, 3, has_vero=False), [3, 4])
+
+    def test_slack_columns_follow_the_vero(self):
+        # x1 + x2 >= 1 needs phase 1, which flips the row, every operation changes vero and slacks alike
+        c = np.array([[1, 1]])
+        ab = np.array([[1, 0, 2], [0, 1, 3], [-1, -1, -1]])
+        tableau = TableauParsing.create_full_tableau(c, ab, 3, 2)
+
+        auxiliar = AuxiliarLP(tableau)
+        phase2 = Simplex(m=2, n=3, tableau=auxiliar.phase_1(), basis=auxiliar.basis)
+        solved = phase2.solve()
+
+        npt.assert_array_equal(solved[:, :3], solved[:, 5:8])
+
+    def test_farkas_certificate_of_the_dual_simplex(self):
+        # x1 + x2 <= 1 and x1 + x2 >= 3
+        c = np.array([-1, -1])
+        ab = np.array([[1, 1, 1], [-1, -1, -3]])
+        tableau = TableauParsing.create_full_tableau(c.reshape(1, -1), ab, 2, 2, remove_equal_rows=False,
+                                                     vero=False)
+        solver = DualSimplex(m=2, n=2, tableau=tableau, basis=np.array([2, 3]), vero=False)
+
+        with pytest.raises(UnfeasibleError) as error:
+            solver.solve()
+
+        y = error.value.certificate
+        assert np.all(y >= 0)
+        assert np.all(y @ ab[:, :-1] >= 0) and y @ ab[:, -1] < 0
+
+    @pytest.mark.parametrize("engine", ["tableau", "revised"])
+    @pytest.mark.parametrize("case", sorted(path.name for path in CASES.iterdir()))
+    def test_same_output_as_the_vero(self, case, engine):
+        with open(CASES / case) as stream:
+            expected = SimplexRunner(stream=stream, engine=engine).solve()
+        with open(CASES / case) as stream:
+            runner = SimplexRunner(stream=stream, engine=engine, vero=False)
+
+        assert runner.tableau.shape[1] == runner.m_variables + runner.n_restrictions + 1
+        assert format_result(runner.solve()) == format_result(expected)
+
+    @pytest.mark.parametrize("options", [{}, {"dual_simplex": False}, {"presolve": True},
+                                         {"unbounded_check": "full"}])
+    def test_random_problems(self, options):
+        rng = np.random.default_rng(11)
+
+        for _ in range(50):
+            n, m = rng.integers(1, 6, size=2)
+            ab = rng.integers(-4, 6, size=(n, m + 1)).astype(float)
+            c = rng.integers(-4, 5, size=m).astype(float)
+
+            assert (format_result(solve(c, ab, vero=False, **options))
+                    == format_result(solve(c, ab, **options)))
@@ -0,0 +1,111 @@
+import numpy as np
+import numpy.testing as npt
+import sys
+import io
+
+from presolve import Presolve
+from main import SimplexRunner
+
+
+class TestPresolve:
+
+    def test_redundant_row_removal(self):
+        c = np.array([1, 1])
+        ab = np.array([
+            [1, 1, 4],
+            [-1, -2, 3],
+            [0, 0, 1],
+        ])
+
+        presolve = Presolve(c, ab)
+
+        npt.assert_allclose(presolve.kept_rows, [0])
+        npt.assert_allclose(presolve.ab, [[1, 1, 4]])
+        # redundant restrictions get 0 in the certificate
+        npt.assert_allclose(presolve.postsolve_certificate(np.array([1])), [1, 0, 0])
+
+    def test_forcing_row_rebuilds_dual(self):
+        """
+        x1 + x2 <= 0 forces x1 = x2 = 0, its dual must cover the objective of both
+        """
+        c = np.array([2, 1, 1])
+        ab = np.array([
+            [1, 1, 0, 0],
+            [1, 0, 1, 4],
+            [0, 0, 1, 3],
+        ])
+
+        presolve = Presolve(c, ab)
+
+        npt.assert_allclose(presolve.kept_columns, [2])
+        npt.assert_allclose(presolve.kept_rows, [1, 2])
+        npt.assert_allclose(presolve.original_x(np.array([3])), [0, 0, 3])
+
+        y = presolve.postsolve_certificate(np.array([0, 1]))
+
+        npt.assert_allclose(y, [2, 0, 1])
+        assert np.all(ab[:, :-1].T @ y >= c)
+
+    def test_dominated_column_removal(self):
+        c = np.array([1, -1, 0])
+        ab = np.array([
+            [1, 2, 0, 4],
+            [1, 1, 0, 3],
+        ])
+
+        presolve = Presolve(c, ab)
+
+        npt.assert_allclose(presolve.kept_columns, [0])
+        npt.assert_allclose(presolve.c, [1])
+        assert presolve.m_variables == 1
+
+    def test_unfeasible_row(self):
+        c = np.array([1, 1])
+        ab = np.array([
+            [1, 1, 4],
+            [1, 2, -1],
+        ])
+
+        presolve = Presolve(c, ab)
+        npt.assert_allclose(presolve.unfeasible_certificate, [0, 1])
+
+        # the runner reports it without building the tableau
+        result = SimplexRunner(problem=(c, ab), presolve=True).solve()
+        assert result.status == "inviavel"
+        npt.assert_allclose(result.certificate, [0, 1])
+
+    def test_keeps_one_restriction_and_one_variable(self):
+        c = np.array([0, 0])
+        ab = np.array([
+            [-1, 0, 4],
+            [0, -1, 3],
+        ])
+
+        presolve = Presolve(c, ab)
+
+        assert presolve.n_restrictions == 1
+        assert presolve.m_variables == 1
+
+    def test_runner_maps_solution_back(self, capfd):
+        entrada = "3 3\n2 1 1\n1 1 0 0\n1 0 1 4\n0 0 1 3"
+
+        sys.stdin = io.StringIO(entrada)
+        runner = SimplexRunner(presolve=True)
+        runner.run_simplex()
+        out, _ = capfd.readouterr()
+
+        assert runner.n_restrictions == 2
+        assert runner.m_variables == 1
+        assert out.splitlines() == ["otima", "3.0", "0.0 0.0 3.0", "2.0 0.0 1.0"]
+
+    def test_certificate_zeros_at_removed_rows(self, capfd):
+        """
+        The second restriction is twice the first one and is removed, its 0 goes in its own position
+        """
+        entrada = "3 2\n1 1\n1 0 1\n2 0 2\n0 1 3"
+
+        sys.stdin = io.StringIO(entrada)
+        SimplexRunner().run_simplex()
+        out, _ = capfd.readouterr()
+
+        assert out.splitlines()[-1] == "1.0 0.0 1.0"
@@ -0,0 +1,112 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from Utils.linear_algebra import LinearAlgebra
+from pricing import (PricingRule, PricingStrategy, BlandPricing, DantzigPricing, SteepestEdgePricing, DevexPricing,
+                     PartialPricing, PRICING_RULES)
+from simplex import Simplex
+from revised_simplex import RevisedSimplex
+from pytest import input_test_data
+
+
+class TestPricing:
+
+    def test_bland_picks_leftmost_negative(self):
+        reduced_costs = np.array([0, 2, -1, -5, 0])
+
+        assert BlandPricing().choose_column(reduced_costs) == 2
+
+    def test_dantzig_picks_most_negative(self):
+        reduced_costs = np.array([0, 2, -1, -5, 0])
+
+        assert DantzigPricing().choose_column(reduced_costs) == 3
+
+    @pytest.mark.parametrize("rule", list(PRICING_RULES))
+    def test_no_negative_reduced_cost(self, rule):
+        tableau = np.array([
+            [0, 1, 2, 0, 0],
+            [1, 1, 1, 1, 4],
+        ], dtype=float)
+        pricing = PRICING_RULES[rule]()
+        pricing.reset(tableau, 1)
+
+        assert pricing.choose_column(tableau[0, 1:-1], tableau, 1) == -1
+
+    def test_steepest_edge_scales_by_column_norm(self):
+        """
+        Column 0 has the most negative reduced cost, but a much longer edge
+        """
+        tableau = np.array([
+            [0, -3, -2, 0],
+            [1, 10, 1, 4],
+        ], dtype=float)
+
+        assert SteepestEdgePricing().choose_column(tableau[0, 1:-1], tableau, 1) == 1
+
+    def test_devex_weights_grow_after_pivot(self):
+        tableau = np.array([
+            [0, -3, -2, 0, 0],
+            [1, 1, 4, 1, 4],
+        ], dtype=float)
+        devex = DevexPricing()
+        devex.reset(tableau, 1)
+
+        pivoted = Simplex.pivotTableau(tableau, 1, 1)
+        devex.update(pivoted, 1, 0, 1)
+
+        npt.assert_allclose(devex.weights, [1, 16, 1])
+
+    def test_partial_pricing_continues_from_last_segment(self):
+        partial = PartialPricing(segment_size=2)
+        reduced_costs = np.array([-1, -2, -5, 0, -3, 0])
+
+        assert partial.choose_column(reduced_costs) == 1
+        assert partial.choose_column(reduced_costs) == 2
+        assert partial.choose_column(reduced_costs) == 4
+        # wraps around, the segment is [5, 0]
+        assert partial.choose_column(reduced_costs) == 0
+
+    def test_falls_back_to_bland_after_degenerate_pivots(self):
+        strategy = PricingStrategy("dantzig", degenerate_pivots_limit=2)
+        tableau = np.zeros((2, 4))
+
+        strategy.register_pivot(tableau, 1, 0, 1, degenerate=True)
+        assert strategy.rule.name == "dantzig"
+
+        strategy.register_pivot(tableau, 1, 0, 1, degenerate=True)
+        strategy.register_pivot(tableau, 1, 0, 1, degenerate=False)
+
+        assert strategy.fell_back_to_bland
+        assert strategy.rule.name == "bland"
+        assert strategy.pivot_counts == {"dantzig": 2, "bland": 1}
+        assert strategy.report() == "pricing dantzig (dantzig: 2 pivots, bland: 1 pivots)"
+
+        # the limit is per strategy
+        assert strategy.degenerate_pivots_limit == 2
+        assert PricingStrategy("dantzig").degenerate_pivots_limit == PricingStrategy.DEGENERATE_PIVOTS_LIMIT == 20
+
+    def test_unknown_rule(self):
+        with pytest.raises(ValueError):
+            PricingStrategy("largest_increase")
+
+        # every rule has its own choose_column
+        with pytest.raises(TypeError):
+            PricingRule()
+
+    @pytest.mark.parametrize("rule", list(PRICING_RULES))
+    def test_every_rule_reaches_the_optimum(self, rule):
+        entrada = input_test_data[1]
+
+        simplex = Simplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau, pricing=rule)
+        end = simplex.solve()
+
+        npt.assert_allclose(end[0][-1], 13)
+        npt.assert_allclose(LinearAlgebra.get_solution(end), [3, 2, 0, 1, 0])
+        assert simplex.pricing.total_pivots > 0
+
+    def test_revised_engine_rejects_tableau_rules(self):
+        entrada = input_test_data[1]
+
+        with pytest.raises(ValueError):
+            RevisedSimplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau, pricing="devex")
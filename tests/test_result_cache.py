@@ -0,0 +1,128 @@
+import io
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from result_cache import ResultCache
+from server import create_server
+from tableau import TableauParsing
+from solve_result import SolveResult, OPTIMAL, UNBOUNDED, UNFEASIBLE
+from output import format_result
+import client
+
+CASES = Path(__file__).resolve().parent / "cases" / "Testes"
+
+C = np.array([1, 1])
+AB = np.array([[1, 0, 2], [0, 1, 3]])
+
+
+def read(text):
+    _, _, c, ab = TableauParsing.read_problem(io.StringIO(text))
+    return c, ab
+
+
+class TestProblemKey:
+
+    def test_same_numbers_same_key(self):
+        assert (ResultCache.problem_key(*read("2 2\n1 1\n1 0 2\n0 1 3"))
+                == ResultCache.problem_key(*read("2 2\n1.0 1\n1 -0.0 2.00\n0 1 3e0\n")))
+
+    def test_different_problem_or_options(self):
+        key = ResultCache.problem_key(C, AB)
+
+        assert key != ResultCache.problem_key(C, np.array([[1, 0, 2], [0, 1, 4]]))
+        # the same bytes in another shape
+        assert key != ResultCache.problem_key(C, AB.reshape(3, 2))
+        assert key != ResultCache.problem_key(C, AB, {"pricing": "dantzig"})
+        assert ResultCache.problem_key(C, AB, {"a": 1, "b": 2}) == ResultCache.problem_key(C, AB, {"b": 2, "a": 1})
+
+    def test_key_after_equal_rows_are_removed(self):
+        doubled = np.array([[1, 0, 2], [0, 1, 3], [2, 0, 4]])
+        tripled = np.array([[1, 0, 2], [0, 1, 3], [3, 0, 6]])
+
+        # the runner solves the same rows in both, the certificate has a zero for the third
+        assert ResultCache.problem_key(C, doubled) == ResultCache.problem_key(C, tripled)
+        # one row less, one entry less in the certificate
+        assert ResultCache.problem_key(C, doubled) != ResultCache.problem_key(C, AB)
+
+
+class TestResultCache:
+
+    def test_hits_and_misses(self):
+        cache = ResultCache()
+
+        first = cache.solve(C, AB)
+        second = cache.solve(C.astype(float), AB.astype(float))
+
+        assert second is first
+        assert first.status == OPTIMAL
+        assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 1, "entries": 1}
+
+        with pytest.raises(ValueError):
+            first.x[0] = 10
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResultCache(max_entries=2)
+        results = [SolveResult(OPTIMAL, float(i), np.zeros(1), np.zeros(1)) for i in range(3)]
+
+        cached = [cache.put("a", results[0]), cache.put("b", results[1])]
+        cache.get("a")
+        cached.append(cache.put("c", results[2]))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is cached[0]
+        assert cache.get("c") is cached[2]
+
+    def test_put_keeps_the_callers_arrays(self):
+        cache = ResultCache()
+        result = SolveResult(OPTIMAL, 5.0, np.array([2.0, 3.0]), np.array([1.0, 1.0]))
+
+        cached = cache.put("a", result)
+        result.x[0] = 10
+
+        assert result.x.flags.writeable
+        assert not cached.x.flags.writeable and not cached.certificate.flags.writeable
+        assert cache.get("a").x[0] == 2
+
+    def test_disk_tier_survives_a_new_cache(self, tmp_path):
+        results = {
+            "optimal": SolveResult(OPTIMAL, 5.0, np.array([2.0, 3.0]), np.array([1.0, 1.0]),
+                                   {"phase_2": 2}, {"read": 0.0, "phase_2": 0.1, "total": 0.1}),
+            "unbounded": SolveResult(UNBOUNDED, None, np.array([0.0, 1.0]), np.array([0.0])),
+            "unfeasible": SolveResult(UNFEASIBLE, None, None, np.array([1.0, 1.0])),
+        }
+        cache = ResultCache(directory=str(tmp_path))
+        for key, result in results.items():
+            cache.put(key, result)
+
+        restarted = ResultCache(directory=str(tmp_path))
+        for key, result in results.items():
+            loaded = restarted.get(key)
+
+            assert format_result(loaded) == format_result(result)
+            assert loaded.iterations == result.iterations
+            assert loaded.timings == result.timings
+            assert loaded.objective is None or isinstance(loaded.objective, float)
+
+        assert restarted.stats()["disk_hits"] == 3
+        assert sorted(path.suffix for path in tmp_path.iterdir()) == [".npz"] * 3
+
+    def test_server_with_cache(self, tmp_path, capture_output):
+        cache = ResultCache(max_entries=4)
+        server = create_server(socket_path=str(tmp_path / "simplex.sock"), workers=1, cache=cache)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            for _ in range(2):
+                for case in ("01", "02", "03"):
+                    output = client.solve((CASES / case).read_text(), socket_path=server.server_address)
+                    assert output == capture_output(input_path=str(CASES / case))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert cache.stats()["hits"] == 3
+        assert cache.stats()["misses"] == 3
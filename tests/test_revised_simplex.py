@@ -0,0 +1,88 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import sys
+import io
+
+from Utils.linear_algebra import LinearAlgebra
+from exceptions import UnboundedError
+from simplex import Simplex
+from revised_simplex import RevisedSimplex
+from main import SimplexRunner
+from pytest import input_test_data
+
+
+class TestRevisedSimplex:
+
+    def test_same_end_tableau_as_tableau_engine(self):
+        """
+        Both engines do the same pivots, so the materialized tableau must be the same
+        """
+        entrada = input_test_data[1]
+
+        expected = Simplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau).solve()
+        end = RevisedSimplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau).solve()
+
+        npt.assert_allclose(end, expected)
+
+    def test_end_solution(self):
+        entrada = input_test_data[1]
+
+        simplex = RevisedSimplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau)
+        end = simplex.solve()
+        x_solution = LinearAlgebra.get_solution(end)
+
+        npt.assert_allclose(x_solution, [3, 2, 0, 1, 0])
+
+    def test_refactorization_keeps_solution(self):
+        """
+        Rebuilding B^-1 at every pivot should not change the result
+        """
+        entrada = input_test_data[1]
+
+        simplex = RevisedSimplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau)
+        simplex.REFACTORIZATION_INTERVAL = 0
+        end = simplex.solve()
+
+        npt.assert_allclose(LinearAlgebra.get_solution(end), [3, 2, 0, 1, 0])
+
+    def test_raises_unbounded_exception_and_certificate(self):
+        baseTableau = np.array([
+            [0, 0, -1, 0, 0, 0, 0, 0],
+            [1, 0, -1, 1, 0, 1, 0, 5],
+            [0, 1, -1, 0, 1, 0, 1, 7],
+        ])
+
+        simplexObj = RevisedSimplex(m=3, n=2, tableau=baseTableau)
+
+        with pytest.raises(UnboundedError) as exc:
+            simplexObj.solve()
+
+        npt.assert_allclose(exc.value.certificate, [0, 0])
+        npt.assert_allclose(exc.value.x_solution, [0, 5, 7])
+
+    def test_requires_canonical_basis(self):
+        baseTableau = np.array([
+            [0, 0, -1, 0, 0, 0],
+            [1, 0, 1, 2, 0, 5],
+            [0, 1, 1, 2, 0, 7],
+        ])
+
+        with pytest.raises(Exception):
+            RevisedSimplex(m=2, n=2, tableau=baseTableau)
+
+    @pytest.mark.parametrize("entrada", [
+        "4 2\n-2 10\n-5 -1 6\n10 5 18\n19 0 2\n5 -3 0",
+        "3 3\n2 4 8\n1 0 0 1\n0 1 0 1\n0 0 1 1",
+        "4 3\n1 1 1\n1 0 0 -1\n0 1 0 -1\n0 0 1 -1\n1 1 1 -1",
+    ])
+    def test_runner_prints_same_as_tableau_engine(self, capfd, entrada):
+        sys.stdin = io.StringIO(entrada)
+        SimplexRunner(engine="tableau").run_simplex()
+        expected, _ = capfd.readouterr()
+
+        sys.stdin = io.StringIO(entrada)
+        SimplexRunner(engine="revised").run_simplex()
+        out, _ = capfd.readouterr()
+
+        assert out == expected
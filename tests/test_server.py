@@ -0,0 +1,119 @@
+import json
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from server import create_server, problem_text, read_request
+from exceptions import InputFormatError
+from protocol import send_message, receive_message
+import client
+
+CASES = Path(__file__).resolve().parent / "cases" / "Testes"
+
+
+@pytest.fixture
+def unix_server(tmp_path):
+    server = create_server(socket_path=str(tmp_path / "simplex.sock"), workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestServer:
+
+    def test_json_problem(self):
+        request = json.dumps({"C": [1, 1], "AB": [[1, 0, 2], [0, 1, 3]]})
+
+        assert problem_text(request) == "2 2\n1 1\n1 0 2\n0 1 3"
+        assert problem_text(json.dumps({"input": "1 1\n1\n1 1"})) == "1 1\n1\n1 1"
+        with pytest.raises(InputFormatError):
+            read_request("{}")
+
+    def test_same_output_as_main(self, unix_server, capture_output):
+        paths = sorted(CASES.iterdir())
+
+        # concurrent clients, one connection each
+        with ThreadPoolExecutor(max_workers=4) as clients:
+            outputs = list(clients.map(lambda path: client.solve(path.read_text(),
+                                                                 socket_path=unix_server.server_address), paths))
+
+        for path, output in zip(paths, outputs):
+            assert output == capture_output(input_path=str(path))
+
+    def test_many_problems_in_one_connection(self, unix_server):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(unix_server.server_address)
+
+            for case in ("01", "02", "03"):
+                send_message(connection, (CASES / case).read_text())
+                assert receive_message(connection).splitlines()[0] in ("otima", "inviavel", "ilimitada")
+
+            send_message(connection, "2 2\n1 1\n1 1 1\n")
+            assert receive_message(connection).startswith("Entrada invalida")
+
+    def test_tcp_server(self, capture_output):
+        server = create_server(port=0, workers=1)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            host, port = server.server_address
+            output = client.solve((CASES / "01").read_text(), host=host, port=port)
+            assert output == capture_output(input_path=str(CASES / "01"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_invalid_options_are_refused(self, tmp_path):
+        # devex reads tableau columns, which the revised engine does not have
+        with pytest.raises(ValueError):
+            create_server(socket_path=str(tmp_path / "simplex.sock"), engine="revised", pricing="devex")
+        with pytest.raises(ValueError):
+            create_server(socket_path=str(tmp_path / "simplex.sock"), unknown_option=True)
+
+        assert not (tmp_path / "simplex.sock").exists()
+
+    def test_solver_error_is_answered(self, unix_server, capture_output):
+        unix_server.runner_options = {"engine": "revised", "pricing": "devex"}
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(unix_server.server_address)
+
+            send_message(connection, (CASES / "01").read_text())
+            assert receive_message(connection).startswith("Erro ao resolver")
+
+            # the connection is still served
+            unix_server.runner_options = {}
+            send_message(connection, (CASES / "01").read_text())
+            assert receive_message(connection) == capture_output(input_path=str(CASES / "01"))
+
+    def test_client_without_answer(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "closed.sock")
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(path)
+            listener.listen()
+            def read_and_close():
+                connection, _ = listener.accept()
+                with connection:
+                    receive_message(connection)
+
+            # reads the problem and closes the connection without answering
+            thread = threading.Thread(target=read_and_close, daemon=True)
+            thread.start()
+
+            monkeypatch.setattr(sys, "argv", ["client.py", "--socket", path, "--input", str(CASES / "01")])
+            with pytest.raises(SystemExit) as error:
+                client.main()
+
+            thread.join()
+
+        assert "sem responder" in str(error.value.code)
@@ -0,0 +1,82 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+from multiprocessing import shared_memory
+
+from shared_tableau import SharedTableau, solve_scenarios
+from main import SimplexRunner
+from tableau import TableauParsing
+from output import format_result
+from solve_result import OPTIMAL, UNFEASIBLE, UNBOUNDED
+
+
+class TestSharedTableau:
+
+    C = np.array([1, 1, 1])
+    AB = np.array([
+        [1, 1, 0, 4],
+        [2, -1, -1, 5],
+        [-1, 2, 0, 6],
+        [-1, -2, 0, -1],
+    ])
+
+    def test_attached_tableau_is_a_read_only_view(self):
+        tableau = np.arange(12, dtype=float).reshape(3, 4)
+
+        with SharedTableau(tableau) as shared:
+            attached = SharedTableau(name=shared.name, shape=shared.shape)
+
+            npt.assert_array_equal(attached.array, tableau)
+            assert not attached.array.flags.writeable
+
+            # both map the same memory
+            shared.array[0, 0] = 100
+            assert attached.array[0, 0] == 100
+            attached.close()
+
+        # the creator frees the block
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shared.name)
+
+    def test_runner_over_a_built_tableau(self):
+        n, m = 4, 3
+        tableau = TableauParsing.create_full_tableau(self.C.reshape(1, -1), self.AB, n, m, remove_equal_rows=False)
+
+        # x3 only appears with a negative coefficient
+        assert SimplexRunner(tableau=tableau.copy()).solve().status == UNBOUNDED
+
+        tableau[0, n + 2] = 0
+        result = SimplexRunner(tableau=tableau, engine="revised").solve()
+        assert result.status == OPTIMAL
+        npt.assert_allclose(result.objective, 4)
+
+        with pytest.raises(ValueError):
+            SimplexRunner(tableau=tableau, presolve=True)
+
+    def test_scenarios_in_worker_processes(self):
+        objectives = np.array([[1, 1, 0], [1, 1, 0], [1, 1, 1]])
+        rhs = np.array([[4, 5, 6, -1], [-1, 5, 6, -1], [4, 5, 6, -1]])
+
+        results = solve_scenarios(self.C, self.AB, objectives=objectives, rhs=rhs, workers=2)
+
+        assert [result.status for result in results] == [OPTIMAL, UNFEASIBLE, UNBOUNDED]
+
+        x = results[0].x
+        npt.assert_allclose(results[0].objective, objectives[0] @ x)
+        assert np.all(self.AB[:, :-1] @ x <= rhs[0] + 1e-9)
+
+        # y >= 0, y^T A >= 0 and y^T b < 0
+        y = results[1].certificate
+        assert np.all(y >= 0)
+        assert np.all(self.AB[:, :-1].T @ y >= -1e-9)
+        assert y @ rhs[1] < 0
+
+    def test_scenarios_with_runner_options(self):
+        objectives = np.array([[1, 1, 0], [-1, -1, 0]])
+        rhs = np.array([[4, 5, 6, -1], [4, 5, 6, -1]])
+
+        expected = solve_scenarios(self.C, self.AB, objectives=objectives, rhs=rhs, workers=1)
+        results = solve_scenarios(self.C, self.AB, objectives=objectives, rhs=rhs, workers=1, engine="revised",
+                                  vero=False)
+
+        assert [format_result(result) for result in results] == [format_result(result) for result in expected]
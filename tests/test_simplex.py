@@ -42,6 +42,19 @@ class TestSimplex:
 
         npt.assert_allclose(x_solution, expected)
 
+    def test_basis_header_is_tracked(self):
+        """
+        The basis updated on every pivot must be the one found by searching the final tableau
+        """
+        entrada = input_test_data[1]
+
+        simplex = Simplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau,
+                          basis=LinearAlgebra.get_slack_basis(entrada.N_restricoes, entrada.M_variaveis))
+        end = simplex.solve()
+
+        npt.assert_equal(np.sort(simplex.basis), np.sort(LinearAlgebra.findBasicColumns(end)))
+        npt.assert_allclose(LinearAlgebra.get_solution(end, simplex.basis), [3, 2, 0, 1, 0])
+
     def test_basic_tableau_pivoting(self):
         """
         Pivot the tableau to given pivot
@@ -103,6 +116,80 @@ class TestSimplex:
 
         npt.assert_allclose(resultC, expectedC)
 
+    def test_in_place_pivoting(self):
+        """
+        The in place kernel modifies and returns the same tableau, the wrapper leaves the original untouched
+        """
+        baseTableau = np.array([
+            [-2, -3, 0, 0, 0, 0],
+            [1, 1, 1, 0, 0, 6],
+            [2, 1, 0, 1, 0, 10],
+            [-1, 1, 0, 0, 1, 4],
+        ],
+            dtype=float)
+        original = baseTableau.copy()
+
+        copied = Simplex.pivotTableau(baseTableau, 0, 2)
+        npt.assert_allclose(baseTableau, original)
+
+        buffer = np.empty_like(baseTableau)
+        result = Simplex.pivotTableauInPlace(baseTableau, 0, 2, buffer=buffer)
+
+        assert result is baseTableau
+        npt.assert_allclose(baseTableau, copied)
+
+    def test_in_place_pivoting_skips_zero_rows(self):
+        """
+        Rows with zero at the pivot column must not change
+        """
+        baseTableau = np.array([
+            [-2, -3, 0, 0, 0, 0],
+            [0, 1, 1, 0, 0, 6],
+            [2, 1, 0, 1, 0, 10],
+            [0, 1, 0, 0, 1, 4],
+        ],
+            dtype=float)
+
+        result = Simplex.pivotTableauInPlace(baseTableau.copy(), 0, 2)
+
+        npt.assert_allclose(result[1], baseTableau[1])
+        npt.assert_allclose(result[3], baseTableau[3])
+        npt.assert_allclose(result[0], [0, -2, 0, 1, 0, 10])
+
+    def test_ratio_test_breaks_ties_by_first_row(self):
+        column = np.array([-1, 2, 1, 4])
+        b_column = np.array([5, 2, 1, 10])
+
+        assert Simplex.ratioTest(column, b_column) == 1
+
+    def test_ratio_test_without_positive_entries(self):
+        column = np.array([-1, 0, 0.000000001])
+        b_column = np.array([5, 2, 1])
+
+        assert Simplex.ratioTest(column, b_column) == -1
+
+    def test_harris_ratio_test_picks_largest_pivot_among_near_ties(self):
+        """
+        Rows 1 and 2 are degenerate ties, harris takes the biggest pivot, row 2
+        """
+        column = np.array([1, 0.001, 5, 1])
+        b_column = np.array([3, 0, 0, 1])
+
+        assert Simplex.ratioTest(column, b_column) == 1
+        assert Simplex.ratioTest(column, b_column, harris=True) == 2
+
+    def test_harris_ratio_test_reaches_optimum(self):
+        entrada = input_test_data[1]
+
+        simplex = Simplex(entrada.M_variaveis, entrada.N_restricoes, entrada.FullTableau, ratio_test="harris")
+        end = simplex.solve()
+
+        npt.assert_allclose(LinearAlgebra.get_solution(end), [3, 2, 0, 1, 0])
+
+    def test_unknown_ratio_test(self):
+        with pytest.raises(ValueError):
+            Simplex(m=2, n=2, tableau=np.zeros((3, 7)), ratio_test="random")
+
     def test_canonical_form_creation(self):
         baseTableau = [
             [0, 0, 0, 0, 0, 1, 1, 1, 0],
@@ -199,6 +286,28 @@ class TestSimplex:
 
         npt.assert_allclose(exc.value.certificate, [0, 0], err_msg="Certificate should be instantly unbounded")
 
+    @pytest.mark.parametrize("unbounded_check", Simplex.UNBOUNDED_CHECKS)
+    def test_unbounded_found_after_pivot(self, unbounded_check):
+        """
+        max x1 st x1 - x2 <= 1 only becomes unbounded after x1 enters, both checks give the same certificate and x
+        """
+        baseTableau = np.array([
+            [0, -1, 0, 0, 0],
+            [1, 1, -1, 1, 1],
+        ])
+
+        simplexObj = Simplex(m=2, n=1, tableau=baseTableau, unbounded_check=unbounded_check)
+
+        with pytest.raises(UnboundedError) as exc:
+            simplexObj.solve()
+
+        npt.assert_allclose(exc.value.certificate, [1])
+        npt.assert_allclose(exc.value.x_solution, [1, 0])
+
+    def test_unknown_unbounded_check(self):
+        with pytest.raises(ValueError):
+            Simplex(m=2, n=2, tableau=np.zeros((3, 7)), unbounded_check="never")
+
     def test_is_simplex_not_done(self):
         """
         We are not done when there is still a pivotable column, ie, negative value in first row
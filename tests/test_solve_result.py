@@ -0,0 +1,107 @@
+import io
+from pathlib import Path
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from main import SimplexRunner, solve
+from output import format_result, format_array, ResultWriter, save_result_arrays, load_result_arrays
+from solve_result import SolveResult, OPTIMAL, UNFEASIBLE, UNBOUNDED
+from Utils.linear_algebra import LinearAlgebra
+
+CASES = Path(__file__).resolve().parent / "cases" / "Testes"
+
+
+class TestSolveResult:
+
+    def test_optimal_result(self):
+        # x1 <= 2, x2 <= 3 and x1 + x2 >= 1, which needs phase 1
+        result = solve(np.array([1, 1]), np.array([[1, 0, 2], [0, 1, 3], [-1, -1, -1]]))
+
+        assert result.status == OPTIMAL
+        npt.assert_allclose(result.objective, 5)
+        npt.assert_allclose(result.x, [2, 3])
+        npt.assert_allclose(result.certificate, [1, 1, 0])
+        assert set(result.iterations) == {"phase_1", "phase_2"}
+        assert result.total_iterations == sum(result.iterations.values())
+        assert set(result.timings) == {"read", "phase_1", "phase_2", "total"}
+        assert result.timings["total"] >= result.timings["phase_2"]
+
+    def test_unfeasible_and_unbounded_results(self):
+        unfeasible = solve([1, 1], [[1, 1, 1], [-1, -1, -3]], dual_simplex=False)
+        unbounded = solve([1, 1], [[1, -1, 1]])
+
+        assert unfeasible.status == UNFEASIBLE
+        assert unfeasible.objective is None and unfeasible.x is None
+        y = unfeasible.certificate
+        assert np.all(y >= 0) and y @ np.array([1, -3]) < 0
+
+        assert unbounded.status == UNBOUNDED
+        assert unbounded.objective is None
+        # the column of x2 has no positive entry, found before the first pivot
+        npt.assert_allclose(unbounded.x, [0, 0])
+
+    def test_compact_result(self):
+        result = SolveResult(OPTIMAL, 1.0, np.zeros(2), np.zeros(1))
+
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.extra = 1
+
+    @pytest.mark.parametrize("case", sorted(path.name for path in CASES.iterdir()))
+    def test_formatting_matches_run_simplex(self, case, capture_output):
+        with open(CASES / case) as stream:
+            result = SimplexRunner(stream=stream).solve()
+
+        assert format_result(result) == capture_output(input_path=str(CASES / case))
+
+    def test_format_array(self):
+        assert format_array(np.array([1, 0.123456789, -2.5])) == "1.0 0.1234568 -2.5"
+
+    def test_format_array_matches_array_print(self, capsys):
+        values = np.array([0.0, -0.0, 1e-07, 5e-08, 123456789.12345678, 1e16, -3.0])
+        LinearAlgebra.arrayPrint(values)
+
+        assert capsys.readouterr().out == format_array(values) + "\n"
+
+
+class CountingStream(io.StringIO):
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestResultWriter:
+
+    def test_blocks(self):
+        result = SolveResult(OPTIMAL, 5.0, np.array([2.0, 3.0]), np.array([1.0, 1.0]))
+        stream = CountingStream()
+
+        with ResultWriter(stream, buffer_size=100) as writer:
+            for _ in range(20):
+                writer.write_result(result)
+
+        assert stream.getvalue() == format_result(result) * 20
+        # 20 results of 26 characters, flushed every 4
+        assert stream.writes == 5
+
+    def test_binary_arrays(self, tmp_path):
+        results = [solve([1, 1], [[1, 0, 2], [0, 1, 3]]), solve([1, 1], [[1, -1, 1]]),
+                   solve([1, 1], [[1, 1, 1], [-1, -1, -3]], dual_simplex=False)]
+
+        for index, result in enumerate(results):
+            save_result_arrays(result, tmp_path / str(index))
+            loaded = load_result_arrays(tmp_path / str(index))
+
+            assert format_result(loaded) == format_result(result)
+
+        assert sorted(path.name for path in (tmp_path / "0").iterdir()) == ["certificate.npy", "objective.npy",
+                                                                          "status.npy", "x.npy"]
+        assert sorted(path.name for path in (tmp_path / "2").iterdir()) == ["certificate.npy", "status.npy"]
+        npt.assert_allclose(np.load(tmp_path / "0" / "x.npy"), [2, 3])
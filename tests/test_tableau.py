@@ -7,6 +7,7 @@ import io
 from .conftest import input_data
 from tableau import TableauParsing
 from Utils.linear_algebra import LinearAlgebra
+from exceptions import InputFormatError
 from pytest_cases import parametrize, fixture_ref
 
 
@@ -133,3 +134,71 @@ class TestTableau:
 
         assert n_esperado, n_rows
         assert m_columns, m_esperado
+
+    def test_read_problem_single_read(self):
+        stream = io.StringIO("2 3\n1 2 3\n\n1 0 0 4\n0.5 1 -2.25 7\n")
+
+        n_restrictions, m, c, ab = TableauParsing.read_problem(stream)
+
+        assert (n_restrictions, m) == (2, 3)
+        npt.assert_allclose(c, [[1, 2, 3]])
+        # fractional coefficients are kept, they used to be parsed as int
+        npt.assert_allclose(ab, [[1, 0, 0, 4], [0.5, 1, -2.25, 7]])
+        assert ab.dtype == np.float64
+
+    def test_read_ab_after_dimensions(self):
+        sys.stdin = io.StringIO("1 2\n3 4\n1.5 1 6")
+        n_restrictions, m = TableauParsing.read_n_m_dimensions()
+
+        tableau, new_n = TableauParsing.read_ab_and_create_tableau(n_restrictions, m)
+
+        npt.assert_allclose(tableau, [[0, -3, -4, 0, 0], [1, 1.5, 1, 1, 6]])
+        assert new_n == 1
+
+    @pytest.mark.parametrize("entrada, mensagem", [
+        ("", "Empty input"),
+        ("2\n1 2", "Line 1"),
+        ("1 2\n1 2 3\n1 1 4", "Line 2: expected 2 values, found 3"),
+        ("2 2\n1 2\n1 1 4\n1 1", "Line 4: expected 3 values, found 2"),
+        ("2 2\n1 2\n1 1 4", "found 2 lines"),
+        ("1 2\n1 2\n1 a 4", "Line 3: could not read"),
+        # trailing garbage, numpy 1.x fromstring used to stop at it without an error
+        ("1 2\n1 2\n1 0 4 x", "Line 3: expected 3 values, found 4"),
+        ("2 2\n1 2\n1 0 4\n1 0 4x", "Line 4: could not read"),
+        ("1 2\n1 nan\n1 1 4", "nan"),
+    ])
+    def test_read_problem_malformed_input(self, entrada, mensagem):
+        with pytest.raises(InputFormatError) as exc:
+            TableauParsing.read_problem(io.StringIO(entrada))
+
+        assert mensagem in str(exc.value)
+
+    def test_binary_problem_round_trip(self, tmp_path):
+        path = tmp_path / "problema.npy"
+        stream = io.StringIO("2 3\n1 2 3\n1 0 0 4\n0.5 1 -2.25 7\n")
+
+        assert TableauParsing.convert_text_to_binary(stream, path) == (2, 3)
+
+        n_restrictions, m, c, ab = TableauParsing.read_binary_problem(path)
+
+        assert (n_restrictions, m) == (2, 3)
+        assert isinstance(ab.base, np.memmap) or isinstance(ab, np.memmap)
+        npt.assert_allclose(c, [[1, 2, 3]])
+        npt.assert_allclose(ab, [[1, 0, 0, 4], [0.5, 1, -2.25, 7]])
+
+    @pytest.mark.parametrize("entrada", input_test_data)
+    def test_binary_problem_creates_same_tableau(self, tmp_path, entrada):
+        path = tmp_path / "problema.npy"
+        TableauParsing.write_binary_problem(path, entrada.C, entrada.AB)
+
+        n_restrictions, m, c, ab = TableauParsing.read_binary_problem(path)
+        tableau = TableauParsing.create_full_tableau(c, ab, n_restrictions, m)
+
+        npt.assert_allclose(tableau, entrada.FullTableau)
+
+    def test_binary_problem_wrong_shape(self, tmp_path):
+        path = tmp_path / "problema.npy"
+        np.save(path, np.arange(4.0))
+
+        with pytest.raises(InputFormatError):
+            TableauParsing.read_binary_problem(path)
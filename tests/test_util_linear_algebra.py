@@ -20,6 +20,24 @@ class TestUtilLinearAlgebra:
         expected_solution = [3, 2, 0, 1, 0]
         npt.assert_allclose(calculated_solution, expected_solution)
 
+    def test_solution_retrieval_with_basis_header(self):
+        """
+        With the basis header the tableau is not searched, the result must be the same
+        """
+        tableau = np.array([
+            [1, 0, 1, 0, 0, 1, 0, 1, 13],
+            [1, 0, -1, 1, 0, 1, 0, -1, 3],
+            [1, 1, -3, 0, 0, 1, 1, -3, 1],
+            [-1, 0, 2, 0, 1, -1, 0, 2, 2],
+        ])
+
+        calculated_solution = LinearAlgebra.get_solution(tableau, basis=[3, 6, 4])
+        npt.assert_allclose(calculated_solution, LinearAlgebra.get_solution(tableau))
+        npt.assert_allclose(calculated_solution, [3, 2, 0, 1, 0])
+
+    def test_slack_basis(self):
+        npt.assert_equal(LinearAlgebra.get_slack_basis(3, 2), [5, 6, 7])
+
     @pytest.mark.parametrize("entrada", input_test_data)
     def test_vero_removal(self, entrada):
         fullTableau = np.array(entrada.FullTableau)
@@ -168,14 +186,104 @@ class TestUtilLinearAlgebra:
 
         npt.assert_equal(False, result)
 
+    def test_scalar_comparisons_with_tolerance(self):
+        assert LinearAlgebra.equal_to_zero(0.000000001)
+        assert not LinearAlgebra.equal_to_zero(-0.001)
+        assert LinearAlgebra.smaller_than_zero(-0.001)
+        assert not LinearAlgebra.smaller_than_zero(-0.000000001)
+
+    def test_any_bellow_zero_with_empty_array(self):
+        assert not LinearAlgebra.any_below_zero(np.array([]))
+
     def test_redundant_rows_removal(self):
         tableau_with_redundant_last_row = np.array([[1, 1, 0, 0, 5],
                                                     [-1, 0, -5, 5, -10],
                                                     [2, 1, 1, -1, 10],
-                                                    [-2, -1, -1, 1, -10]])
+                                                    [4, 2, 2, -2, 20]])
 
         fixed_tableau, removed_rows = LinearAlgebra.remove_equal_rows(tableau_with_redundant_last_row)
 
-        assert len(removed_rows) == 1
+        assert removed_rows == [3]
         assert fixed_tableau.shape == (3, 5)
         assert fixed_tableau.shape != tableau_with_redundant_last_row.shape
+
+    def test_opposite_rows_are_kept(self):
+        """
+        a*x <= b and -a*x <= -b together are an equality, neither of them is redundant.
+        Rows with an all zero A are not scaled by b either, 0 <= 1 and 0 <= -2 are different
+        """
+        ab = np.array([[2, 1, 10],
+                       [-2, -1, -10],
+                       [-4, -2, -20],
+                       [0, 0, 1],
+                       [0, 0, -2]])
+
+        fixed_tableau, removed_rows = LinearAlgebra.remove_equal_rows(ab)
+
+        assert removed_rows == [2]
+        npt.assert_allclose(fixed_tableau, ab[[0, 1, 3, 4]])
+
+    def test_redundant_rows_with_zero_entries(self):
+        """
+        Zero entries used to give nan quotients, and these rows were never removed
+        """
+        ab = np.array([[1, 0, 2, 3],
+                       [0, 0, 0, 0],
+                       [0.5, 0, 1, 1.5],
+                       [0, 0, 0, 0],
+                       [3, 0, 6, 9 + 1e-12],
+                       [1, 0, 2, 4]])
+
+        fixed_tableau, removed_rows = LinearAlgebra.remove_equal_rows(ab)
+
+        # all zero rows are kept
+        assert removed_rows == [2, 4]
+        npt.assert_allclose(fixed_tableau, ab[[0, 1, 3, 5]])
+
+    def test_equality_pairs(self):
+        ab = np.array([[1, 1, 2],
+                       [1, 0, 1],
+                       [-2, -2, -4],
+                       [-1, 0, 1]])
+
+        npt.assert_array_equal(LinearAlgebra.find_equality_pairs(ab), [[0, 2]])
+
+    def test_dependent_equality_removal(self):
+        # the third equality is the sum of the other two, every equality is a <= and >= pair
+        equalities = np.array([[1, 1, 0, 2],
+                               [0, 1, 1, 3],
+                               [1, 2, 1, 5]])
+        ab = np.vstack((equalities, -equalities, [[1, 0, 0, 1]]))
+
+        fixed_tableau, removed_rows, certificate = LinearAlgebra.remove_dependent_equalities(ab)
+
+        assert certificate is None
+        assert len(removed_rows) == 2
+        assert fixed_tableau.shape == (5, 4)
+        # both restrictions of the same equality
+        assert removed_rows[1] - removed_rows[0] == 3
+
+    def test_dependent_inequalities_are_kept(self):
+        # x + y <= 1 is the sum of the other rows, but it is not redundant
+        ab = np.array([[1, 0, 1],
+                       [0, 1, 1],
+                       [1, 1, 1]])
+
+        fixed_tableau, removed_rows, certificate = LinearAlgebra.remove_dependent_equalities(ab)
+
+        assert removed_rows == []
+        assert certificate is None
+        npt.assert_allclose(fixed_tableau, ab)
+
+    def test_inconsistent_equalities_certificate(self):
+        equalities = np.array([[1, 1, 0, 2],
+                               [0, 1, 1, 3],
+                               [1, 2, 1, 6]])
+        ab = np.vstack((equalities, -2 * equalities))
+
+        fixed_tableau, removed_rows, certificate = LinearAlgebra.remove_dependent_equalities(ab)
+
+        assert removed_rows == []
+        assert np.all(certificate >= 0)
+        npt.assert_allclose(certificate @ ab[:, :-1], 0, atol=1e-9)
+        assert certificate @ ab[:, -1] < 0
@@ -0,0 +1,104 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from warm_start import WarmStartSolver
+from revised_simplex import RevisedSimplex
+from exceptions import UnfeasibleError
+
+
+class TestWarmStartSolver:
+
+    # max 3x1 + 2x2 + 4x3 with three <= restrictions, b >= 0
+    C = np.array([3, 2, 4])
+    AB = np.array([
+        [1, 1, 2, 4],
+        [2, 0, 3, 5],
+        [2, 1, 3, 7],
+    ])
+
+    @staticmethod
+    def cold_value(c, ab):
+        solver = WarmStartSolver(c, ab)
+        solver.solve()
+        return solver.optimal_value(), solver.last_pivots
+
+    @staticmethod
+    def assert_optimal(solver, c, ab):
+        x = solver.x_solution()
+        y = solver.certificate()
+
+        assert np.all(ab[:, :-1] @ x <= ab[:, -1] + 1e-9)
+        assert np.all(y >= -1e-9)
+        assert np.all(ab[:, :-1].T @ y >= c - 1e-9)
+        npt.assert_allclose(c @ x, solver.optimal_value())
+        npt.assert_allclose(y @ ab[:, -1], solver.optimal_value())
+
+    def test_objective_change_continues_with_primal_simplex(self):
+        solver = WarmStartSolver(self.C, self.AB)
+        solver.solve()
+        first_pivots = solver.last_pivots
+
+        c = np.array([3, 5, 4])
+        solver.change_objective(c)
+
+        assert solver.last_start == "primal"
+        assert solver.last_pivots <= first_pivots
+        self.assert_optimal(solver, c, self.AB)
+        npt.assert_allclose(solver.optimal_value(), self.cold_value(c, self.AB)[0])
+
+    def test_rhs_change_continues_with_dual_simplex(self):
+        solver = WarmStartSolver(self.C, self.AB)
+        solver.solve()
+
+        ab = self.AB.copy()
+        ab[:, -1] = [1, 5, 7]
+        solver.change_rhs(ab[:, -1])
+
+        assert solver.last_start == "dual"
+        self.assert_optimal(solver, self.C, ab)
+        npt.assert_allclose(solver.optimal_value(), self.cold_value(self.C, ab)[0])
+
+    def test_unchanged_basis_needs_no_pivot(self):
+        solver = WarmStartSolver(self.C, self.AB)
+        solver.solve()
+
+        solver.change_rhs(self.AB[:, -1] * 2)
+
+        assert solver.last_pivots == 0
+        npt.assert_allclose(solver.optimal_value(), 2 * self.cold_value(self.C, self.AB)[0])
+
+    def test_unfeasible_rhs_keeps_the_basis(self):
+        solver = WarmStartSolver(self.C, self.AB)
+        solver.solve()
+
+        with pytest.raises(UnfeasibleError) as exc:
+            solver.change_rhs([4, -1, 7])
+
+        y = exc.value.certificate
+        assert np.all(y >= 0)
+        assert np.all(self.AB[:, :-1].T @ y >= -1e-9)
+        assert y @ np.array([4, -1, 7]) < 0
+
+        # a feasible b again, still from the last basis
+        solver.change_rhs(self.AB[:, -1])
+        self.assert_optimal(solver, self.C, self.AB)
+
+    def test_neither_feasible_solves_from_slack_basis(self):
+        # x1 + x2 >= 2 needs phase 1 at the start
+        c = np.array([1, -1])
+        ab = np.array([
+            [-1, -1, -2],
+            [1, 0, 3],
+            [0, 1, 3],
+        ])
+
+        solver = WarmStartSolver(c, ab, engine=RevisedSimplex)
+        solver.solve()
+        assert solver.last_start == "two_phase"
+        self.assert_optimal(solver, c, ab)
+
+        c = np.array([-1, 2])
+        solver.change_objective(c)
+        assert solver.last_start == "primal"
+        self.assert_optimal(solver, c, ab)
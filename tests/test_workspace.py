@@ -0,0 +1,64 @@
+import numpy as np
+import numpy.testing as npt
+
+from Utils.workspace import PivotWorkspace
+from simplex import Simplex
+
+
+class TestPivotWorkspace:
+
+    def test_snap_to_zero_in_place(self):
+        array = np.array([[0.000000000000000000002, 0, -0.00000000000001, 1],
+                          [1, -0.000000000045, 3, -2]])
+        workspace = PivotWorkspace(array.shape)
+
+        result = workspace.snap_to_zero(array)
+
+        assert result is array
+        npt.assert_allclose(array, [[0, 0, 0, 1], [1, 0, 3, -2]])
+
+    def test_snap_to_zero_in_a_row_view(self):
+        array = np.array([[0.000000000000000000002, 0.5],
+                          [0.00000000001, 0.00000000001]])
+        workspace = PivotWorkspace(array.shape)
+
+        workspace.snap_to_zero(array[1])
+
+        npt.assert_allclose(array, [[0.000000000000000000002, 0.5], [0, 0]])
+
+    def test_pivot_with_workspace_every_row(self):
+        baseTableau = np.array([
+            [-2, -3, 0, 0, 0, 0],
+            [1, 1, 1, 0, 0, 6],
+            [2, 1, 0, 1, 0, 10],
+            [-1, 1, 0, 0, 1, 4],
+        ],
+            dtype=float)
+        workspace = PivotWorkspace(baseTableau.shape)
+
+        expected = Simplex.pivotTableau(baseTableau, 0, 2)
+        result = Simplex.pivotTableauInPlace(baseTableau, 0, 2, workspace=workspace)
+
+        assert result is baseTableau
+        npt.assert_allclose(result, expected)
+
+    def test_pivot_with_workspace_some_rows(self):
+        """
+        Only the rows 0 and 2 change, they are gathered, updated and cleaned in the workspace
+        """
+        baseTableau = np.array([
+            [-2, -3, 0, 0, 0, 0],
+            [0, 1, 1, 0, 0, 6],
+            [3, 1, 0, 1, 0, 10],
+            [0, 1, 0, 0, 1, 4],
+            [1, 1 / 3, 0, 0, 1, 7],
+        ],
+            dtype=float)
+        workspace = PivotWorkspace(baseTableau.shape)
+
+        expected = Simplex.pivotTableau(baseTableau, 0, 2)
+        Simplex.pivotTableauInPlace(baseTableau, 0, 2, workspace=workspace)
+
+        npt.assert_allclose(baseTableau, expected, atol=1e-8)
+        # 1/3 - 1 * (1 / 3) leaves rounding noise that must be cleaned
+        assert baseTableau[4][1] == 0